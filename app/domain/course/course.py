@@ -2,6 +2,24 @@ from typing import List, Optional
 
 
 class Course:
+    __slots__ = (
+        "id",
+        "creator_id",
+        "name",
+        "price",
+        "active",
+        "language",
+        "country",
+        "description",
+        "categories",
+        "presentation_video",
+        "image",
+        "subscription_id",
+        "recommendations",
+        "created_at",
+        "updated_at",
+    )
+
     def __init__(
         self,
         id: str,
@@ -41,3 +59,6 @@ class Course:
             return self.id == o.id
 
         return False
+
+    def __hash__(self) -> int:
+        return hash(self.id)
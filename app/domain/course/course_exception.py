@@ -31,3 +31,17 @@ class NotEnoughFundsError(Exception):
 
     def __str__(self):
         return NotEnoughFundsError.message
+
+
+class InvalidTimeRangeError(Exception):
+    message = "The time range you specified is invalid or has too many buckets."
+
+    def __str__(self):
+        return InvalidTimeRangeError.message
+
+
+class UnknownTimeZoneError(Exception):
+    message = "The time zone you specified does not exist."
+
+    def __str__(self):
+        return UnknownTimeZoneError.message
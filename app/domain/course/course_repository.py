@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
 from app.domain.course import Course
 from app.domain.review.review import Review
@@ -25,7 +25,9 @@ class CourseRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def update(self, course: Course) -> Optional[Course]:
+    def update(
+        self, id: str, changes: dict, categories: Optional[List[str]] = None
+    ) -> Optional[Course]:
         raise NotImplementedError
 
     @abstractmethod
@@ -52,10 +54,6 @@ class CourseRepository(ABC):
     ) -> Optional[ContentReadModel]:
         raise NotImplementedError
 
-    @abstractmethod
-    def user_involved(self, course_id: str, user_id: str) -> bool:
-        raise NotImplementedError
-
     @abstractmethod
     def add_review(self, review: Review):
         raise NotImplementedError
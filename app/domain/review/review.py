@@ -2,6 +2,8 @@ from typing import Optional
 
 
 class Review:
+    __slots__ = ("id", "course_id", "recommended", "review", "date")
+
     def __init__(
         self,
         id: str,
@@ -21,3 +23,6 @@ class Review:
             return self.id == o.id and self.course_id == o.course_id
 
         return False
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.course_id))
@@ -1,3 +1,6 @@
 from .course_dto import CourseDTO
+from .course_identity_map import CourseIdentityMap
+from .course_metrics_rollup import CourseMetricsRollup, rebuild_course_metrics
+from .course_permission_service import CoursePermissionServiceImpl
 from .course_query_service import CourseQueryServiceImpl
 from .course_repository import CourseCommandUseCaseUnitOfWorkImpl, CourseRepositoryImpl
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, null, select, tuple_, union_all
+from sqlalchemy.orm.session import Session
+
+from ...usecase.metrics.catalog_metrics_query_model import CatalogMetricsReadModel
+from ..monitoring import cache_requests
+from .course_dto import CourseDTO
+
+CATALOG_METRICS_TTL_SECONDS = float(os.environ.get("CATALOG_METRICS_TTL_SECONDS", "60"))
+PRICE_BANDS = (10, 25, 50, 100)
+DIMENSIONS = ("language", "country", "price_band", "active", "paid")
+
+
+def price_band_labels() -> Tuple[str, ...]:
+    lower = (0,) + PRICE_BANDS[:-1]
+    return (
+        ("free",)
+        + tuple(f"{low}-{high}" for low, high in zip(lower, PRICE_BANDS))
+        + (f"{PRICE_BANDS[-1]}+",)
+    )
+
+
+def price_band(price):
+    labels = price_band_labels()
+    return case(
+        (price == 0, labels[0]),
+        *[(price < high, label) for high, label in zip(PRICE_BANDS, labels[1:])],
+        else_=labels[-1],
+    )
+
+
+def catalog_breakdown_statement(dialect: str):
+    # Bands are computed below the grouping, so the GROUP BY refers to plain
+    # columns instead of repeating the CASE with its own parameters.
+    table = CourseDTO.__table__
+    courses = select(
+        table.c.language.label("language"),
+        table.c.country.label("country"),
+        price_band(table.c.price).label("price_band"),
+        table.c.active.label("active"),
+        (table.c.price > 0).label("paid"),
+    ).subquery()
+    columns = [courses.c[dimension] for dimension in DIMENSIONS]
+    if dialect == "postgresql":
+        return select(*columns, func.count()).group_by(
+            func.grouping_sets(*[tuple_(column) for column in columns])
+        )
+    # One scan per dimension, still in a single round trip.
+    return union_all(
+        *[
+            select(
+                *[
+                    column if other is column else null().label(other.name)
+                    for other in columns
+                ],
+                func.count(),
+            ).group_by(column)
+            for column in columns
+        ]
+    )
+
+
+def by_count(counts: Dict[str, int]) -> Dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def fetch_catalog_metrics(session: Session) -> CatalogMetricsReadModel:
+    breakdown: Dict[str, Dict] = {dimension: {} for dimension in DIMENSIONS}
+    statement = catalog_breakdown_statement(session.get_bind().dialect.name)
+    for *keys, count in session.execute(statement):
+        # Every dimension is NOT NULL, so the only key set on a row is the
+        # dimension it was grouped by.
+        for dimension, key in zip(DIMENSIONS, keys):
+            if key is not None:
+                breakdown[dimension][key] = count
+    return CatalogMetricsReadModel(
+        languages=by_count(breakdown["language"]),
+        countries=by_count(breakdown["country"]),
+        price_bands={
+            label: breakdown["price_band"].get(label, 0)
+            for label in price_band_labels()
+        },
+        active=breakdown["active"].get(True, 0),
+        inactive=breakdown["active"].get(False, 0),
+        paid=breakdown["paid"].get(True, 0),
+        free=breakdown["paid"].get(False, 0),
+    )
+
+
+class CatalogMetricsCache:
+    # The breakdown scans the whole catalog and a dashboard can live with it
+    # being a minute old, so each worker reuses its last result for a while.
+    def __init__(self, ttl: float = CATALOG_METRICS_TTL_SECONDS):
+        self.ttl: float = ttl
+        self._lock = threading.Lock()
+        self._metrics: Optional[CatalogMetricsReadModel] = None
+        self._expires: float = 0
+
+    def get(self) -> Optional[CatalogMetricsReadModel]:
+        with self._lock:
+            metrics = self._metrics if time.monotonic() < self._expires else None
+        cache_requests.inc("catalog_metrics", "miss" if metrics is None else "hit")
+        return metrics
+
+    def put(self, metrics: CatalogMetricsReadModel):
+        with self._lock:
+            self._metrics = metrics
+            self._expires = time.monotonic() + self.ttl
+
+    def clear(self):
+        with self._lock:
+            self._metrics = None
+            self._expires = 0
+
+
+catalog_metrics_cache = CatalogMetricsCache()
@@ -0,0 +1,43 @@
+import os
+import threading
+import time
+from typing import List, Optional
+
+from ..monitoring import cache_requests
+
+CATEGORY_LIST_TTL_SECONDS = float(os.environ.get("CATEGORY_LIST_TTL_SECONDS", "60"))
+# Set on the session by course writes that change which categories are in
+# use; the unit of work invalidates the cached list once they commit.
+CATEGORIES_CHANGED = "categories_changed"
+
+
+class CategoryListCache:
+    # Invalidating bumps the version, so a list read while a write was
+    # committing is not stored over the newer one. Other workers pick the
+    # change up when their copy expires.
+    def __init__(self, ttl: float = CATEGORY_LIST_TTL_SECONDS):
+        self.ttl: float = ttl
+        self.version: int = 0
+        self._lock = threading.Lock()
+        self._categories: Optional[List[str]] = None
+        self._expires: float = 0
+
+    def get(self) -> Optional[List[str]]:
+        with self._lock:
+            categories = self._categories if time.monotonic() < self._expires else None
+        cache_requests.inc("category_list", "miss" if categories is None else "hit")
+        return categories
+
+    def put(self, version: int, categories: List[str]):
+        with self._lock:
+            if version == self.version:
+                self._categories = categories
+                self._expires = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._categories = None
+
+
+category_list_cache = CategoryListCache()
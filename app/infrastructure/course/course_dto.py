@@ -8,9 +8,13 @@ from sqlalchemy import (
     Column,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    func,
+    select,
+    true,
 )
 from sqlalchemy.orm import relationship
 
@@ -23,6 +27,9 @@ from app.usecase.content.content_query_model import ContentReadModel
 from app.usecase.course import CourseReadModel
 from app.usecase.review.review_query_model import ReviewReadModel
 
+COURSE_NAME_INDEX = "ix_courses_name_lower"
+COURSE_CATEGORIES_CATEGORY_INDEX = "ix_course_categories_category_id"
+
 
 def unixtimestamp() -> int:
     return int(datetime.now().timestamp() * 1000)
@@ -31,7 +38,7 @@ def unixtimestamp() -> int:
 def get_categories(categories):
     v = []
     for i in categories:
-        v.append(i.category)
+        v.append(i.name)
     return v
 
 
@@ -42,21 +49,12 @@ def get_recommendations(reviews):
     }
 
 
-def create_categories(id, categories):
-    v = []
-    if categories is None:
-        return v
-    for i in categories:
-        v.append(Category(id=shortuuid.uuid(), course_id=id, category=i))
-    return v
-
-
 class CourseDTO(Base):
     __tablename__ = "courses"
     id: Union[str, Column] = Column(String, primary_key=True, autoincrement=False)
     creator_id: Union[str, Column] = Column(String, autoincrement=False)
     name: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
-    price: Union[float, Column] = Column(Float, nullable=False)
+    price: Union[float, Column] = Column(Float, index=True, nullable=False)
     active: Union[bool, Column] = Column(Boolean, nullable=False)
     subscription_id: Union[int, Column] = Column(Integer, nullable=False)
     language: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
@@ -69,11 +67,20 @@ class CourseDTO(Base):
     created_at: Union[int, Column] = Column(BigInteger, index=True, nullable=False)
     updated_at: Union[int, Column] = Column(BigInteger, index=True, nullable=False)
 
-    categories = relationship("Category", cascade="all, delete")
+    # Course categories are written by the repository, which resolves names
+    # to the shared category rows; the relationship only reads them.
+    categories = relationship(
+        "Category",
+        secondary="course_categories",
+        viewonly=True,
+        order_by="[CourseCategory.position, CourseCategory.category_id]",
+    )
     collabs = relationship("Collab", cascade="all, delete")
     content = relationship("Content", cascade="all, delete")
     reviews = relationship("ReviewDTO", cascade="all, delete")
 
+    __table_args__ = (Index(COURSE_NAME_INDEX, func.lower(name), unique=True),)
+
     def to_entity(self) -> Course:
         return Course(
             id=self.id,
@@ -94,11 +101,12 @@ class CourseDTO(Base):
         )
 
     def to_read_model(self) -> CourseReadModel:
-        return CourseReadModel(
+        # Rows come from our own schema, so skip re-validating every field.
+        return CourseReadModel.construct(
             id=self.id,
             creator_id=self.creator_id,
             name=self.name,
-            price=self.price,
+            price=float(self.price),
             subscription_id=self.subscription_id,
             language=self.language,
             country=self.country,
@@ -128,9 +136,6 @@ class CourseDTO(Base):
 
     @staticmethod
     def from_entity(course: Course) -> "CourseDTO":
-        now = unixtimestamp()
-        if course.created_at is None:
-            course.created_at = now
         return CourseDTO(
             id=course.id,
             creator_id=course.creator_id,
@@ -141,11 +146,10 @@ class CourseDTO(Base):
             language=course.language,
             country=course.country,
             description=course.description,
-            categories=create_categories(course.id, course.categories),
             presentation_video=course.presentation_video,
             image=course.image,
             created_at=course.created_at,
-            updated_at=now,
+            updated_at=course.updated_at,
         )
 
     def get_categories(self) -> List[str]:
@@ -154,11 +158,22 @@ class CourseDTO(Base):
 
 class Category(Base):
     __tablename__ = "categories"
-    id: Union[str, Column] = Column(String, primary_key=True, autoincrement=False)
+    id: Union[int, Column] = Column(Integer, primary_key=True)
+    name: Union[str, Column] = Column(String, nullable=False, unique=True)
+
+
+class CourseCategory(Base):
+    __tablename__ = "course_categories"
     course_id: Union[str, Column] = Column(
-        String, ForeignKey("courses.id"), autoincrement=False
+        String, ForeignKey("courses.id"), primary_key=True, autoincrement=False
+    )
+    category_id: Union[int, Column] = Column(
+        Integer, ForeignKey("categories.id"), primary_key=True, autoincrement=False
     )
-    category: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
+    # Order the categories were given in; migrated links all share 0.
+    position: Union[int, Column] = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index(COURSE_CATEGORIES_CATEGORY_INDEX, category_id, course_id),)
 
 
 class Collab(Base):
@@ -166,7 +181,7 @@ class Collab(Base):
     id: Union[str, Column] = Column(String, primary_key=True, autoincrement=False)
     user_id: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
     course_id: Union[str, Column] = Column(
-        String, ForeignKey("courses.id"), autoincrement=False
+        String, ForeignKey("courses.id"), index=True, autoincrement=False
     )
     active: Union[bool, Column] = Column(Boolean, nullable=False, autoincrement=False)
 
@@ -195,7 +210,7 @@ class Content(Base):
     id: Union[str, Column] = Column(String, primary_key=True, autoincrement=False)
     title: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
     course_id: Union[str, Column] = Column(
-        String, ForeignKey("courses.id"), autoincrement=False
+        String, ForeignKey("courses.id"), index=True, autoincrement=False
     )
     chapter: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
     order: Union[str, Column] = Column(String, nullable=False, autoincrement=False)
@@ -221,11 +236,11 @@ class Content(Base):
         )
 
     def to_read_model(self):
-        return ContentReadModel(
+        return ContentReadModel.construct(
             id=self.id,
             title=self.title,
-            chapter=self.chapter,
-            order=self.order,
+            chapter=int(self.chapter),
+            order=int(self.order),
             description=self.description,
             video=self.video,
             image=self.image,
@@ -236,7 +251,11 @@ class ReviewDTO(Base):
     __tablename__ = "reviews"
     id: Union[str, Column] = Column(String, primary_key=True, autoincrement=False)
     course_id: Union[str, Column] = Column(
-        String, ForeignKey("courses.id"), primary_key=True, autoincrement=False
+        String,
+        ForeignKey("courses.id"),
+        primary_key=True,
+        index=True,
+        autoincrement=False,
     )
     recommended: Union[bool, Column] = Column(
         Boolean, nullable=False, autoincrement=False
@@ -266,3 +285,38 @@ class ReviewDTO(Base):
 
     def is_recommended(self):
         return self.recommended
+
+
+def recommendation_columns():
+    courses = CourseDTO.__table__
+    reviews = ReviewDTO.__table__
+    return (
+        select(func.count())
+        .where(reviews.c.course_id == courses.c.id, reviews.c.recommended == true())
+        .scalar_subquery()
+        .label("recommended"),
+        select(func.count())
+        .where(reviews.c.course_id == courses.c.id)
+        .scalar_subquery()
+        .label("total"),
+    )
+
+
+def course_from_row(row, categories: List[str]) -> Course:
+    return Course(
+        id=row.id,
+        creator_id=row.creator_id,
+        name=row.name,
+        price=row.price,
+        active=row.active,
+        language=row.language,
+        country=row.country,
+        description=row.description,
+        categories=categories,
+        presentation_video=row.presentation_video,
+        image=row.image,
+        subscription_id=row.subscription_id,
+        recommendations={"recommended": row.recommended, "total": row.total},
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
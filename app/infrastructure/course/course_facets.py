@@ -0,0 +1,98 @@
+from typing import Dict, Sequence, Tuple
+
+from sqlalchemy import func, null, select, tuple_, union_all
+from sqlalchemy.orm.session import Session
+
+from ...usecase.course.course_query_model import Facet
+from .course_catalog_metrics import by_count, price_band, price_band_labels
+from .course_dto import Category, CourseCategory, CourseDTO
+
+COURSES = CourseDTO.__table__
+CATEGORIES = Category.__table__
+COURSE_CATEGORIES = CourseCategory.__table__
+COURSE_FACETS = {
+    Facet.LANGUAGE: COURSES.c.language,
+    Facet.COUNTRY: COURSES.c.country,
+    Facet.PRICE_BAND: price_band(COURSES.c.price),
+}
+
+
+def facet_statement(dialect: str, facets: Sequence[Facet], conditions: Sequence):
+    # Counts the filtered courses per value of each facet, plus their total,
+    # so a search asking for facets needs no separate count query. Courses
+    # are filtered once; categories are counted by joining their links to
+    # the filtered courses.
+    course_facets = [facet for facet in COURSE_FACETS if facet in facets]
+    filtered = (
+        select(
+            COURSES.c.id.label("id"),
+            *[COURSE_FACETS[facet].label(facet.value) for facet in course_facets],
+        )
+        .where(*conditions)
+        .cte("filtered_courses")
+    )
+    keys = [filtered.c[facet.value] for facet in course_facets]
+    nulls = [null().label(key.name) for key in keys]
+
+    def grouped_by(key):
+        return [
+            column if column is key else placeholder
+            for column, placeholder in zip(keys, nulls)
+        ]
+
+    if dialect == "postgresql":
+        statements = [
+            select(*keys, null().label("category"), func.count())
+            .select_from(filtered)
+            .group_by(func.grouping_sets(tuple_(), *[tuple_(key) for key in keys]))
+        ]
+    else:
+        statements = [
+            select(*nulls, null().label("category"), func.count()).select_from(filtered)
+        ] + [
+            select(*grouped_by(key), null().label("category"), func.count()).group_by(
+                key
+            )
+            for key in keys
+        ]
+    if Facet.CATEGORY in facets:
+        statements.append(
+            select(*nulls, CATEGORIES.c.name.label("category"), func.count())
+            .select_from(filtered)
+            .join(COURSE_CATEGORIES, COURSE_CATEGORIES.c.course_id == filtered.c.id)
+            .join(CATEGORIES, CATEGORIES.c.id == COURSE_CATEGORIES.c.category_id)
+            .group_by(CATEGORIES.c.name)
+        )
+    return union_all(*statements), course_facets
+
+
+def fetch_facets(
+    session: Session, facets: Sequence[Facet], conditions: Sequence
+) -> Tuple[int, Dict[str, Dict[str, int]]]:
+    statement, course_facets = facet_statement(
+        session.get_bind().dialect.name, facets, conditions
+    )
+    total = 0
+    counts: Dict[str, Dict[str, int]] = {facet.value: {} for facet in facets}
+    for *keys, category, count in session.execute(statement):
+        # Every faceted column is NOT NULL, so a row with no key set is the
+        # total and otherwise exactly one key is.
+        grouped = [
+            (facet, key) for facet, key in zip(course_facets, keys) if key is not None
+        ]
+        if category is not None:
+            counts[Facet.CATEGORY.value][category] = count
+        elif grouped:
+            facet, key = grouped[0]
+            counts[facet.value][key] = count
+        else:
+            total = count
+    price_bands = counts.get(Facet.PRICE_BAND.value)
+    if price_bands is not None:
+        counts[Facet.PRICE_BAND.value] = {
+            label: price_bands.get(label, 0) for label in price_band_labels()
+        }
+    return total, {
+        facet: values if facet == Facet.PRICE_BAND.value else by_count(values)
+        for facet, values in counts.items()
+    }
@@ -0,0 +1,28 @@
+from typing import Dict, Optional
+
+from sqlalchemy.orm.session import Session
+
+from ..monitoring import cache_requests
+from .course_dto import CourseDTO
+
+
+class CourseIdentityMap:
+    def __init__(self, session: Session):
+        self.session: Session = session
+        self._courses: Dict[str, Optional[CourseDTO]] = {}
+
+    def get(self, id: str) -> Optional[CourseDTO]:
+        if id in self._courses:
+            cache_requests.inc("course_identity_map", "hit")
+        else:
+            cache_requests.inc("course_identity_map", "miss")
+            self._courses[id] = self.session.query(CourseDTO).filter_by(id=id).first()
+        return self._courses[id]
+
+    def expire(self, id: str):
+        course = self._courses.pop(id, None)
+        if course is not None and course in self.session:
+            self.session.expire(course)
+
+    def clear(self):
+        self._courses.clear()
@@ -0,0 +1,169 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Tuple, Union
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm.session import Session
+
+from app.infrastructure.database import Base
+
+from .course_dto import Category, CourseCategory, CourseDTO
+
+
+class CourseMonthMetricsDTO(Base):
+    __tablename__ = "course_metrics_by_month"
+    year: Union[int, Column] = Column(Integer, primary_key=True, autoincrement=False)
+    month: Union[int, Column] = Column(Integer, primary_key=True, autoincrement=False)
+    courses: Union[int, Column] = Column(Integer, nullable=False, default=0)
+
+
+class CourseSubscriptionMetricsDTO(Base):
+    __tablename__ = "course_metrics_by_subscription"
+    subscription_id: Union[int, Column] = Column(
+        Integer, primary_key=True, autoincrement=False
+    )
+    courses: Union[int, Column] = Column(Integer, nullable=False, default=0)
+
+
+class CourseCategoryMetricsDTO(Base):
+    __tablename__ = "course_metrics_by_category"
+    category: Union[str, Column] = Column(String, primary_key=True, autoincrement=False)
+    courses: Union[int, Column] = Column(Integer, nullable=False, default=0)
+
+
+ROLLUP_TABLES = [
+    CourseMonthMetricsDTO.__table__,
+    CourseSubscriptionMetricsDTO.__table__,
+    CourseCategoryMetricsDTO.__table__,
+]
+
+
+def created_month(created_at: int) -> Tuple[int, int]:
+    # Same calendar the metrics have always been reported in: server local time.
+    created = datetime.fromtimestamp(created_at / 1000)
+    return created.year, created.month
+
+
+def _dialect(executor: Union[Session, Connection]) -> str:
+    if isinstance(executor, Session):
+        return executor.get_bind().dialect.name
+    return executor.dialect.name
+
+
+def _add(executor: Union[Session, Connection], table, key: Dict, delta: int):
+    if delta == 0:
+        return
+    dialect = _dialect(executor)
+    if dialect in ("postgresql", "sqlite"):
+        upsert = (postgresql if dialect == "postgresql" else sqlite).insert(table)
+        executor.execute(
+            upsert.values(**key, courses=delta).on_conflict_do_update(
+                index_elements=list(key),
+                set_={"courses": table.c.courses + upsert.excluded.courses},
+            )
+        )
+        return
+    conditions = [table.c[column] == value for column, value in key.items()]
+    result = executor.execute(
+        update(table).where(*conditions).values(courses=table.c.courses + delta)
+    )
+    if result.rowcount == 0:
+        executor.execute(insert(table).values(**key, courses=delta))
+
+
+class CourseMetricsRollup:
+    # Keeps the metrics rollups in step with the course tables. Every change
+    # goes through the caller's session, so it commits or rolls back together
+    # with the change it accounts for.
+    def __init__(self, session: Session):
+        self.session: Session = session
+
+    def course_created(
+        self, created_at: int, subscription_id: int, categories: Iterable[str]
+    ):
+        year, month = created_month(created_at)
+        _add(
+            self.session,
+            CourseMonthMetricsDTO.__table__,
+            {"year": year, "month": month},
+            1,
+        )
+        self.subscription_changed(None, subscription_id)
+        self.categories_changed(categories, [])
+
+    def subscription_changed(self, previous, current):
+        if previous == current:
+            return
+        table = CourseSubscriptionMetricsDTO.__table__
+        if previous is not None:
+            _add(self.session, table, {"subscription_id": previous}, -1)
+        _add(self.session, table, {"subscription_id": current}, 1)
+
+    def categories_changed(self, added: Iterable[str], removed: Iterable[str]):
+        deltas: Counter[str] = Counter(added)
+        deltas.subtract(Counter(removed))
+        table = CourseCategoryMetricsDTO.__table__
+        for category, delta in sorted(deltas.items()):
+            _add(self.session, table, {"category": category}, delta)
+
+
+def rebuild_course_metrics(connection: Union[Session, Connection]):
+    if _dialect(connection) == "postgresql":
+        # Blocks course writes' rollup updates until the rebuild commits, so
+        # none is counted twice or lost.
+        connection.execute(
+            text(
+                f"LOCK TABLE {', '.join(table.name for table in ROLLUP_TABLES)} "
+                "IN EXCLUSIVE MODE"
+            )
+        )
+    for table in ROLLUP_TABLES:
+        connection.execute(delete(table))
+
+    months: Dict[Tuple[int, int], int] = Counter()
+    for (created_at,) in connection.execute(select(CourseDTO.__table__.c.created_at)):
+        months[created_month(created_at)] += 1
+    if months:
+        connection.execute(
+            insert(CourseMonthMetricsDTO.__table__),
+            [
+                {"year": year, "month": month, "courses": courses}
+                for (year, month), courses in months.items()
+            ],
+        )
+
+    courses = CourseDTO.__table__
+    subscriptions = connection.execute(
+        select(courses.c.subscription_id, func.count(courses.c.id)).group_by(
+            courses.c.subscription_id
+        )
+    ).all()
+    if subscriptions:
+        connection.execute(
+            insert(CourseSubscriptionMetricsDTO.__table__),
+            [{"subscription_id": s, "courses": c} for s, c in subscriptions],
+        )
+
+    course_categories = CourseCategory.__table__
+    categories = connection.execute(
+        select(Category.__table__.c.name, func.count(course_categories.c.course_id))
+        .join_from(course_categories, Category.__table__)
+        .group_by(Category.__table__.c.name)
+    ).all()
+    if categories:
+        connection.execute(
+            insert(CourseCategoryMetricsDTO.__table__),
+            [{"category": category, "courses": c} for category, c in categories],
+        )
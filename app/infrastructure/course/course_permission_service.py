@@ -0,0 +1,29 @@
+from typing import Optional
+
+from sqlalchemy.orm.session import Session
+
+from app.usecase.course import CoursePermissionService
+
+from .course_dto import Collab, CourseDTO
+
+
+class CoursePermissionServiceImpl(CoursePermissionService):
+    def __init__(self, session: Session):
+        self.session: Session = session
+
+    def find_creator_id(self, course_id: str) -> Optional[str]:
+        # Only the creator column: the check never needs the rest of the row.
+        row = (
+            self.session.query(CourseDTO.creator_id)
+            .filter(CourseDTO.id == course_id)
+            .first()
+        )
+        return None if row is None else row[0]
+
+    def has_active_collab(self, course_id: str, user_id: str) -> bool:
+        row = (
+            self.session.query(Collab.id)
+            .filter_by(course_id=course_id, user_id=user_id, active=True)
+            .first()
+        )
+        return row is not None
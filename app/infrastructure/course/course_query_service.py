@@ -1,69 +1,134 @@
 import logging
-from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, cast
 
-from sqlalchemy import func
-from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy import Column, func, select, true
 from sqlalchemy.orm.session import Session
 
 from app.domain.collab.collab_exception import NoCollabsInCourseError
 from app.usecase.collab.collab_query_model import CollabReadModel
-from app.usecase.course import CourseQueryService, CourseReadModel
+from app.usecase.course import CategoryMatch, CourseQueryService, CourseReadModel, Facet
 
 from ...domain.course import CourseNotFoundError
 from ...usecase.content.content_query_model import ContentReadModel
+from ...usecase.metrics.catalog_metrics_query_model import CatalogMetricsReadModel
 from ...usecase.metrics.category_metrics_query_model import CategoryMetricsReadModel
 from ...usecase.metrics.new_courses_metrics_query_model import (
     NewCoursesMetricsReadModel,
 )
+from ...usecase.metrics.recommendation_metrics_query_model import (
+    RecommendationBucketReadModel,
+    RecommendationTimeSeriesReadModel,
+)
 from ...usecase.metrics.subscriptions_metrics_query_model import (
     SubscriptionMetricsReadModel,
 )
+from ...usecase.metrics.time_buckets import TimeBuckets
+from ...usecase.metrics.time_series_metrics_query_model import (
+    TimeBucketMetricsReadModel,
+    TimeSeriesMetricsReadModel,
+)
 from ...usecase.review.review_query_model import ReviewReadModel
-from .course_dto import Category, CourseDTO
+from .course_catalog_metrics import catalog_metrics_cache, fetch_catalog_metrics
+from .course_category_cache import category_list_cache
+from .course_dto import Category, CourseCategory, CourseDTO, ReviewDTO
+from .course_facets import fetch_facets
+from .course_identity_map import CourseIdentityMap
+from .course_metrics_rollup import (
+    CourseCategoryMetricsDTO,
+    CourseMonthMetricsDTO,
+    CourseSubscriptionMetricsDTO,
+)
+from .course_read_mapper import (
+    categories_by_course,
+    course_read_columns,
+    course_read_model_from_row,
+    course_read_models,
+)
+from .course_time_series import aggregate_by_bucket, count_by_bucket
 
 logger = logging.getLogger(__name__)
 
 
+def course_ids_in_categories(names: List[str], match_all: bool = False):
+    # Resolves the names once against the small dimension table, so courses
+    # are matched on the (category_id, course_id) index.
+    course_ids = select(CourseCategory.course_id).where(
+        CourseCategory.category_id.in_(  # type: ignore
+            select(Category.id).where(Category.name.in_(names))  # type: ignore
+        )
+    )
+    if match_all:
+        # Each course is linked to a category once, so it has all of them
+        # when it has as many links among them as there are names.
+        course_ids = course_ids.group_by(CourseCategory.course_id).having(
+            func.count() == len(set(names))
+        )
+    return course_ids
+
+
 class CourseQueryServiceImpl(CourseQueryService):
-    def __init__(self, session: Session):
+    def __init__(
+        self, session: Session, identity_map: Optional[CourseIdentityMap] = None
+    ):
         self.session: Session = session
+        self.identity_map: CourseIdentityMap = identity_map or CourseIdentityMap(
+            session
+        )
 
     def find_by_id(self, id: str) -> Optional[CourseReadModel]:
         try:
-            course_dto = self.session.query(CourseDTO).filter_by(id=id).one()
-        except NoResultFound:
-            return None
+            row = (
+                self.session.query(*course_read_columns())
+                .filter(CourseDTO.id == id)
+                .first()
+            )
+            if row is None:
+                return None
+            categories = categories_by_course(self.session, [id])
         except:
             raise
 
-        return course_dto.to_read_model()
+        return course_read_model_from_row(row, categories[id])
 
     def find_all(
         self, limit: int = 100, offset: int = 0
     ) -> Tuple[List[CourseReadModel], int]:
         try:
-            course_dtos = (
-                self.session.query(CourseDTO)
+            rows = (
+                self.session.query(*course_read_columns())
                 .order_by(CourseDTO.updated_at)
                 .slice(limit * offset, limit * (offset + 1))
                 .all()
             )
+            courses = course_read_models(self.session, rows)
+            count = self.session.query(func.count(CourseDTO.id)).scalar()
         except:
             raise
 
-        return (
-            list(map(lambda course_dto: course_dto.to_read_model(), course_dtos)),
-            self.session.query(CourseDTO).count(),
-        )
+        return courses, count
 
     def find_all_categories(self) -> List[str]:
         try:
-            categories = self.session.query(Category).all()
+            cached = category_list_cache.get()
+            if cached is not None:
+                return cached
+            version = category_list_cache.version
+            categories = (
+                self.session.query(Category.name)
+                .filter(
+                    self.session.query(CourseCategory)
+                    .filter(CourseCategory.category_id == Category.id)
+                    .exists()
+                )
+                .order_by(Category.id)
+                .all()
+            )
         except:
             raise
 
-        return list(dict.fromkeys(list(map(lambda cat: cat.category, categories))))
+        names = [category.name for category in categories]
+        category_list_cache.put(version, names)
+        return names
 
     def find_by_filters(
         self,
@@ -74,64 +139,98 @@ class CourseQueryServiceImpl(CourseQueryService):
         subscription_id: Optional[int],
         inactive_courses: Optional[bool],
         inactive_collab: Optional[bool],
-        category: Optional[str],
-        language: Optional[str],
-        country: Optional[str],
+        category: Optional[List[str]],
+        language: Optional[List[str]],
+        country: Optional[List[str]],
         ignore_free: Optional[bool],
         ignore_paid: Optional[bool],
         text: Optional[str],
+        facets: Optional[List[Facet]] = None,
+        category_match: CategoryMatch = CategoryMatch.ANY,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+        updated_from: Optional[int] = None,
+        updated_to: Optional[int] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Tuple[List[CourseReadModel], int]:
+    ) -> Tuple[List[CourseReadModel], int, Optional[Dict[str, Dict[str, int]]]]:
         try:
-            courses_q = self.session.query(CourseDTO)
+            conditions = []
             if ids:
-                courses_q = courses_q.filter(CourseDTO.id.in_(ids))  # type: ignore
+                conditions.append(CourseDTO.id.in_(ids))  # type: ignore
             elif not inactive_courses:
-                courses_q = courses_q.filter_by(active=True)
+                conditions.append(CourseDTO.active == true())
             if name:
-                courses_q = courses_q.filter_by(name=name)
+                conditions.append(CourseDTO.name == name)
             if creator_id:
-                courses_q = courses_q.filter_by(creator_id=creator_id)
+                conditions.append(CourseDTO.creator_id == creator_id)
             if collab_id:
-                courses_q = courses_q.filter(CourseDTO.collabs.any(user_id=collab_id))
+                conditions.append(CourseDTO.collabs.any(user_id=collab_id))
             if collab_id and not inactive_collab:
-                courses_q = courses_q.filter(
-                    CourseDTO.collabs.any(user_id=collab_id, active=True)
-                )
+                conditions.append(CourseDTO.collabs.any(user_id=collab_id, active=True))
             if subscription_id is not None:
-                courses_q = courses_q.filter_by(subscription_id=subscription_id)
+                conditions.append(CourseDTO.subscription_id == subscription_id)
             if country:
-                courses_q = courses_q.filter_by(country=country)
+                conditions.append(CourseDTO.country.in_(country))  # type: ignore
             if language:
-                courses_q = courses_q.filter_by(language=language)
+                conditions.append(CourseDTO.language.in_(language))  # type: ignore
             if ignore_free:
-                courses_q = courses_q.filter(CourseDTO.price > 0)
+                conditions.append(CourseDTO.price > 0)
             if ignore_paid:
-                courses_q = courses_q.filter(CourseDTO.price == 0)
+                conditions.append(CourseDTO.price == 0)
+            if min_price is not None:
+                conditions.append(CourseDTO.price >= min_price)
+            if max_price is not None:
+                conditions.append(CourseDTO.price <= max_price)
+            if created_from is not None:
+                conditions.append(CourseDTO.created_at >= created_from)
+            if created_to is not None:
+                conditions.append(CourseDTO.created_at <= created_to)
+            if updated_from is not None:
+                conditions.append(CourseDTO.updated_at >= updated_from)
+            if updated_to is not None:
+                conditions.append(CourseDTO.updated_at <= updated_to)
             if category:
-                courses_q = courses_q.filter(
-                    CourseDTO.categories.any(category=category)
+                conditions.append(
+                    CourseDTO.id.in_(  # type: ignore
+                        course_ids_in_categories(
+                            category, category_match == CategoryMatch.ALL
+                        )
+                    )
                 )
             if text:
                 text = "%" + text + "%"
-                courses_q = courses_q.filter(
+                conditions.append(
                     (CourseDTO.name.ilike(text))  # type: ignore
                     | (CourseDTO.description.ilike(text))  # type: ignore
                 )
 
-            course_dtos = courses_q.slice(limit * offset, limit * (offset + 1)).all()
+            rows = (
+                self.session.query(*course_read_columns())
+                .filter(*conditions)
+                .slice(limit * offset, limit * (offset + 1))
+                .all()
+            )
+            courses = course_read_models(self.session, rows)
+            facet_counts = None
+            if facets:
+                count, facet_counts = fetch_facets(self.session, facets, conditions)
+            else:
+                count = (
+                    self.session.query(func.count(CourseDTO.id))
+                    .filter(*conditions)
+                    .scalar()
+                )
         except:
             raise
 
-        return (
-            list(map(lambda course_dto: course_dto.to_read_model(), course_dtos)),
-            courses_q.count(),
-        )
+        return courses, count, facet_counts
 
     def find_collabs_by_id(self, id: str) -> List[CollabReadModel]:
         try:
-            course = self.session.query(CourseDTO).filter_by(id=id).first()
+            course = self.identity_map.get(id)
             if not course:
                 raise CourseNotFoundError
             collabs = list(filter(lambda c: c.active, course.collabs))
@@ -144,7 +243,7 @@ class CourseQueryServiceImpl(CourseQueryService):
 
     def fetch_content_by_id(self, id: str) -> List[ContentReadModel]:
         try:
-            course = self.session.query(CourseDTO).filter_by(id=id).first()
+            course = self.identity_map.get(id)
             if not course:
                 raise CourseNotFoundError
             content = list(filter(lambda c: c.active, course.content))
@@ -156,7 +255,7 @@ class CourseQueryServiceImpl(CourseQueryService):
 
     def fetch_reviews_by_id(self, id: str) -> List[ReviewReadModel]:
         try:
-            course = self.session.query(CourseDTO).filter_by(id=id).first()
+            course = self.identity_map.get(id)
             if not course:
                 raise CourseNotFoundError
         except:
@@ -167,53 +266,146 @@ class CourseQueryServiceImpl(CourseQueryService):
     def get_category_metrics(
         self, limit: int
     ) -> Tuple[List[CategoryMetricsReadModel], int]:
+        rollup = CourseCategoryMetricsDTO
         try:
-            cat_tuples = (
-                self.session.query(Category.category, func.count(Category.category))
-                .group_by(Category.category)
+            rows = (
+                self.session.query(rollup.category, rollup.courses)
+                .filter(rollup.courses > 0)
+                .order_by(cast(Column, rollup.courses).desc(), rollup.category)
+                .limit(limit)
                 .all()
             )
-            categories = list(
-                map(
-                    lambda c: CategoryMetricsReadModel(category=c[0], count=c[1]),
-                    cat_tuples,
-                )
+            count = (
+                self.session.query(func.count(rollup.category))
+                .filter(rollup.courses > 0)
+                .scalar()
             )
-            categories = sorted(categories, key=lambda x: x.count, reverse=True)
-            count = len(self.find_all_categories())
         except:
             raise
 
-        return categories[0:limit], count
+        categories = [
+            CategoryMetricsReadModel(category=category, count=courses)
+            for category, courses in rows
+        ]
+        return categories, count
 
     def get_courses_metrics(self, year) -> NewCoursesMetricsReadModel:
+        rollup = CourseMonthMetricsDTO
         try:
-            courses = self.session.query(CourseDTO).all()
+            query = self.session.query(rollup.month, func.sum(rollup.courses))
             if year is not None:
-                courses = list(
-                    filter(
-                        lambda c: datetime.fromtimestamp(c.created_at / 1000).year
-                        == year,
-                        courses,
-                    )
-                )
+                query = query.filter(rollup.year == year)
             else:
                 year = 0
             months = [0] * 12
-            for i in courses:
-                months[datetime.fromtimestamp(i.created_at / 1000).month - 1] += 1
+            for month, courses in query.group_by(rollup.month).all():
+                months[month - 1] += int(courses)
         except:
             raise
 
         return NewCoursesMetricsReadModel(year=year, months=months)
 
     def get_subscription_metrics(self) -> SubscriptionMetricsReadModel:
+        rollup = CourseSubscriptionMetricsDTO
         try:
-            courses = self.session.query(CourseDTO).all()
+            rows = self.session.query(rollup.subscription_id, rollup.courses).all()
             subscriptions = [0] * 3
-            for i in courses:
-                subscriptions[i.subscription_id] += 1
+            for subscription_id, courses in rows:
+                subscriptions[subscription_id] += courses
         except:
             raise
 
         return SubscriptionMetricsReadModel(subscriptions=subscriptions)
+
+    def get_time_series_metrics(
+        self, buckets: TimeBuckets
+    ) -> TimeSeriesMetricsReadModel:
+        try:
+            courses = count_by_bucket(
+                self.session, "courses", CourseDTO.created_at, buckets.edges_ms
+            )
+            reviews = count_by_bucket(
+                self.session, "reviews", ReviewDTO.date, buckets.edges_ms
+            )
+        except:
+            raise
+
+        return TimeSeriesMetricsReadModel(
+            granularity=buckets.granularity,
+            timezone=buckets.timezone,
+            buckets=[
+                TimeBucketMetricsReadModel(
+                    start=start, end=end, courses=courses[i], reviews=reviews[i]
+                )
+                for i, (start, end) in enumerate(zip(buckets.edges, buckets.edges[1:]))
+            ],
+        )
+
+    def get_catalog_metrics(self) -> CatalogMetricsReadModel:
+        try:
+            metrics = catalog_metrics_cache.get()
+            if metrics is None:
+                metrics = fetch_catalog_metrics(self.session)
+                catalog_metrics_cache.put(metrics)
+        except:
+            raise
+
+        return metrics
+
+    def get_recommendation_metrics(
+        self,
+        buckets: TimeBuckets,
+        course_id: Optional[str] = None,
+        creator_id: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> RecommendationTimeSeriesReadModel:
+        conditions = []
+        if course_id:
+            conditions.append(ReviewDTO.course_id == course_id)
+        if creator_id:
+            conditions.append(
+                ReviewDTO.course_id.in_(  # type: ignore
+                    select(CourseDTO.id).where(CourseDTO.creator_id == creator_id)
+                )
+            )
+        if category:
+            conditions.append(
+                ReviewDTO.course_id.in_(  # type: ignore
+                    course_ids_in_categories([category])
+                )
+            )
+        # Reviews never change and neither does a course's creator, but a
+        # course can be moved between categories, so those series are not
+        # cached.
+        series = None if category else ("recommendations", course_id, creator_id)
+        try:
+            totals = aggregate_by_bucket(
+                self.session,
+                series,
+                ReviewDTO.date,
+                buckets.edges_ms,
+                flags=[ReviewDTO.recommended == true()],
+                conditions=conditions,
+            )
+        except:
+            raise
+
+        return RecommendationTimeSeriesReadModel(
+            granularity=buckets.granularity,
+            timezone=buckets.timezone,
+            course_id=course_id,
+            creator_id=creator_id,
+            category=category,
+            buckets=[
+                RecommendationBucketReadModel(
+                    start=start,
+                    end=end,
+                    reviews=reviews,
+                    recommended=recommended,
+                    rate=recommended / reviews if reviews else None,
+                )
+                for (start, end), (reviews, recommended) in zip(
+                    zip(buckets.edges, buckets.edges[1:]), totals
+                )
+            ],
+        )
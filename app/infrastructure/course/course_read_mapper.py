@@ -0,0 +1,77 @@
+from typing import Dict, List, cast
+
+from sqlalchemy import Column
+from sqlalchemy.orm.session import Session
+
+from app.usecase.course import CourseReadModel
+
+from .course_dto import Category, CourseCategory, CourseDTO, recommendation_columns
+
+COURSE_READ_COLUMNS = (
+    "id",
+    "creator_id",
+    "name",
+    "price",
+    "active",
+    "subscription_id",
+    "language",
+    "country",
+    "description",
+    "presentation_video",
+    "image",
+    "created_at",
+    "updated_at",
+)
+
+
+def course_read_columns():
+    courses = CourseDTO.__table__
+    return [courses.c[name] for name in COURSE_READ_COLUMNS] + list(
+        recommendation_columns()
+    )
+
+
+def categories_by_course(session: Session, ids: List[str]) -> Dict[str, List[str]]:
+    categories: Dict[str, List[str]] = {id: [] for id in ids}
+    if not ids:
+        return categories
+    rows = (
+        session.query(
+            CourseCategory.course_id, cast(Column, Category.name).label("category")
+        )
+        .filter(
+            Category.id == CourseCategory.category_id,
+            cast(Column, CourseCategory.course_id).in_(ids),
+        )
+        # Rows arrive per course in the order the categories were given.
+        .order_by(CourseCategory.position, CourseCategory.category_id)
+        .all()
+    )
+    for row in rows:
+        categories.setdefault(row.course_id, []).append(row.category)
+    return categories
+
+
+def course_read_model_from_row(row, categories: List[str]) -> CourseReadModel:
+    return CourseReadModel.construct(
+        id=row.id,
+        creator_id=row.creator_id,
+        name=row.name,
+        price=float(row.price),
+        active=row.active,
+        subscription_id=row.subscription_id,
+        language=row.language,
+        country=row.country,
+        description=row.description,
+        categories=categories,
+        recommendations={"recommended": row.recommended, "total": row.total},
+        presentation_video=row.presentation_video,
+        image=row.image,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+def course_read_models(session: Session, rows) -> List[CourseReadModel]:
+    categories = categories_by_course(session, [row.id for row in rows])
+    return [course_read_model_from_row(row, categories[row.id]) for row in rows]
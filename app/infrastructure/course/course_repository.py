@@ -1,11 +1,19 @@
-from typing import Optional
+from typing import List, Optional
 
 import shortuuid
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
 
 from app.domain.collab.collab_exception import UserAlreadyInCourseError
-from app.domain.course import Course, CourseNotFoundError, CourseRepository
+from app.domain.course import (
+    Course,
+    CourseNameAlreadyExistsError,
+    CourseNotFoundError,
+    CourseRepository,
+)
 from app.usecase.collab.collab_query_model import CollabReadModel
 from app.usecase.course import CourseCommandUseCaseUnitOfWork
 
@@ -20,22 +28,42 @@ from ...usecase.content.content_command_model import (
     ContentUpdateModel,
 )
 from ...usecase.content.content_query_model import ContentReadModel
-from .course_dto import Category, Collab, Content, CourseDTO, ReviewDTO
+from .course_category_cache import CATEGORIES_CHANGED, category_list_cache
+from .course_dto import (
+    COURSE_NAME_INDEX,
+    Category,
+    Collab,
+    Content,
+    CourseCategory,
+    CourseDTO,
+    ReviewDTO,
+    course_from_row,
+    recommendation_columns,
+    unixtimestamp,
+)
+from .course_identity_map import CourseIdentityMap
+from .course_metrics_rollup import CourseMetricsRollup
 
 
 class CourseRepositoryImpl(CourseRepository):
-    def __init__(self, session: Session):
+    def __init__(
+        self, session: Session, identity_map: Optional[CourseIdentityMap] = None
+    ):
         self.session: Session = session
+        self.identity_map: CourseIdentityMap = identity_map or CourseIdentityMap(
+            session
+        )
+        self.metrics_rollup: CourseMetricsRollup = CourseMetricsRollup(session)
 
-    def find_by_id(self, id: str) -> Optional[Course]:
-        try:
-            course_dto = self.session.query(CourseDTO).filter_by(id=id).one()
-        except NoResultFound:
-            return None
-        except:
-            raise
+    def _get_course(self, id: str) -> CourseDTO:
+        course = self.identity_map.get(id)
+        if course is None:
+            raise CourseNotFoundError
+        return course
 
-        return course_dto.to_entity()
+    def find_by_id(self, id: str) -> Optional[Course]:
+        course_dto = self.identity_map.get(id)
+        return None if course_dto is None else course_dto.to_entity()
 
     def find_by_name(self, name: str) -> Optional[Course]:
         try:
@@ -48,49 +76,160 @@ class CourseRepositoryImpl(CourseRepository):
         return course_dto.to_entity()
 
     def create(self, course: Course):
+        # The caller builds its response from the entity, which should carry
+        # the stored timestamps and list the categories once each.
+        now = unixtimestamp()
+        if course.created_at is None:
+            course.created_at = now
+        course.updated_at = now
+        categories = list(dict.fromkeys(course.categories or []))
+        course.categories = categories
         course_dto = CourseDTO.from_entity(course)
         try:
             self.session.add(course_dto)
-        except:
+            self.session.flush()
+            self._add_categories(course_dto.id, categories)
+            self.metrics_rollup.course_created(
+                course_dto.created_at, course_dto.subscription_id, categories
+            )
+        except IntegrityError as e:
+            if COURSE_NAME_INDEX in str(e.orig):
+                raise CourseNameAlreadyExistsError
             raise
 
-    def update(self, course: Course):
-        course_dto = CourseDTO.from_entity(course)
+    def update(
+        self, id: str, changes: dict, categories: Optional[List[str]] = None
+    ) -> Optional[Course]:
+        courses = CourseDTO.__table__
+        columns = list(courses.c) + list(recommendation_columns())
+        stmt = (
+            update(courses)
+            .where(courses.c.id == id)
+            .values(**changes, updated_at=unixtimestamp())
+        )
         try:
-            _course: CourseDTO = (
-                self.session.query(CourseDTO).filter_by(id=course_dto.id).one()
-            )
-            if course_dto.name:
-                _course.name = course_dto.name
-            if course_dto.language:
-                _course.language = course_dto.language
-            if course_dto.price is not None:
-                _course.price = course_dto.price
-            if course_dto.subscription_id is not None:
-                _course.subscription_id = course_dto.subscription_id
-            if course_dto.description:
-                _course.description = course_dto.description
-            _course.updated_at = course_dto.updated_at
-            if course_dto.categories:
-                self.session.query(Category).filter_by(course_id=course_dto.id).delete()
-                _course.categories = course_dto.categories
-            if course_dto.presentation_video:
-                _course.presentation_video = course_dto.presentation_video
-            if course_dto.image:
-                _course.image = course_dto.image
-        except:
+            self.identity_map.expire(id)
+            previous_subscription_id = None
+            if changes.get("subscription_id") is not None:
+                # Locked so concurrent updates move the subscription rollup
+                # from the value each one actually replaced.
+                previous_subscription_id = (
+                    self.session.query(CourseDTO.subscription_id)
+                    .filter_by(id=id)
+                    .with_for_update()
+                    .scalar()
+                )
+            if self.session.get_bind().dialect.full_returning:
+                row = self.session.execute(stmt.returning(*columns)).first()
+            else:
+                self.session.execute(stmt)
+                row = self.session.execute(
+                    select(*columns).where(courses.c.id == id)
+                ).first()
+            if row is None:
+                return None
+            if previous_subscription_id is not None:
+                self.metrics_rollup.subscription_changed(
+                    previous_subscription_id, row.subscription_id
+                )
+            current = [
+                name
+                for name, in self.session.query(Category.name)
+                .filter(
+                    Category.id == CourseCategory.category_id,
+                    CourseCategory.course_id == id,
+                )
+                .order_by(CourseCategory.position, CourseCategory.category_id)
+                .all()
+            ]
+            if categories:
+                wanted = list(dict.fromkeys(categories))
+                self._update_categories(id, current, wanted)
+                # Kept categories stay where they were and new ones follow.
+                course_categories = [name for name in current if name in wanted]
+                course_categories += [name for name in wanted if name not in current]
+            else:
+                course_categories = current
+        except IntegrityError as e:
+            if COURSE_NAME_INDEX in str(e.orig):
+                raise CourseNameAlreadyExistsError
             raise
 
+        return course_from_row(row, course_categories)
+
+    def _add_categories(self, course_id: str, names: List[str]):
+        if not names:
+            return
+        self.session.info[CATEGORIES_CHANGED] = True
+        categories = Category.__table__
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            # Another course may be adding the same new category at once.
+            self.session.execute(
+                (postgresql if dialect == "postgresql" else sqlite)
+                .insert(categories)
+                .on_conflict_do_nothing(index_elements=["name"]),
+                [{"name": name} for name in names],
+            )
+        else:
+            existing = set(
+                self.session.execute(
+                    select(categories.c.name).where(categories.c.name.in_(names))
+                ).scalars()
+            )
+            missing = [{"name": name} for name in names if name not in existing]
+            if missing:
+                self.session.execute(insert(categories), missing)
+        # New links go after the course's current ones, in the given order.
+        course_categories = CourseCategory.__table__
+        first = (
+            select(func.coalesce(func.max(course_categories.c.position) + 1, 0))
+            .where(course_categories.c.course_id == course_id)
+            .scalar_subquery()
+        )
+        offsets = {name: i for i, name in enumerate(names)}
+        self.session.execute(
+            insert(course_categories).from_select(
+                ["course_id", "category_id", "position"],
+                select(
+                    literal(course_id),
+                    categories.c.id,
+                    first + case(offsets, value=categories.c.name),
+                ).where(categories.c.name.in_(names)),
+            )
+        )
+
+    def _update_categories(self, course_id: str, current: List[str], wanted: List[str]):
+        removed = [name for name in current if name not in wanted]
+        added = [name for name in wanted if name not in current]
+        if removed:
+            self.session.info[CATEGORIES_CHANGED] = True
+            course_categories = CourseCategory.__table__
+            self.session.execute(
+                delete(course_categories).where(
+                    course_categories.c.course_id == course_id,
+                    course_categories.c.category_id.in_(
+                        select(Category.id).where(
+                            Category.name.in_(removed)  # type: ignore
+                        )
+                    ),
+                )
+            )
+        self._add_categories(course_id, added)
+        self.metrics_rollup.categories_changed(added, removed)
+
     def delete_by_id(self, id: str):
+        # Deleting only deactivates the course, and the metrics have always
+        # counted inactive courses, so the rollups are left as they are.
         try:
-            course = self.session.query(CourseDTO).filter_by(id=id).first()
+            course = self._get_course(id)
             course.active = False
         except:
             raise
 
     def add_collab(self, course_id: str, user_id: str) -> Optional[CollabReadModel]:
         try:
-            course = self.session.query(CourseDTO).filter_by(id=course_id).first()
+            course = self._get_course(course_id)
             if course.has_active_collab_with_id(user_id):
                 raise UserAlreadyInCourseError
             user = CollabReadModel(id=user_id, course_id=course_id, active=True)
@@ -116,7 +255,7 @@ class CourseRepositoryImpl(CourseRepository):
     ) -> Optional[ContentReadModel]:
         try:
             uuid = shortuuid.uuid()
-            course = self.session.query(CourseDTO).filter_by(id=course_id).first()
+            course = self._get_course(course_id)
             if course.has_content_with_chapter(data.chapter, data.order):
                 raise ChapterAlreadyInCourseError
             content = Content.from_create_model(
@@ -152,11 +291,8 @@ class CourseRepositoryImpl(CourseRepository):
                     or int(data.order) is not int(_cont.order)
                 )
             ):
-                if (
-                    self.session.query(CourseDTO)
-                    .filter_by(id=course_id)
-                    .one()
-                    .has_content_with_chapter(data.chapter, data.order)
+                if self._get_course(course_id).has_content_with_chapter(
+                    data.chapter, data.order
                 ):
                     raise ChapterAlreadyInCourseError
                 _cont.chapter = data.chapter
@@ -166,17 +302,9 @@ class CourseRepositoryImpl(CourseRepository):
 
         return _cont.to_read_model()
 
-    def user_involved(self, course_id: str, user_id: str) -> bool:
-        course = self.session.query(CourseDTO).filter_by(id=course_id).first()
-        if course is None:
-            raise CourseNotFoundError
-        return course.has_active_collab_with_id(user_id) or course.creator_id == user_id
-
     def add_review(self, review: Review):
         try:
-            course: CourseDTO = (
-                self.session.query(CourseDTO).filter_by(id=review.course_id).first()
-            )
+            course = self._get_course(review.course_id)
             if course.has_review_from_user(review.id):
                 raise UserAlreadyReviewedCourseError
             r = ReviewDTO.from_entity(review)
@@ -191,15 +319,26 @@ class CourseCommandUseCaseUnitOfWorkImpl(CourseCommandUseCaseUnitOfWork):
         self,
         session: Session,
         course_repository: CourseRepository,
+        identity_map: Optional[CourseIdentityMap] = None,
     ):
         self.session: Session = session
         self.course_repository: CourseRepository = course_repository
+        # Share the repository's map, so a rollback also clears what it read.
+        if identity_map is None and isinstance(course_repository, CourseRepositoryImpl):
+            identity_map = course_repository.identity_map
+        self.identity_map: CourseIdentityMap = identity_map or CourseIdentityMap(
+            session
+        )
 
     def begin(self):
         self.session.begin()
 
     def commit(self):
         self.session.commit()
+        if self.session.info.pop(CATEGORIES_CHANGED, False):
+            category_list_cache.invalidate()
 
     def rollback(self):
         self.session.rollback()
+        self.session.info.pop(CATEGORIES_CHANGED, None)
+        self.identity_map.clear()
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, case, func, literal, select
+from sqlalchemy.orm.session import Session
+
+from ..monitoring import cache_requests
+from .course_dto import unixtimestamp
+
+CLOSED_BUCKET_CACHE_SIZE = int(os.environ.get("CLOSED_BUCKET_CACHE_SIZE", "50000"))
+# Rows are stamped before their transaction commits, so a bucket is only
+# taken as final once it has been over for longer than any write takes.
+CLOSED_BUCKET_GRACE_MS = 5 * 60 * 1000
+
+
+class ClosedBucketCache:
+    def __init__(self, capacity: int = CLOSED_BUCKET_CACHE_SIZE):
+        self.capacity: int = capacity
+        self._lock = threading.Lock()
+        self._totals: "OrderedDict[Hashable, Tuple[int, ...]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        with self._lock:
+            total = self._totals.get(key)
+            if total is not None:
+                self._totals.move_to_end(key)
+        cache_requests.inc("closed_time_buckets", "miss" if total is None else "hit")
+        return total
+
+    def put(self, key: Hashable, total: Tuple[int, ...]):
+        with self._lock:
+            self._totals[key] = total
+            self._totals.move_to_end(key)
+            while len(self._totals) > self.capacity:
+                self._totals.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+
+
+closed_buckets = ClosedBucketCache()
+
+
+def bucket_index(column, edges: Sequence[int]):
+    # A balanced tree of CASEs: each row is placed with log2(buckets)
+    # comparisons instead of one per bucket.
+    def index(low: int, high: int):
+        if high - low == 1:
+            return literal(low, Integer)
+        middle = (low + high) // 2
+        return case(
+            (column < edges[middle], index(low, middle)), else_=index(middle, high)
+        )
+
+    return index(0, len(edges) - 1)
+
+
+def _aggregate_by_bucket(
+    session: Session, column, edges: Sequence[int], flags: Sequence, conditions
+) -> List[Tuple[int, ...]]:
+    rows = (
+        select(
+            bucket_index(column, edges).label("bucket"),
+            *[
+                case((flag, 1), else_=0).label(f"flag_{i}")
+                for i, flag in enumerate(flags)
+            ],
+        )
+        .where(column >= edges[0], column < edges[-1], *conditions)
+        .subquery()
+    )
+    totals: List[Tuple[int, ...]] = [(0,) * (len(flags) + 1)] * (len(edges) - 1)
+    for bucket, *values in session.execute(
+        select(
+            rows.c.bucket,
+            func.count(),
+            *[func.sum(rows.c[f"flag_{i}"]) for i in range(len(flags))],
+        ).group_by(rows.c.bucket)
+    ):
+        totals[bucket] = tuple(int(value) for value in values)
+    return totals
+
+
+def aggregate_by_bucket(
+    session: Session,
+    series: Optional[Hashable],
+    column,
+    edges: Sequence[int],
+    flags: Sequence = (),
+    conditions: Sequence = (),
+) -> List[Tuple[int, ...]]:
+    # Counts the rows in each bucket, and how many of them match each flag.
+    # Past buckets never change, so each one is aggregated once and then
+    # served from the cache; only the buckets missing from it are queried, in
+    # one statement spanning them. Series whose rows can still move between
+    # buckets pass no series key and are never cached.
+    totals = [
+        closed_buckets.get((series, start, end)) if series is not None else None
+        for start, end in zip(edges, edges[1:])
+    ]
+    missing = [i for i, total in enumerate(totals) if total is None]
+    if not missing:
+        return totals  # type: ignore
+    first, last = missing[0], missing[-1]
+    closed_before = unixtimestamp() - CLOSED_BUCKET_GRACE_MS
+    fetched = _aggregate_by_bucket(
+        session, column, edges[first : last + 2], flags, conditions
+    )
+    for i, total in enumerate(fetched, first):
+        totals[i] = total
+        if series is not None and edges[i + 1] <= closed_before:
+            closed_buckets.put((series, edges[i], edges[i + 1]), total)
+    return totals  # type: ignore
+
+
+def count_by_bucket(
+    session: Session, series: str, column, edges: Sequence[int]
+) -> List[int]:
+    return [total[0] for total in aggregate_by_bucket(session, series, column, edges)]
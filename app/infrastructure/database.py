@@ -1,29 +1,46 @@
 import os
+import threading
+from functools import lru_cache
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-try:
-    DATABASE_URL = os.environ["DATABASE_URL"]
-    if DATABASE_URL.startswith("postgres://"):
-        DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+from .monitoring import instrument_engine, trace_engine, watch_pool
 
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+)
+
+_engine_lock = threading.Lock()
+
+
+def database_url() -> str:
+    url = os.environ["DATABASE_URL"]
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+@lru_cache(maxsize=None)
+def _create_engine() -> Engine:
     engine = create_engine(
-        DATABASE_URL,
+        database_url(),
     )
-    SessionLocal = sessionmaker(
-        bind=engine,
-        autocommit=False,
-        autoflush=False,
-    )
-
-except KeyError as e:
-    pass
+    instrument_engine(engine)
+    trace_engine(engine)
+    watch_pool(engine.pool)
+    SessionLocal.configure(bind=engine)
+    return engine
 
 
-Base = declarative_base()
+def get_engine() -> Engine:
+    # lru_cache alone may run the factory twice on concurrent first calls,
+    # which would instrument two engines.
+    with _engine_lock:
+        return _create_engine()
 
 
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+Base = declarative_base()
@@ -0,0 +1,54 @@
+import ast
+import os
+import time
+
+import requests
+
+from .monitoring import CLIENT, inject, outbound_request_duration, tracer
+
+try:
+    m: str = os.environ["MICROSERVICES"]
+    microservices: dict = ast.literal_eval(m)
+except KeyError as e:
+    microservices = {}  # type: ignore
+
+# Shared across requests so connections to the users, payments and
+# subscriptions services are pooled, and so transport adapters (e.g. local
+# stubs) can be mounted per service URL.
+session = requests.Session()
+
+
+def service_name(url: str) -> str:
+    for name, base_url in microservices.items():
+        if base_url and url.startswith(base_url):
+            return name
+    return "other"
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    service = service_name(url)
+    started = time.perf_counter()
+    status = "error"
+    try:
+        with tracer.span(
+            f"{method} {service}",
+            CLIENT,
+            {"http.method": method, "http.url": url, "peer.service": service},
+        ) as span:
+            kwargs["headers"] = inject(kwargs.get("headers"))
+            response = session.request(method, url, **kwargs)
+            status = str(response.status_code)
+            span.set_attribute("http.status_code", response.status_code)
+        return response
+    finally:
+        outbound_request_duration.observe(
+            time.perf_counter() - started, service, method, status
+        )
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    return request("PATCH", url, **kwargs)
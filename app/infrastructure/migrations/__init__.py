@@ -0,0 +1,8 @@
+from .migration import (
+    Migration,
+    SchemaVersionMismatchError,
+    current_version,
+    migrate,
+    verify_schema_version,
+)
+from .versions import MIGRATIONS, SCHEMA_VERSION
@@ -0,0 +1,122 @@
+import logging
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    select,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String, nullable=False),
+    Column("applied_at", BigInteger, nullable=False),
+)
+
+# Arbitrary key shared by every migrate run so concurrent runs on PostgreSQL
+# serialize instead of racing on the same DDL.
+MIGRATION_LOCK_KEY = 7401296
+
+
+class SchemaVersionMismatchError(Exception):
+    message = "The database schema is older than the one this code expects."
+
+    def __init__(self, current: int, expected: int):
+        super().__init__(current, expected)
+        self.current = current
+        self.expected = expected
+
+    def __str__(self):
+        return (
+            f"{SchemaVersionMismatchError.message} (database: {self.current}, "
+            f"expected: {self.expected}). Run `python manage.py migrate`."
+        )
+
+
+class Migration:
+    def __init__(
+        self,
+        version: int,
+        description: str,
+        upgrade: Callable[[Connection], None],
+        transactional: bool = True,
+    ):
+        self.version: int = version
+        self.description: str = description
+        self.upgrade: Callable[[Connection], None] = upgrade
+        self.transactional: bool = transactional
+
+
+def current_version(engine: Engine) -> int:
+    with engine.connect() as connection:
+        if not engine.dialect.has_table(connection, schema_version.name):
+            return 0
+        version = connection.execute(
+            select(func.max(schema_version.c.version))
+        ).scalar()
+    return version or 0
+
+
+def _record(connection: Connection, migration: Migration):
+    connection.execute(
+        schema_version.insert().values(
+            version=migration.version,
+            description=migration.description,
+            applied_at=int(datetime.now().timestamp() * 1000),
+        )
+    )
+
+
+def _apply(engine: Engine, migration: Migration):
+    logger.info("Applying migration %s: %s", migration.version, migration.description)
+    if migration.transactional:
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            _record(connection, migration)
+        return
+
+    # Statements such as CREATE INDEX CONCURRENTLY cannot run inside a
+    # transaction block, so they get an autocommit connection.
+    with engine.connect() as connection:
+        migration.upgrade(connection.execution_options(isolation_level="AUTOCOMMIT"))
+    with engine.begin() as connection:
+        _record(connection, migration)
+
+
+def migrate(engine: Engine, migrations: List[Migration]) -> int:
+    with engine.connect() as lock:
+        if engine.dialect.name == "postgresql":
+            lock.execute(func.pg_advisory_lock(MIGRATION_LOCK_KEY).select())
+        try:
+            # Under the lock too: concurrent first runs would race on it.
+            metadata.create_all(bind=engine)
+            version = current_version(engine)
+            for migration in sorted(migrations, key=lambda m: m.version):
+                if migration.version > version:
+                    _apply(engine, migration)
+                    version = migration.version
+        finally:
+            if engine.dialect.name == "postgresql":
+                lock.execute(func.pg_advisory_unlock(MIGRATION_LOCK_KEY).select())
+
+    return version
+
+
+def verify_schema_version(engine: Engine, expected: int):
+    version = current_version(engine)
+    if version < expected:
+        raise SchemaVersionMismatchError(current=version, expected=expected)
+    return version
@@ -0,0 +1,302 @@
+from typing import List, Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+from app.infrastructure.course.course_dto import (
+    COURSE_CATEGORIES_CATEGORY_INDEX,
+    COURSE_NAME_INDEX,
+)
+from app.infrastructure.course.course_metrics_rollup import (
+    ROLLUP_TABLES,
+    rebuild_course_metrics,
+)
+from app.infrastructure.database import Base
+
+from .migration import Migration
+
+legacy_metadata = MetaData()
+
+# The schema as the service created it before it had migrations. Frozen here,
+# so later changes to the models cannot change what version 1 builds.
+legacy_courses = Table(
+    "courses",
+    legacy_metadata,
+    Column("id", String, primary_key=True, autoincrement=False),
+    Column("creator_id", String),
+    Column("name", String, nullable=False),
+    Column("price", Float, nullable=False),
+    Column("active", Boolean, nullable=False),
+    Column("subscription_id", Integer, nullable=False),
+    Column("language", String, nullable=False),
+    Column("country", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("presentation_video", String, nullable=False),
+    Column("image", String, nullable=False),
+    Column("created_at", BigInteger, index=True, nullable=False),
+    Column("updated_at", BigInteger, index=True, nullable=False),
+)
+# One row per course and category name; replaced by the categories dimension
+# in migration 5.
+legacy_categories = Table(
+    "categories",
+    legacy_metadata,
+    Column("id", String, primary_key=True, autoincrement=False),
+    Column("course_id", String, ForeignKey(legacy_courses.c.id)),
+    Column("category", String, nullable=False),
+)
+legacy_collabs = Table(
+    "collabs",
+    legacy_metadata,
+    Column("id", String, primary_key=True, autoincrement=False),
+    Column("user_id", String, nullable=False),
+    Column("course_id", String, ForeignKey(legacy_courses.c.id)),
+    Column("active", Boolean, nullable=False),
+)
+legacy_content = Table(
+    "content",
+    legacy_metadata,
+    Column("id", String, primary_key=True, autoincrement=False),
+    Column("title", String, nullable=False),
+    Column("course_id", String, ForeignKey(legacy_courses.c.id)),
+    Column("chapter", String, nullable=False),
+    Column("order", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("video", String, nullable=False),
+    Column("image", String, nullable=False),
+    Column("active", Boolean, nullable=False),
+)
+legacy_reviews = Table(
+    "reviews",
+    legacy_metadata,
+    Column("id", String, primary_key=True, autoincrement=False),
+    Column(
+        "course_id",
+        String,
+        ForeignKey(legacy_courses.c.id),
+        primary_key=True,
+        autoincrement=False,
+    ),
+    Column("recommended", Boolean, nullable=False),
+    Column("review", Text, nullable=False),
+    Column("date", BigInteger, index=True, nullable=False),
+)
+legacy_course_categories = Table(
+    "legacy_course_categories",
+    legacy_metadata,
+    Column("course_id", String),
+    Column("category", String),
+)
+
+normalized_metadata = MetaData()
+
+# The categories dimension as migration 5 builds it, frozen like the legacy
+# schema above.
+normalized_categories_table = Table(
+    "categories",
+    normalized_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False, unique=True),
+)
+normalized_course_categories = Table(
+    "course_categories",
+    normalized_metadata,
+    Column(
+        "course_id",
+        String,
+        ForeignKey(legacy_courses.c.id),
+        primary_key=True,
+        autoincrement=False,
+    ),
+    Column(
+        "category_id",
+        Integer,
+        ForeignKey(normalized_categories_table.c.id),
+        primary_key=True,
+        autoincrement=False,
+    ),
+    Index(COURSE_CATEGORIES_CATEGORY_INDEX, "category_id", "course_id"),
+)
+
+
+class DuplicateCourseNamesError(Exception):
+    message = "Some course names only differ in case; rename them and migrate again."
+
+    def __init__(self, names: List[str]):
+        super().__init__(names)
+        self.names = names
+
+    def __str__(self):
+        return f"{DuplicateCourseNamesError.message} Names: {', '.join(self.names)}"
+
+
+class InvalidIndexError(Exception):
+    message = "Building the index failed and left it invalid; it was dropped."
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.name = name
+
+    def __str__(self):
+        return f"{InvalidIndexError.message} Index: {self.name}"
+
+
+def _index_is_valid(connection: Connection, name: str) -> Optional[bool]:
+    return connection.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ),
+        {"name": name},
+    ).scalar()
+
+
+def create_index(
+    connection: Connection,
+    name: str,
+    table: str,
+    expression: str,
+    unique: bool = False,
+):
+    postgresql = connection.engine.dialect.name == "postgresql"
+    # A CREATE INDEX CONCURRENTLY that fails leaves an INVALID index behind,
+    # which IF NOT EXISTS would then take as built.
+    if postgresql and _index_is_valid(connection, name) is False:
+        connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY {name}")
+    try:
+        connection.exec_driver_sql(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+            f"{'CONCURRENTLY ' if postgresql else ''}IF NOT EXISTS {name} "
+            f"ON {table} ({expression})"
+        )
+    except:
+        # A concurrent build that fails, e.g. on a duplicate key, still
+        # leaves the invalid index behind.
+        if postgresql and _index_is_valid(connection, name) is False:
+            connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY {name}")
+        raise
+    if postgresql and not _index_is_valid(connection, name):
+        connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        raise InvalidIndexError(name)
+
+
+def initial_schema(connection: Connection):
+    legacy_metadata.create_all(
+        bind=connection,
+        tables=[
+            legacy_courses,
+            legacy_categories,
+            legacy_collabs,
+            legacy_content,
+            legacy_reviews,
+        ],
+    )
+
+
+def unique_course_name(connection: Connection):
+    # Names used to be unique only as typed, so existing rows may clash once
+    # case is ignored. Stop before building the index rather than have it
+    # fail halfway.
+    duplicates = (
+        connection.exec_driver_sql(
+            "SELECT lower(name) FROM courses GROUP BY lower(name) "
+            "HAVING count(*) > 1 ORDER BY lower(name)"
+        )
+        .scalars()
+        .all()
+    )
+    if duplicates:
+        raise DuplicateCourseNamesError(duplicates)
+    create_index(connection, COURSE_NAME_INDEX, "courses", "lower(name)", unique=True)
+
+
+def course_foreign_key_indexes(connection: Connection):
+    for table in ("categories", "collabs", "content", "reviews"):
+        create_index(connection, f"ix_{table}_course_id", table, "course_id")
+
+
+def course_price_index(connection: Connection):
+    # Price ranges are filtered like the created_at and updated_at ranges,
+    # which have been indexed from the start.
+    create_index(connection, "ix_courses_price", "courses", "price")
+
+
+def course_metrics_rollups(connection: Connection):
+    # Filled by normalized_categories, which rebuilds every rollup.
+    Base.metadata.create_all(bind=connection, tables=ROLLUP_TABLES)
+
+
+def normalized_categories(connection: Connection):
+    connection.exec_driver_sql(
+        "CREATE TABLE legacy_course_categories AS "
+        "SELECT DISTINCT course_id, category FROM categories "
+        "WHERE course_id IS NOT NULL"
+    )
+    connection.exec_driver_sql("DROP TABLE categories")
+    normalized_metadata.create_all(bind=connection)
+    legacy = legacy_course_categories
+    categories = normalized_categories_table
+    connection.execute(
+        insert(categories).from_select(
+            ["name"],
+            select(legacy.c.category)
+            .group_by(legacy.c.category)
+            .order_by(legacy.c.category),
+        )
+    )
+    connection.execute(
+        insert(normalized_course_categories).from_select(
+            ["course_id", "category_id"],
+            select(legacy.c.course_id, categories.c.id).join_from(
+                legacy, categories, legacy.c.category == categories.c.name
+            ),
+        )
+    )
+    connection.exec_driver_sql("DROP TABLE legacy_course_categories")
+    rebuild_course_metrics(connection)
+
+
+def course_category_position(connection: Connection):
+    # Links from before this keep 0 and are read in category id order.
+    connection.exec_driver_sql(
+        "ALTER TABLE course_categories "
+        "ADD COLUMN position INTEGER NOT NULL DEFAULT 0"
+    )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "initial schema", initial_schema),
+    Migration(
+        2,
+        "unique case-insensitive course name",
+        unique_course_name,
+        transactional=False,
+    ),
+    Migration(
+        3,
+        "course_id indexes on child tables",
+        course_foreign_key_indexes,
+        transactional=False,
+    ),
+    Migration(4, "course metrics rollups", course_metrics_rollups),
+    Migration(5, "normalized categories", normalized_categories),
+    Migration(6, "course price index", course_price_index, transactional=False),
+    Migration(7, "course category position", course_category_position),
+]
+
+SCHEMA_VERSION: int = MIGRATIONS[-1].version
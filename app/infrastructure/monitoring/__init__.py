@@ -0,0 +1,48 @@
+from .log_pipeline import AsyncStreamHandler, JsonFormatter, RateLimitFilter
+from .metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    cache_requests,
+    http_request_duration,
+    http_requests_in_flight,
+    log_records_dropped,
+    outbound_request_duration,
+    registry,
+    watch_pool,
+)
+from .profiling import (
+    RequestProfiles,
+    SamplingTrigger,
+    StackSampler,
+    render_collapsed,
+    request_profiles,
+    sampling_trigger,
+)
+from .query_stats import (
+    QueryBudgetExceededError,
+    QueryStats,
+    current_query_stats,
+    instrument_engine,
+    query_budget,
+    track_queries,
+)
+from .slow_queries import SlowQuery, SlowQueryLog, slow_query_log
+from .tracing import (
+    CLIENT,
+    INTERNAL,
+    SERVER,
+    InMemorySpanExporter,
+    LoggingSpanExporter,
+    Span,
+    SpanContext,
+    Tracer,
+    current_span,
+    format_traceparent,
+    inject,
+    parse_traceparent,
+    trace_engine,
+    traced,
+    tracer,
+)
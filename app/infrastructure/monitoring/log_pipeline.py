@@ -0,0 +1,166 @@
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from .metrics import log_records_dropped
+from .tracing import current_span
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated", "suppressed")
+
+    def __init__(self, tokens: float):
+        self.tokens: float = tokens
+        self.updated: float = time.monotonic()
+        self.suppressed: int = 0
+
+
+class RateLimitFilter(logging.Filter):
+    # Caps each logger at `rate` records per second per level with bursts of
+    # `burst`, so a chatty INFO stream cannot starve the same logger's
+    # warnings, and keeps only a `sample` fraction of a logger's records below
+    # WARNING. Loggers in `exempt` are never rate limited, and errors are
+    # never dropped.
+    def __init__(
+        self,
+        rate: float = 50,
+        burst: float = 200,
+        sample: Optional[Dict[str, float]] = None,
+        exempt: Optional[Iterable[str]] = None,
+    ):
+        super().__init__()
+        self.rate: float = rate
+        self.burst: float = burst
+        self.sample: Dict[str, float] = sample or {}
+        self.exempt: FrozenSet[str] = frozenset(exempt or ())
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, int], _TokenBucket] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        if record.levelno < logging.WARNING and record.name in self.sample:
+            if random.random() >= self.sample[record.name]:
+                log_records_dropped.inc("sampled")
+                return False
+        if self.rate <= 0 or record.name in self.exempt:
+            return True
+        key = (record.name, record.levelno)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _TokenBucket(self.burst)
+            now = time.monotonic()
+            bucket.tokens = min(
+                self.burst, bucket.tokens + (now - bucket.updated) * self.rate
+            )
+            bucket.updated = now
+            if bucket.tokens < 1:
+                bucket.suppressed += 1
+                log_records_dropped.inc("rate_limited")
+                return False
+            bucket.tokens -= 1
+            suppressed, bucket.suppressed = bucket.suppressed, 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class AsyncStreamHandler(QueueHandler):
+    # The request path only puts records on a bounded queue; formatting and
+    # the blocking stream write happen on the listener thread. When the queue
+    # is full, records are dropped instead of stalling the event loop.
+    def __init__(
+        self,
+        stream=None,
+        capacity: int = 10000,
+        rate: float = 0,
+        burst: float = 200,
+        sample: Optional[Dict[str, float]] = None,
+        exempt: Optional[Iterable[str]] = None,
+    ):
+        super().__init__(queue.Queue(capacity))
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        if rate > 0 or sample:
+            self.addFilter(RateLimitFilter(rate, burst, sample, exempt))
+        # logging.shutdown() closes the handler at exit, which stops the
+        # listener after it has written everything still queued.
+        self.listener: Optional[QueueListener] = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Freeze everything that can change or depends on the calling thread,
+        # and leave the formatting itself to the listener thread. The record
+        # is updated in place: copying it costs more than the rest of the
+        # request-side work.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        span = current_span()
+        if span is not None and not hasattr(record, "trace_id"):
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc("queue_full")
+
+    def flush(self):
+        # Waits for the records queued so far to be written.
+        if self.listener is not None:
+            self.queue.join()
+        self.target.flush()
+
+    def close(self):
+        if self.listener is not None:
+            # The listener's stop sentinel needs a free slot in the queue.
+            self.queue.join()
+            self.listener.stop()
+            self.listener = None
+        self.target.close()
+        super().close()
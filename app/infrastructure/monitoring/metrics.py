@@ -0,0 +1,245 @@
+import threading
+from bisect import bisect_left
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from sqlalchemy.pool import Pool
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labelvalues: Sequence[str]) -> Tuple[str, ...]:
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames)}")
+        return tuple(str(v) for v in labelvalues)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(self._key(labelvalues), 0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+
+    def set(self, value: float, *labelvalues: str):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(self._key(labelvalues), 0)
+
+    def samples(self) -> Iterable[str]:
+        values = self._function() if self._function else self._values
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last one is +Inf) and sum.
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        key = self._key(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, *labelvalues: str) -> int:
+        return sum(self._counts.get(self._key(labelvalues), ()))
+
+    def samples(self) -> Iterable[str]:
+        for key in sorted(self._counts):
+            counts = self._counts[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _labels(self.labelnames, key, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_number(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template and status.",
+        ("method", "route", "status"),
+    )
+)
+outbound_request_duration = registry.register(
+    Histogram(
+        "outbound_request_duration_seconds",
+        "Latency of calls to other services.",
+        ("service", "method", "status"),
+    )
+)
+cache_requests = registry.register(
+    Counter(
+        "cache_requests_total",
+        "Cache lookups by cache and result (hit or miss).",
+        ("cache", "result"),
+    )
+)
+log_records_dropped = registry.register(
+    Counter(
+        "log_records_dropped_total",
+        "Log records dropped before being written, by reason.",
+        ("reason",),
+    )
+)
+
+_pools: List[Pool] = []
+POOL_STATES = (
+    ("size", "size"),
+    ("checked_out", "checkedout"),
+    ("checked_in", "checkedin"),
+    ("overflow", "overflow"),
+)
+
+
+def _pool_connections() -> Dict[Tuple[str, ...], float]:
+    values: Dict[Tuple[str, ...], float] = {}
+    for pool in _pools:
+        for state, method in POOL_STATES:
+            read = getattr(pool, method, None)
+            # Only QueuePool reports all of these; SQLite's pools lack some.
+            if callable(read):
+                values[(state,)] = values.get((state,), 0) + read()
+    return values
+
+
+db_pool_connections = registry.register(
+    Gauge(
+        "db_pool_connections",
+        "Database connection pool usage by state.",
+        ("state",),
+        function=_pool_connections,
+    )
+)
+
+
+def watch_pool(pool: Pool):
+    if pool not in _pools:
+        _pools.append(pool)
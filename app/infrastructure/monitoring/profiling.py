@@ -0,0 +1,192 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Set
+
+import shortuuid
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "courses-profiles")
+)
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "10"))
+RECENT_PROFILES = int(os.environ.get("PROFILE_RECENT_PROFILES", "20"))
+PROFILE_PRINT_LIMIT = 60
+
+
+class RequestProfiles:
+    def __init__(self, capacity: int = RECENT_PROFILES):
+        self.capacity: int = capacity
+        self._lock = threading.Lock()
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+
+    def add(self, id: str, label: str, profile: cProfile.Profile):
+        stream = io.StringIO()
+        stream.write(label + "\n")
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(PROFILE_PRINT_LIMIT)
+        with self._lock:
+            self._profiles[id] = stream.getvalue()
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+
+    def get(self, id: str) -> Optional[str]:
+        with self._lock:
+            return self._profiles.get(id)
+
+
+request_profiles = RequestProfiles()
+
+
+def frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapsed_stack(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def render_collapsed(counts: Dict[str, int]) -> str:
+    return "".join(
+        f"{stack} {count}\n"
+        for stack, count in sorted(counts.items(), key=lambda item: -item[1])
+    )
+
+
+def parse_collapsed(text: str) -> Dict[str, int]:
+    counts: Dict[str, int] = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack:
+            counts[stack] += int(count)
+    return counts
+
+
+class StackSampler:
+    def __init__(self, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.interval: float = interval_ms / 1000
+
+    def sample(self, counts: Dict[str, int], ignore: Set[int]):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id not in ignore:
+                counts[collapsed_stack(frame)] += 1
+
+    def run(self, seconds: float) -> Dict[str, int]:
+        # Walking every thread's stack a hundred times a second costs far
+        # less than a deterministic profiler, so this is safe under load.
+        counts: Dict[str, int] = Counter()
+        ignore = {threading.get_ident()}
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.sample(counts, ignore)
+            time.sleep(self.interval)
+        return counts
+
+
+class SamplingTrigger:
+    # Workers are separate processes, so a sampling run is requested by
+    # writing a trigger file that every worker polls; each one writes its
+    # stacks next to it and the requesting worker merges them.
+    def __init__(
+        self,
+        directory: str = PROFILE_DIR,
+        sampler: Optional[StackSampler] = None,
+        poll_interval: float = 1.0,
+    ):
+        self.directory: str = directory
+        self.sampler: StackSampler = sampler or StackSampler()
+        self.poll_interval: float = poll_interval
+        self._thread: Optional[threading.Thread] = None
+        self._last_id: Optional[str] = None
+
+    @property
+    def trigger_path(self) -> str:
+        return os.path.join(self.directory, "trigger.json")
+
+    def result_path(self, id: str, pid: int) -> str:
+        return os.path.join(self.directory, f"{id}.{pid}.collapsed")
+
+    def _write(self, path: str, content: str):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temporary, path)
+
+    def request(self, seconds: float) -> str:
+        id = shortuuid.uuid()
+        self._write(
+            self.trigger_path,
+            json.dumps({"id": id, "seconds": seconds, "requested_at": time.time()}),
+        )
+        return id
+
+    def poll(self) -> bool:
+        try:
+            with open(self.trigger_path, encoding="utf-8") as f:
+                trigger = json.load(f)
+        except (OSError, ValueError):
+            return False
+        # Triggers left over from earlier runs must not start a new one.
+        expired = trigger["requested_at"] + trigger["seconds"] < time.time()
+        if trigger["id"] == self._last_id or expired:
+            return False
+        self._last_id = trigger["id"]
+        counts = self.sampler.run(trigger["seconds"])
+        self._write(
+            self.result_path(trigger["id"], os.getpid()), render_collapsed(counts)
+        )
+        return True
+
+    def _watch(self):
+        while True:
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Stack sampling failed")
+            time.sleep(self.poll_interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._watch, name="stack-sampling-trigger", daemon=True
+            )
+            self._thread.start()
+
+    def collect(self, id: str) -> Dict[str, int]:
+        counts: Dict[str, int] = Counter()
+        workers = 0
+        for name in os.listdir(self.directory):
+            pid = name[len(id) + 1 : -len(".collapsed")]
+            if (
+                name.startswith(id + ".")
+                and name.endswith(".collapsed")
+                and pid.isdigit()
+            ):
+                path = os.path.join(self.directory, name)
+                with open(path, encoding="utf-8") as f:
+                    for stack, count in parse_collapsed(f.read()).items():
+                        counts[stack] += count
+                os.remove(path)
+                workers += 1
+        logger.info("Collected stack samples from %d workers", workers)
+        self._write(
+            os.path.join(self.directory, id + ".collapsed"), render_collapsed(counts)
+        )
+        return counts
+
+
+sampling_trigger = SamplingTrigger()
@@ -0,0 +1,88 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .slow_queries import slow_query_log
+
+
+class QueryStats:
+    __slots__ = ("statements", "duration")
+
+    def __init__(self):
+        self.statements: int = 0
+        self.duration: float = 0.0
+
+
+class QueryBudgetExceededError(AssertionError):
+    message = "Too many SQL statements were issued."
+
+    def __init__(self, statements: int, budget: int):
+        super().__init__(statements, budget)
+        self.statements = statements
+        self.budget = budget
+
+    def __str__(self):
+        return (
+            f"{QueryBudgetExceededError.message} "
+            f"({self.statements} issued, budget {self.budget})"
+        )
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@contextmanager
+def query_budget(statements: int) -> Iterator[QueryStats]:
+    with track_queries() as stats:
+        yield stats
+    if stats.statements > statements:
+        raise QueryBudgetExceededError(stats.statements, statements)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _record(conn) -> float:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.duration += elapsed
+    return elapsed
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = _record(conn)
+    slow_query_log.observe(conn.engine, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        _record(conn)
+
+
+def instrument_engine(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,196 @@
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import FrameType
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+EXPLAIN_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0"))
+WORST_QUERIES = int(os.environ.get("SLOW_QUERY_WORST_QUERIES", "20"))
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    # Types only: values may hold personal data and would make every entry unique.
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return (
+            "{"
+            + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+            + "}"
+        )
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def calling_use_case() -> str:
+    # currentframe() is None on interpreters without frame support.
+    frame: Optional[FrameType] = inspect.currentframe()
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        name = getattr(frame.f_code, "co_qualname", None)
+        if name is None:
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            if owner is not None:
+                name = f"{type(owner).__name__}.{name}"
+        if module.startswith("app.usecase."):
+            return name
+        if fallback is None and module.startswith(("app.", "routes.")):
+            if not module.startswith("app.infrastructure.monitoring"):
+                fallback = name
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> Optional[str]:
+    dialect = engine.dialect.name
+    if not statement.lstrip().upper().startswith("SELECT"):
+        # EXPLAIN ANALYZE executes the statement; never repeat a write.
+        return None
+    if dialect == "postgresql":
+        prefix, column = "EXPLAIN (ANALYZE, BUFFERS) ", 0
+    elif dialect == "sqlite":
+        prefix, column = "EXPLAIN QUERY PLAN ", 3
+    else:
+        return None
+    # A pooled connection of its own, so a failing EXPLAIN cannot abort the
+    # request's transaction; returning it to the pool rolls everything back.
+    with engine.connect() as connection:
+        raw = connection.connection.cursor()
+        try:
+            raw.execute(prefix + statement, parameters)
+            return "\n".join(str(row[column]) for row in raw.fetchall())
+        finally:
+            raw.close()
+
+
+class SlowQuery:
+    def __init__(
+        self,
+        statement: str,
+        parameters: str,
+        duration: float,
+        caller: str,
+        plan: Optional[str],
+    ):
+        self.statement: str = statement
+        self.parameters: str = parameters
+        self.duration: float = duration
+        self.caller: str = caller
+        self.plan: Optional[str] = plan
+        self.recorded_at: int = int(time.time() * 1000)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "parameters": self.parameters,
+            "duration_ms": round(self.duration * 1000, 3),
+            "caller": self.caller,
+            "plan": self.plan,
+            "recorded_at": self.recorded_at,
+        }
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        explain_sample_rate: float = EXPLAIN_SAMPLE_RATE,
+        capacity: int = WORST_QUERIES,
+    ):
+        self.threshold: float = threshold_ms / 1000
+        self.explain_sample_rate: float = explain_sample_rate
+        self.capacity: int = capacity
+        self._lock = threading.Lock()
+        # Worst sample per statement; slow queries are rare, so evicting the
+        # fastest by a linear scan is cheap enough.
+        self._worst: Dict[str, SlowQuery] = {}
+        # EXPLAIN ANALYZE runs the statement again, so plans are captured on
+        # one background thread instead of the request that was already slow.
+        self._explainer: Optional[ThreadPoolExecutor] = None
+
+    def observe(
+        self,
+        engine: Optional[Engine],
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration: float,
+    ):
+        if self.threshold <= 0 or duration < self.threshold:
+            return
+        query = SlowQuery(
+            statement=statement,
+            parameters=parameter_shape(parameters, executemany),
+            duration=duration,
+            caller=calling_use_case(),
+            plan=None,
+        )
+        logger.warning(
+            "Slow query %.1f ms in %s params=%s: %s",
+            duration * 1000,
+            query.caller,
+            query.parameters,
+            " ".join(statement.split()),
+        )
+        self._keep(query)
+        if (
+            engine is not None
+            and self.explain_sample_rate
+            and random.random() < self.explain_sample_rate
+        ):
+            with self._lock:
+                if self._explainer is None:
+                    self._explainer = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="slow-query-explain"
+                    )
+                explainer = self._explainer
+            explainer.submit(self._explain, engine, query, parameters)
+
+    def _explain(self, engine: Engine, query: SlowQuery, parameters: Any):
+        try:
+            query.plan = explain(engine, query.statement, parameters)
+        except:
+            logger.exception("Could not explain slow query in %s", query.caller)
+            return
+        if query.plan:
+            logger.info("Plan of slow query in %s:\n%s", query.caller, query.plan)
+
+    def flush(self):
+        # Waits for the plans requested so far.
+        with self._lock:
+            explainer = self._explainer
+        if explainer is not None:
+            explainer.submit(lambda: None).result()
+
+    def _keep(self, query: SlowQuery):
+        with self._lock:
+            current = self._worst.get(query.statement)
+            if current is not None and current.duration >= query.duration:
+                return
+            self._worst[query.statement] = query
+            if len(self._worst) > self.capacity:
+                fastest = min(self._worst.values(), key=lambda q: q.duration)
+                del self._worst[fastest.statement]
+
+    def worst(self) -> List[SlowQuery]:
+        with self._lock:
+            return sorted(self._worst.values(), key=lambda q: q.duration, reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._worst.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,284 @@
+import contextvars
+import functools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TypeVar, Union, cast
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "1"))
+
+SERVER = "server"
+CLIENT = "client"
+INTERNAL = "internal"
+
+TRACEPARENT = re.compile(
+    r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$"
+)
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+
+T = TypeVar("T")
+
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id: str = trace_id
+        self.span_id: str = span_id
+        self.sampled: bool = sampled
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "sampled",
+        "attributes",
+        "start",
+        "end",
+        "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        trace_id: str,
+        span_id: str,
+        parent_id: Optional[str],
+        sampled: bool,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name: str = name
+        self.kind: str = kind
+        self.trace_id: str = trace_id
+        self.span_id: str = span_id
+        self.parent_id: Optional[str] = parent_id
+        self.sampled: bool = sampled
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.start: float = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class InMemorySpanExporter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class LoggingSpanExporter:
+    def export(self, span: Span):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "trace_id=%s span_id=%s parent_id=%s kind=%s name=%r "
+                "duration_ms=%.1f error=%s",
+                span.trace_id,
+                span.span_id,
+                span.parent_id,
+                span.kind,
+                span.name,
+                span.duration * 1000,
+                span.error,
+            )
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _random_id(bits: int) -> str:
+    id = 0
+    while id == 0:
+        id = random.getrandbits(bits)
+    return f"{id:0{bits // 4}x}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    if not header:
+        return None
+    match = TRACEPARENT.match(header.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags, rest = match.groups()
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+def format_traceparent(span: Union[Span, SpanContext]) -> str:
+    flags = "01" if span.sampled else "00"
+    return f"00-{span.trace_id}-{span.span_id}-{flags}"
+
+
+def inject(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    headers = dict(headers or {})
+    span = current_span()
+    if span is not None:
+        headers["traceparent"] = format_traceparent(span)
+    return headers
+
+
+class Tracer:
+    def __init__(self, exporter, sample_rate: float = TRACE_SAMPLE_RATE):
+        self.exporter = exporter
+        self.sample_rate: float = sample_rate
+
+    def start(
+        self,
+        name: str,
+        kind: str = INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[Union[Span, SpanContext]] = None,
+    ) -> Span:
+        if parent is None:
+            parent = current_span()
+        if parent is None:
+            trace_id = _random_id(128)
+            parent_id = None
+            sampled = random.random() < self.sample_rate
+        else:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+            sampled = parent.sampled
+        return Span(
+            name, kind, trace_id, _random_id(64), parent_id, sampled, attributes
+        )
+
+    def finish(self, span: Span, error: Optional[BaseException] = None):
+        span.end = time.perf_counter()
+        if error is not None:
+            span.error = type(error).__name__
+        if span.sampled:
+            self.exporter.export(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: str = INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[Union[Span, SpanContext]] = None,
+    ) -> Iterator[Span]:
+        span = self.start(name, kind, attributes, parent)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span, error)
+
+
+tracer = Tracer(LoggingSpanExporter())
+
+
+class _Traced:
+    def __init__(self, target: Any):
+        self._target = target
+        self._prefix: str = type(target).__name__
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        span_name = f"{self._prefix}.{name}"
+
+        @functools.wraps(attribute)
+        def call_in_span(*args, **kwargs):
+            with tracer.span(span_name):
+                return attribute(*args, **kwargs)
+
+        return call_in_span
+
+
+def traced(target: T) -> T:
+    return cast(T, _Traced(target))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Statements outside a traced request (migrations, scripts) would each
+    # start a trace of their own, so they are left out.
+    span = None
+    if current_span() is not None:
+        span = tracer.start(
+            statement.split(None, 1)[0].upper() if statement else "SQL",
+            CLIENT,
+            {"db.system": conn.dialect.name, "db.statement": statement},
+        )
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = conn.info["trace_spans"].pop()
+    if span is not None:
+        tracer.finish(span)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("trace_spans"):
+        span = conn.info["trace_spans"].pop()
+        if span is not None:
+            tracer.finish(span, exception_context.original_exception)
+
+
+def trace_engine(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
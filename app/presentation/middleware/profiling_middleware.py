@@ -0,0 +1,59 @@
+import cProfile
+import threading
+from typing import Callable, Optional
+
+import shortuuid
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.monitoring import request_profiles
+
+# cProfile follows the event loop thread rather than the request, so the
+# profile says so next to its numbers.
+PROFILE_NOTE = (
+    "Profiled on the event loop thread: includes other requests' coroutines "
+    "that ran while this one awaited, and misses work run in the threadpool."
+)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, authorize: Callable[[Optional[str]], bool]):
+        self.app = app
+        self.authorize = authorize
+        # Only one profiler can be attached to the event loop thread at a time.
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("x-profile") or not self.authorize(
+            headers.get("x-admin-token")
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        id = shortuuid.uuid()
+
+        async def send_with_profile_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", id)
+            await send(message)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profile.disable()
+            request_profiles.add(
+                id, f"{scope['method']} {scope['path']}\n{PROFILE_NOTE}", profile
+            )
+        finally:
+            self._lock.release()
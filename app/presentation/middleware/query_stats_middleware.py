@@ -0,0 +1,62 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.monitoring import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.statements} queries", '
+        f"app;dur={elapsed * 1000:.1f}"
+    )
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        server_timing(stats, time.perf_counter() - started),
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # The fields go in `extra` so the JSON formatter writes them
+                # as keys of their own.
+                logger.info(
+                    "%s %s %s",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                        "db_statements": stats.statements,
+                        "db_ms": round(stats.duration * 1000, 1),
+                    },
+                )
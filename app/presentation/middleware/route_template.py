@@ -0,0 +1,25 @@
+from typing import Dict
+
+from fastapi.routing import APIRoute
+from starlette.routing import Route, WebSocketRoute
+from starlette.types import Scope
+
+UNMATCHED_ROUTE = "unmatched"
+
+_templates: Dict[object, str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    # The router stores the matched endpoint in the scope; using its path
+    # template rather than the raw path keeps metric labels and span names
+    # bounded.
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    if endpoint not in _templates:
+        routes = getattr(scope.get("router"), "routes", [])
+        for route in routes:
+            # Mounts and hosts have no single endpoint.
+            if isinstance(route, (APIRoute, Route, WebSocketRoute)):
+                _templates.setdefault(route.endpoint, route.path)
+    return _templates.get(endpoint, UNMATCHED_ROUTE)
@@ -0,0 +1,38 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.monitoring import SERVER, parse_traceparent, tracer
+
+from .route_template import route_template
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Continue the caller's trace when it sent a valid traceparent.
+        parent = parse_traceparent(Headers(scope=scope).get("traceparent"))
+
+        with tracer.span(
+            scope["method"],
+            SERVER,
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            parent=parent,
+        ) as span:
+
+            async def send_with_status(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                template = route_template(scope)
+                span.name = f"{scope['method']} {template}"
+                span.set_attribute("http.route", template)
@@ -0,0 +1,19 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+
+def etag(content: Any) -> str:
+    body = json.dumps(content, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha1(body.encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Weak comparison, as If-None-Match calls for.
+    return "*" in candidates or tag in [
+        c[2:] if c.startswith("W/") else c for c in candidates
+    ]
@@ -0,0 +1,44 @@
+import json
+import os
+from types import ModuleType
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Off by default: routes then validate their read models through
+# response_model as usual.
+FAST_JSON_RESPONSES = os.environ.get("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_encode_default)
+        return json.dumps(
+            content,
+            default=_encode_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def trusted_json_response(content: Any) -> Any:
+    # For read models built by the query services, which already match the
+    # route's response_model.
+    if FAST_JSON_RESPONSES:
+        return FastJSONResponse(content)
+    return content
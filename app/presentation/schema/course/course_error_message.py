@@ -5,7 +5,10 @@ from app.domain.course import (
     CourseNotFoundError,
     CoursesNotFoundError,
 )
-from app.domain.course.course_exception import CategoriesNotFoundError
+from app.domain.course.course_exception import (
+    CategoriesNotFoundError,
+    InvalidTimeRangeError,
+)
 
 
 class ErrorMessageCourseNotFound(BaseModel):
@@ -22,3 +25,7 @@ class ErrorMessageCoursesNotFound(BaseModel):
 
 class ErrorMessageCategoriesNotFound(BaseModel):
     detail: str = Field(example=CategoriesNotFoundError.message)
+
+
+class ErrorMessageInvalidTimeRange(BaseModel):
+    detail: str = Field(example=InvalidTimeRangeError.message)
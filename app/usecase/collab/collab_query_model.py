@@ -2,6 +2,8 @@ from typing import List
 
 from pydantic import BaseModel, Field
 
+from ..schema_example import lazy_examples
+
 
 class UserReadModel(BaseModel):
 
@@ -33,5 +35,8 @@ class CollabReadModel(BaseModel):
 
 
 class PaginatedUserReadModel(BaseModel):
-    users: List[UserReadModel] = Field(example=UserReadModel.schema())
+    users: List[UserReadModel]
     count: int = Field(ge=0, example=1)
+
+    class Config:
+        schema_extra = lazy_examples(users=UserReadModel.schema)
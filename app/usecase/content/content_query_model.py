@@ -2,6 +2,8 @@ from typing import List
 
 from pydantic import BaseModel, Field
 
+from ..schema_example import lazy_examples
+
 
 class ContentReadModel(BaseModel):
 
@@ -24,9 +26,10 @@ class ContentReadModel(BaseModel):
 class ChapterReadModel(BaseModel):
 
     chapter: int = Field(ge=0, example=1)
-    content: List[ContentReadModel] = Field(
-        default=[], example=ContentReadModel.schema()
-    )
+    content: List[ContentReadModel] = []
+
+    class Config:
+        schema_extra = lazy_examples(content=ContentReadModel.schema)
 
     @classmethod
     def from_content_read_model(cls, c: ContentReadModel):
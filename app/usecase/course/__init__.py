@@ -4,6 +4,11 @@ from .course_command_usecase import (
     CourseCommandUseCaseImpl,
     CourseCommandUseCaseUnitOfWork,
 )
-from .course_query_model import CourseReadModel
+from .course_permission_service import CoursePermissionService
+from .course_permission_usecase import (
+    CoursePermissionUseCase,
+    CoursePermissionUseCaseImpl,
+)
+from .course_query_model import CategoryMatch, CourseReadModel, Facet
 from .course_query_service import CourseQueryService
 from .course_query_usecase import CourseQueryUseCase, CourseQueryUseCaseImpl
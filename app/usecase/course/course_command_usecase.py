@@ -1,11 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Optional, cast
+from typing import Optional
 
 import shortuuid
 
 from app.domain.course import (
     Course,
-    CourseNameAlreadyExistsError,
     CourseNotFoundError,
     CourseRepository,
 )
@@ -71,10 +70,6 @@ class CourseCommandUseCase(ABC):
     ) -> Optional[ContentReadModel]:
         raise NotImplementedError
 
-    @abstractmethod
-    def user_involved(self, course_id: str, user_id: str) -> bool:
-        raise NotImplementedError
-
     @abstractmethod
     def add_review(self, id: str, data: ReviewCreateModel):
         raise NotImplementedError
@@ -105,64 +100,43 @@ class CourseCommandUseCaseImpl(CourseCommandUseCase):
                 presentation_video=data.presentation_video,
                 image=data.image,
                 subscription_id=data.subscription_id,
-                recommendations={},
+                recommendations={"recommended": 0, "total": 0},
             )
 
-            existing_course = self.uow.course_repository.find_by_name(data.name)
-            if existing_course is not None:
-                raise CourseNameAlreadyExistsError
             self.uow.course_repository.create(course)
             self.uow.commit()
-
-            created_course = self.uow.course_repository.find_by_id(uuid)
         except:
             self.uow.rollback()
             raise
 
-        return CourseReadModel.from_entity(cast(Course, created_course))
+        return CourseReadModel.from_entity(course)
 
     def update_course(
         self, id: str, data: CourseUpdateModel
     ) -> Optional[CourseReadModel]:
         try:
-            existing_course = self.uow.course_repository.find_by_id(id)
-            if existing_course is None:
-                raise CourseNotFoundError
-
-            course = Course(
-                id=id,
-                creator_id=existing_course.creator_id,
-                name=data.name,
-                price=existing_course.price,
-                language=data.language,
-                country=existing_course.country,
-                active=True,
-                description=data.description,
-                categories=data.categories,
-                presentation_video=data.presentation_video,
-                image=data.image,
-                recommendations={},
-                subscription_id=data.subscription_id,
-                created_at=existing_course.created_at,
+            changes = {
+                k: v
+                for k, v in data.dict(exclude={"categories"}).items()
+                if v is not None and v != ""
+            }
+            updated_course = self.uow.course_repository.update(
+                id, changes=changes, categories=data.categories
             )
-
-            self.uow.course_repository.update(course)
-
-            updated_course = self.uow.course_repository.find_by_id(course.id)
+            if updated_course is None:
+                raise CourseNotFoundError
 
             self.uow.commit()
         except:
             self.uow.rollback()
             raise
 
-        return CourseReadModel.from_entity(cast(Course, updated_course))
+        return CourseReadModel.from_entity(updated_course)
 
     def delete_course_by_id(self, id: str):
         try:
-            existing_course = self.uow.course_repository.find_by_id(id)
-            if existing_course is None:
-                raise CourseNotFoundError
-
+            # delete_by_id raises CourseNotFoundError itself, so the course is
+            # not mapped to an entity (and its relations loaded) just to check.
             self.uow.course_repository.delete_by_id(id)
 
             self.uow.commit()
@@ -230,11 +204,6 @@ class CourseCommandUseCaseImpl(CourseCommandUseCase):
 
         return updated_content
 
-    def user_involved(self, course_id: str, user_id: str) -> bool:
-        return self.uow.course_repository.user_involved(
-            course_id=course_id, user_id=user_id
-        )
-
     def add_review(self, id: str, data: ReviewCreateModel):
         try:
             existing_course = self.uow.course_repository.find_by_id(id)
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CoursePermissionService(ABC):
+    @abstractmethod
+    def find_creator_id(self, course_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_active_collab(self, course_id: str, user_id: str) -> bool:
+        raise NotImplementedError
@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from app.domain.course import CourseNotFoundError
+
+from .course_permission_service import CoursePermissionService
+
+
+class CoursePermissionUseCase(ABC):
+    @abstractmethod
+    def user_is_creator(self, course_id: str, user_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def user_involved(self, course_id: str, user_id: str) -> bool:
+        raise NotImplementedError
+
+
+class CoursePermissionUseCaseImpl(CoursePermissionUseCase):
+    # Instances live for a single request, so the memos never outlive the
+    # session they were read from.
+    def __init__(self, course_permission_service: CoursePermissionService):
+        self.course_permission_service: CoursePermissionService = (
+            course_permission_service
+        )
+        self._creators: Dict[str, Optional[str]] = {}
+        self._collabs: Dict[Tuple[str, str], bool] = {}
+
+    def _creator_id(self, course_id: str) -> str:
+        if course_id not in self._creators:
+            self._creators[course_id] = self.course_permission_service.find_creator_id(
+                course_id
+            )
+        creator_id = self._creators[course_id]
+        if creator_id is None:
+            raise CourseNotFoundError
+        return creator_id
+
+    def user_is_creator(self, course_id: str, user_id: str) -> bool:
+        return self._creator_id(course_id) == user_id
+
+    def user_involved(self, course_id: str, user_id: str) -> bool:
+        if self.user_is_creator(course_id=course_id, user_id=user_id):
+            return True
+        key = (course_id, user_id)
+        if key not in self._collabs:
+            self._collabs[key] = self.course_permission_service.has_active_collab(
+                course_id=course_id, user_id=user_id
+            )
+        return self._collabs[key]
@@ -1,9 +1,24 @@
-from typing import List, cast
+from enum import Enum
+from typing import Dict, List, Optional, cast
 
 from pydantic import BaseModel, Field
 
 from app.domain.course import Course
 
+from ..schema_example import lazy_examples
+
+
+class Facet(str, Enum):
+    CATEGORY = "category"
+    LANGUAGE = "language"
+    COUNTRY = "country"
+    PRICE_BAND = "price_band"
+
+
+class CategoryMatch(str, Enum):
+    ANY = "any"
+    ALL = "all"
+
 
 class CourseReadModel(BaseModel):
 
@@ -32,11 +47,11 @@ class CourseReadModel(BaseModel):
 
     @staticmethod
     def from_entity(course: Course) -> "CourseReadModel":
-        return CourseReadModel(
+        return CourseReadModel.construct(
             id=course.id,
             creator_id=course.creator_id,
             name=course.name,
-            price=course.price,
+            price=float(course.price),
             active=course.active,
             subscription_id=course.subscription_id,
             recommendations=course.recommendations,
@@ -52,5 +67,16 @@ class CourseReadModel(BaseModel):
 
 
 class PaginatedCourseReadModel(BaseModel):
-    courses: List[CourseReadModel] = Field(example=CourseReadModel.schema())
+    courses: List[CourseReadModel]
     count: int = Field(ge=0, example=1)
+
+    class Config:
+        schema_extra = lazy_examples(courses=CourseReadModel.schema)
+
+
+# Only searches that ask for facets answer with this model, so plain pages
+# carry no facets key at all.
+class FacetedCourseReadModel(PaginatedCourseReadModel):
+    facets: Optional[Dict[str, Dict[str, int]]] = Field(
+        example={"language": {"English": 1}, "price_band": {"free": 0, "0-10": 1}}
+    )
@@ -1,13 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from ..collab.collab_query_model import CollabReadModel
 from ..content.content_query_model import ContentReadModel
+from ..metrics.catalog_metrics_query_model import CatalogMetricsReadModel
 from ..metrics.category_metrics_query_model import CategoryMetricsReadModel
 from ..metrics.new_courses_metrics_query_model import NewCoursesMetricsReadModel
+from ..metrics.recommendation_metrics_query_model import (
+    RecommendationTimeSeriesReadModel,
+)
 from ..metrics.subscriptions_metrics_query_model import SubscriptionMetricsReadModel
+from ..metrics.time_buckets import TimeBuckets
+from ..metrics.time_series_metrics_query_model import TimeSeriesMetricsReadModel
 from ..review.review_query_model import ReviewReadModel
-from .course_query_model import CourseReadModel
+from .course_query_model import CategoryMatch, CourseReadModel, Facet
 
 
 class CourseQueryService(ABC):
@@ -35,15 +41,23 @@ class CourseQueryService(ABC):
         subscription_id: Optional[int],
         inactive_courses: Optional[bool],
         inactive_collab: Optional[bool],
-        category: Optional[str],
-        language: Optional[str],
-        country: Optional[str],
+        category: Optional[List[str]],
+        language: Optional[List[str]],
+        country: Optional[List[str]],
         ignore_free: Optional[bool],
         ignore_paid: Optional[bool],
         text: Optional[str],
+        facets: Optional[List[Facet]] = None,
+        category_match: CategoryMatch = CategoryMatch.ANY,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+        updated_from: Optional[int] = None,
+        updated_to: Optional[int] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Tuple[List[CourseReadModel], int]:
+    ) -> Tuple[List[CourseReadModel], int, Optional[Dict[str, Dict[str, int]]]]:
         raise NotImplementedError
 
     @abstractmethod
@@ -71,3 +85,23 @@ class CourseQueryService(ABC):
     @abstractmethod
     def get_subscription_metrics(self) -> SubscriptionMetricsReadModel:
         raise NotImplementedError
+
+    @abstractmethod
+    def get_time_series_metrics(
+        self, buckets: TimeBuckets
+    ) -> TimeSeriesMetricsReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_catalog_metrics(self) -> CatalogMetricsReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_recommendation_metrics(
+        self,
+        buckets: TimeBuckets,
+        course_id: Optional[str],
+        creator_id: Optional[str],
+        category: Optional[str],
+    ) -> RecommendationTimeSeriesReadModel:
+        raise NotImplementedError
@@ -1,14 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 
 from app.domain.course import CourseNotFoundError
 
 from ..content.content_query_model import ChapterReadModel
+from ..metrics.catalog_metrics_query_model import CatalogMetricsReadModel
 from ..metrics.category_metrics_query_model import CategoryMetricsReadModel
 from ..metrics.new_courses_metrics_query_model import NewCoursesMetricsReadModel
+from ..metrics.recommendation_metrics_query_model import (
+    RecommendationTimeSeriesReadModel,
+)
 from ..metrics.subscriptions_metrics_query_model import SubscriptionMetricsReadModel
+from ..metrics.time_buckets import Granularity, TimeBuckets
+from ..metrics.time_series_metrics_query_model import TimeSeriesMetricsReadModel
 from ..review.review_query_model import ReviewReadModel
-from .course_query_model import CourseReadModel
+from .course_query_model import CategoryMatch, CourseReadModel, Facet
 from .course_query_service import CourseQueryService
 
 
@@ -37,25 +44,29 @@ class CourseQueryUseCase(ABC):
         subscription_id: Optional[int],
         inactive_courses: Optional[bool],
         inactive_collab: Optional[bool],
-        category: Optional[str],
-        language: Optional[str],
-        country: Optional[str],
+        category: Optional[List[str]],
+        language: Optional[List[str]],
+        country: Optional[List[str]],
         ignore_free: Optional[bool],
         ignore_paid: Optional[bool],
         text: Optional[str],
+        facets: Optional[List[Facet]] = None,
+        category_match: CategoryMatch = CategoryMatch.ANY,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+        updated_from: Optional[int] = None,
+        updated_to: Optional[int] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Tuple[List[CourseReadModel], int]:
+    ) -> Tuple[List[CourseReadModel], int, Optional[Dict[str, Dict[str, int]]]]:
         raise NotImplementedError
 
     @abstractmethod
     def fetch_content_by_id(self, id: str) -> List[ChapterReadModel]:
         raise NotImplementedError
 
-    @abstractmethod
-    def user_is_creator(self, course_id: str, user_id: str) -> bool:
-        raise NotImplementedError
-
     @abstractmethod
     def fetch_reviews_by_id(self, id: str) -> List[ReviewReadModel]:
         raise NotImplementedError
@@ -74,6 +85,29 @@ class CourseQueryUseCase(ABC):
     def get_subscription_metrics(self) -> SubscriptionMetricsReadModel:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_time_series_metrics(
+        self, start: date, end: date, granularity: Granularity, timezone: str
+    ) -> TimeSeriesMetricsReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_catalog_metrics(self) -> CatalogMetricsReadModel:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_recommendation_metrics(
+        self,
+        start: date,
+        end: date,
+        granularity: Granularity,
+        timezone: str,
+        course_id: Optional[str],
+        creator_id: Optional[str],
+        category: Optional[str],
+    ) -> RecommendationTimeSeriesReadModel:
+        raise NotImplementedError
+
 
 class CourseQueryUseCaseImpl(CourseQueryUseCase):
     def __init__(self, course_query_service: CourseQueryService):
@@ -118,17 +152,25 @@ class CourseQueryUseCaseImpl(CourseQueryUseCase):
         subscription_id: Optional[int] = None,
         inactive_courses: Optional[bool] = None,
         inactive_collab: Optional[bool] = None,
-        category: Optional[str] = None,
-        language: Optional[str] = None,
-        country: Optional[str] = None,
+        category: Optional[List[str]] = None,
+        language: Optional[List[str]] = None,
+        country: Optional[List[str]] = None,
         ignore_free: Optional[bool] = None,
         ignore_paid: Optional[bool] = None,
         text: Optional[str] = None,
+        facets: Optional[List[Facet]] = None,
+        category_match: CategoryMatch = CategoryMatch.ANY,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+        updated_from: Optional[int] = None,
+        updated_to: Optional[int] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Tuple[List[CourseReadModel], int]:
+    ) -> Tuple[List[CourseReadModel], int, Optional[Dict[str, Dict[str, int]]]]:
         try:
-            courses, count = self.course_query_service.find_by_filters(
+            courses, count, facet_counts = self.course_query_service.find_by_filters(
                 ids=ids,
                 name=name,
                 creator_id=creator_id,
@@ -142,13 +184,21 @@ class CourseQueryUseCaseImpl(CourseQueryUseCase):
                 ignore_free=ignore_free,
                 ignore_paid=ignore_paid,
                 text=text,
+                facets=facets,
+                category_match=category_match,
+                min_price=min_price,
+                max_price=max_price,
+                created_from=created_from,
+                created_to=created_to,
+                updated_from=updated_from,
+                updated_to=updated_to,
                 limit=limit,
                 offset=offset,
             )
         except:
             raise
 
-        return courses, count
+        return courses, count, facet_counts
 
     def fetch_content_by_id(self, id: str) -> List[ChapterReadModel]:
         try:
@@ -167,10 +217,6 @@ class CourseQueryUseCaseImpl(CourseQueryUseCase):
 
         return v
 
-    def user_is_creator(self, course_id: str, user_id: str) -> bool:
-        course = self.fetch_course_by_id(course_id)
-        return course is not None and course.creator_id == user_id
-
     def fetch_reviews_by_id(self, id: str) -> List[ReviewReadModel]:
         try:
             r = self.course_query_service.fetch_reviews_by_id(id)
@@ -202,3 +248,42 @@ class CourseQueryUseCaseImpl(CourseQueryUseCase):
         except:
             raise
         return metrics
+
+    def get_time_series_metrics(
+        self, start: date, end: date, granularity: Granularity, timezone: str
+    ) -> TimeSeriesMetricsReadModel:
+        try:
+            buckets = TimeBuckets(start, end, granularity, timezone)
+            metrics = self.course_query_service.get_time_series_metrics(buckets)
+        except:
+            raise
+        return metrics
+
+    def get_catalog_metrics(self) -> CatalogMetricsReadModel:
+        try:
+            metrics = self.course_query_service.get_catalog_metrics()
+        except:
+            raise
+        return metrics
+
+    def get_recommendation_metrics(
+        self,
+        start: date,
+        end: date,
+        granularity: Granularity,
+        timezone: str,
+        course_id: Optional[str] = None,
+        creator_id: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> RecommendationTimeSeriesReadModel:
+        try:
+            buckets = TimeBuckets(start, end, granularity, timezone)
+            metrics = self.course_query_service.get_recommendation_metrics(
+                buckets,
+                course_id=course_id,
+                creator_id=creator_id,
+                category=category,
+            )
+        except:
+            raise
+        return metrics
@@ -0,0 +1,16 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class CatalogMetricsReadModel(BaseModel):
+
+    languages: Dict[str, int] = Field(example={"English": 12, "Spanish": 7})
+    countries: Dict[str, int] = Field(example={"Argentina": 15, "Uruguay": 4})
+    price_bands: Dict[str, int] = Field(
+        example={"free": 5, "0-10": 6, "10-25": 5, "25-50": 2, "50-100": 1, "100+": 0}
+    )
+    active: int = Field(example=17)
+    inactive: int = Field(example=2)
+    free: int = Field(example=5)
+    paid: int = Field(example=14)
@@ -2,6 +2,8 @@ from typing import List
 
 from pydantic import BaseModel, Field
 
+from ..schema_example import lazy_examples
+
 
 class CategoryMetricsReadModel(BaseModel):
 
@@ -11,7 +13,10 @@ class CategoryMetricsReadModel(BaseModel):
 
 class PaginatedCategoryMetricsReadModel(BaseModel):
 
-    categories: List[CategoryMetricsReadModel] = Field(
-        example=[CategoryMetricsReadModel.schema()]
-    )
+    categories: List[CategoryMetricsReadModel]
     count: int = Field(example=10)
+
+    class Config:
+        schema_extra = lazy_examples(
+            categories=lambda: [CategoryMetricsReadModel.schema()]
+        )
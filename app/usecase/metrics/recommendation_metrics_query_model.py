@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from ..schema_example import lazy_examples
+from .time_buckets import Granularity
+
+
+class RecommendationBucketReadModel(BaseModel):
+
+    start: datetime = Field(example="2021-03-01T00:00:00-03:00")
+    end: datetime = Field(example="2021-04-01T00:00:00-03:00")
+    reviews: int = Field(example=12)
+    recommended: int = Field(example=9)
+    rate: Optional[float] = Field(example=0.75)
+
+
+class RecommendationTimeSeriesReadModel(BaseModel):
+
+    granularity: Granularity = Field(example=Granularity.MONTH)
+    timezone: str = Field(example="America/Argentina/Buenos_Aires")
+    course_id: Optional[str] = Field(example=None)
+    creator_id: Optional[str] = Field(example="WJ2cdiF8FTT3fsG2HEBCoW")
+    category: Optional[str] = Field(example=None)
+    buckets: List[RecommendationBucketReadModel]
+
+    class Config:
+        schema_extra = lazy_examples(
+            buckets=lambda: [RecommendationBucketReadModel.schema()]
+        )
@@ -0,0 +1,75 @@
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import List
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.domain.course.course_exception import (
+    InvalidTimeRangeError,
+    UnknownTimeZoneError,
+)
+
+MAX_TIME_BUCKETS = 1000
+
+
+class Granularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+def time_zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise UnknownTimeZoneError
+
+
+def _first_day(day: date, granularity: Granularity) -> date:
+    if granularity == Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next_day(day: date, granularity: Granularity) -> date:
+    if granularity == Granularity.WEEK:
+        return day + timedelta(days=7)
+    if granularity == Granularity.MONTH:
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(days=1)
+
+
+class TimeBuckets:
+    # Calendar buckets covering the local dates start to end, both included.
+    # Weeks start on Monday. Edges are local midnights, so a bucket spanning
+    # a DST change is an hour longer or shorter than the others.
+    def __init__(
+        self,
+        start: date,
+        end: date,
+        granularity: Granularity = Granularity.MONTH,
+        timezone: str = "UTC",
+    ):
+        if end < start:
+            raise InvalidTimeRangeError
+        zone = time_zone(timezone)
+        self.granularity: Granularity = granularity
+        self.timezone: str = timezone
+        try:
+            days = [_first_day(start, granularity)]
+            while days[-1] <= end:
+                if len(days) > MAX_TIME_BUCKETS:
+                    raise InvalidTimeRangeError
+                days.append(_next_day(days[-1], granularity))
+            self.edges: List[datetime] = [
+                datetime(day.year, day.month, day.day, tzinfo=zone) for day in days
+            ]
+            self.edges_ms: List[int] = [
+                int(edge.timestamp() * 1000) for edge in self.edges
+            ]
+        except (OverflowError, ValueError):
+            raise InvalidTimeRangeError
+
+    def __len__(self) -> int:
+        return len(self.edges) - 1
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from ..schema_example import lazy_examples
+from .time_buckets import Granularity
+
+
+class TimeBucketMetricsReadModel(BaseModel):
+
+    start: datetime = Field(example="2021-03-01T00:00:00-03:00")
+    end: datetime = Field(example="2021-04-01T00:00:00-03:00")
+    courses: int = Field(example=4)
+    reviews: int = Field(example=11)
+
+
+class TimeSeriesMetricsReadModel(BaseModel):
+
+    granularity: Granularity = Field(example=Granularity.MONTH)
+    timezone: str = Field(example="America/Argentina/Buenos_Aires")
+    buckets: List[TimeBucketMetricsReadModel]
+
+    class Config:
+        schema_extra = lazy_examples(
+            buckets=lambda: [TimeBucketMetricsReadModel.schema()]
+        )
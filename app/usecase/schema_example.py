@@ -0,0 +1,15 @@
+from typing import Any, Callable, Dict, Type
+
+from pydantic import BaseModel
+
+
+def lazy_examples(
+    **examples: Callable[[], Any],
+) -> Callable[[Dict[str, Any], Type[BaseModel]], None]:
+    def schema_extra(schema: Dict[str, Any], model: Type[BaseModel]):
+        properties = schema.get("properties", {})
+        for field, example in examples.items():
+            if field in properties:
+                properties[field]["example"] = example()
+
+    return schema_extra
@@ -0,0 +1,155 @@
+import random
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+
+from app.infrastructure.course import rebuild_course_metrics
+from app.infrastructure.course.course_dto import (
+    Category,
+    Collab,
+    Content,
+    CourseCategory,
+    CourseDTO,
+    ReviewDTO,
+)
+
+CATEGORIES = (
+    "Programming",
+    "Python",
+    "C",
+    "Go",
+    "Data Science",
+    "Machine Learning",
+    "Design",
+    "Marketing",
+    "Music",
+    "Photography",
+    "Finance",
+    "Languages",
+    "Health",
+    "Cooking",
+    "Math",
+    "Physics",
+)
+LANGUAGES = ("English", "Spanish", "Portuguese", "French")
+COUNTRIES = ("Argentina", "Uruguay", "Brazil", "Chile", "Spain", "United States")
+WORDS = (
+    "learn",
+    "complete",
+    "guide",
+    "masterclass",
+    "beginners",
+    "advanced",
+    "practical",
+    "bootcamp",
+    "fundamentals",
+    "projects",
+)
+# 2021-01-01T00:00:00Z, spread over roughly two years.
+EPOCH = 1609459200000
+SPAN = 2 * 365 * 24 * 3600 * 1000
+
+
+class Catalog:
+    def __init__(self, scale: int, seed: int = 0):
+        self.scale: int = scale
+        self.seed: int = seed
+        self.courses: List[Dict] = []
+        self.categories: List[Dict] = [
+            {"id": id, "name": name} for id, name in enumerate(CATEGORIES, 1)
+        ]
+        self.course_categories: List[Dict] = []
+        self.collabs: List[Dict] = []
+        self.content: List[Dict] = []
+        self.reviews: List[Dict] = []
+        self._generate(random.Random(seed))
+
+    def _generate(self, rnd: random.Random):
+        creators = max(1, self.scale // 10)
+        users = max(1, self.scale * 2)
+        for i in range(self.scale):
+            course_id = "course_{:07d}".format(i)
+            created_at = EPOCH + rnd.randrange(SPAN)
+            self.courses.append(
+                {
+                    "id": course_id,
+                    "creator_id": "creator_{}".format(rnd.randrange(creators)),
+                    "name": "{} {} {}".format(
+                        rnd.choice(CATEGORIES), " ".join(rnd.sample(WORDS, 3)), i
+                    ),
+                    "price": rnd.choice((0.0, 0.0, 9.99, 19.99, 49.99)),
+                    "active": rnd.random() < 0.9,
+                    "subscription_id": rnd.randrange(3),
+                    "language": rnd.choice(LANGUAGES),
+                    "country": rnd.choice(COUNTRIES),
+                    "description": " ".join(rnd.choices(WORDS, k=40)),
+                    "presentation_video": "https://example.com/{}.mp4".format(i),
+                    "image": "https://example.com/{}.jpg".format(i),
+                    "created_at": created_at,
+                    "updated_at": created_at + rnd.randrange(SPAN // 4),
+                }
+            )
+            categories = rnd.sample(self.categories, rnd.randint(1, 3))
+            for position, category in enumerate(categories):
+                self.course_categories.append(
+                    {
+                        "course_id": course_id,
+                        "category_id": category["id"],
+                        "position": position,
+                    }
+                )
+            for user in rnd.sample(range(users), rnd.randint(0, 5)):
+                self.collabs.append(
+                    {
+                        "id": "collab_{}".format(len(self.collabs)),
+                        "user_id": "user_{}".format(user),
+                        "course_id": course_id,
+                        "active": rnd.random() < 0.8,
+                    }
+                )
+            for chapter in range(rnd.randint(0, 4)):
+                for order in range(rnd.randint(1, 4)):
+                    self.content.append(
+                        {
+                            "id": "content_{}".format(len(self.content)),
+                            "title": "Chapter {} part {}".format(chapter, order),
+                            "course_id": course_id,
+                            "chapter": str(chapter),
+                            "order": str(order),
+                            "description": " ".join(rnd.choices(WORDS, k=20)),
+                            "video": "https://example.com/{}/{}.mp4".format(i, order),
+                            "image": "",
+                            "active": rnd.random() < 0.95,
+                        }
+                    )
+            for user in rnd.sample(range(users), rnd.randint(0, 20)):
+                self.reviews.append(
+                    {
+                        "id": "user_{}".format(user),
+                        "course_id": course_id,
+                        "recommended": rnd.random() < 0.75,
+                        "review": " ".join(rnd.choices(WORDS, k=15)),
+                        "date": created_at + rnd.randrange(SPAN // 4),
+                    }
+                )
+
+    def load(self, connection: Connection):
+        for dto, rows in (
+            (CourseDTO, self.courses),
+            (Category, self.categories),
+            (CourseCategory, self.course_categories),
+            (Collab, self.collabs),
+            (Content, self.content),
+            (ReviewDTO, self.reviews),
+        ):
+            if rows:
+                connection.execute(insert(dto.__table__), rows)
+        # Rows are inserted directly, so the metrics rollups are derived here.
+        rebuild_course_metrics(connection)
+
+    def course_with(self, rows: List[Dict]) -> str:
+        counts: Dict[str, int] = {}
+        for row in rows:
+            counts[row["course_id"]] = counts.get(row["course_id"], 0) + 1
+        return max(counts, key=lambda id: (counts[id], id))
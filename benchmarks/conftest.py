@@ -0,0 +1,42 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.database import Base
+from app.infrastructure.migrations import MIGRATIONS, migrate
+from app.infrastructure.migrations.migration import metadata as migration_metadata
+
+from .catalog import Catalog
+
+# BENCH_DATABASE_URL must point to a throwaway database: its course tables
+# are dropped and reseeded at the start of every run.
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL")
+BENCH_SCALE = int(os.environ.get("BENCH_SCALE", "1000"))
+BENCH_SEED = int(os.environ.get("BENCH_SEED", "0"))
+
+
+@pytest.fixture(scope="session")
+def catalog() -> Catalog:
+    return Catalog(BENCH_SCALE, seed=BENCH_SEED)
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory, catalog):
+    url = BENCH_DATABASE_URL or "sqlite:///{}".format(
+        tmp_path_factory.mktemp("bench") / "catalog.db"
+    )
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    migration_metadata.drop_all(engine)
+    migrate(engine, MIGRATIONS)
+    with engine.begin() as connection:
+        catalog.load(connection)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def session_factory(engine):
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
@@ -0,0 +1,354 @@
+"""Drive main:app in-process over ASGI with a weighted mix of real routes at
+a target concurrency and report throughput and p50/p95/p99 latency per route.
+The users, payments and subscriptions services are replaced by local stubs.
+
+    python -m benchmarks.load [--requests 2000] [--concurrency 16] [--scale 1000]
+        [--mix listing=25,search=20,detail=20,...] [--stub-latency-ms 0]
+        [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import BaseAdapter
+from sqlalchemy import inspect
+
+from .catalog import Catalog
+
+STUB_SERVICES = {
+    "users": "http://users.stub/",
+    "payments": "http://payments.stub/",
+    "subscriptions": "http://subscriptions.stub/",
+}
+
+DEFAULT_MIX = {
+    "listing": 25,
+    "search": 20,
+    "detail": 20,
+    "content": 10,
+    "reviews": 8,
+    "collabs": 4,
+    "categories": 3,
+    "metrics": 3,
+    "create": 2,
+    "update": 2,
+    "review": 2,
+    "delete": 1,
+}
+
+
+def stub_user(id: str) -> dict:
+    return {
+        "id": id,
+        "username": id,
+        "name": "Jane",
+        "lastName": "Doe",
+        "role": 1,
+        "dateOfBirth": "Wed Nov 10 2021",
+        "country": "Argentina",
+        "language": "Spanish",
+        "mail": "{}@example.com".format(id),
+    }
+
+
+class StubServiceAdapter(BaseAdapter):
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency: float = latency
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        url = request.url
+        if "users/filter-by-ids" in url:
+            ids = url.split("ids=")[1].split("&")[0].split("%2C")
+            body = [stub_user(id) for id in ids if id]
+        elif "payments/wallet" in url:
+            body = {"balance": 1000000}
+        elif "cancel-fee" in url:
+            body = 0
+        else:
+            body = {}
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode("utf-8")
+        response.headers["content-type"] = "application/json"
+        response.url = url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+async def call(app, method: str, path: str, query: str = "", body=None) -> int:
+    payload = b"" if body is None else json.dumps(body).encode("utf-8")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "root_path": "",
+        "headers": [
+            (b"host", b"loadtest"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode("ascii")),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("loadtest", 80),
+    }
+    received = False
+    status = 0
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+Request = Tuple[str, str, str, Optional[dict]]
+
+
+class Scenarios:
+    def __init__(self, catalog: Catalog, rnd: random.Random):
+        self.catalog: Catalog = catalog
+        self.rnd: random.Random = rnd
+        self.sequence = count()
+        self.with_content = sorted({c["course_id"] for c in catalog.content})
+        self.with_collabs = sorted({c["course_id"] for c in catalog.collabs})
+
+    def course(self):
+        return self.rnd.choice(self.catalog.courses)
+
+    def listing(self) -> Request:
+        return "GET", "/courses", urlencode({"offset": self.rnd.randrange(5)}), None
+
+    def search(self) -> Request:
+        course = self.course()
+        params = self.rnd.choice(
+            (
+                {"category": "Python"},
+                {"language": course["language"], "country": course["country"]},
+                {"creator_id": course["creator_id"]},
+                {"text": "masterclass"},
+                {"paid": "true"},
+            )
+        )
+        return "GET", "/courses/", urlencode(params), None
+
+    def detail(self) -> Request:
+        return "GET", "/courses/" + self.course()["id"], "", None
+
+    def content(self) -> Request:
+        id = self.rnd.choice(self.with_content)
+        return "GET", "/courses/{}/content".format(id), "uid=user_0", None
+
+    def reviews(self) -> Request:
+        return "GET", "/courses/{}/reviews".format(self.course()["id"]), "", None
+
+    def collabs(self) -> Request:
+        id = self.rnd.choice(self.with_collabs)
+        return "GET", "/courses/{}/collabs".format(id), "", None
+
+    def categories(self) -> Request:
+        return "GET", "/courses/categories/", "", None
+
+    def metrics(self) -> Request:
+        path = self.rnd.choice(
+            (
+                "/courses/metrics/categories",
+                "/courses/metrics/courses",
+                "/courses/metrics/subscriptions",
+            )
+        )
+        return "GET", path, "", None
+
+    def create(self) -> Request:
+        n = next(self.sequence)
+        body = {
+            "name": "Load test course {}".format(n),
+            "price": 9.99,
+            "language": "English",
+            "country": "Argentina",
+            "description": "Created under load",
+            "categories": ["Programming"],
+        }
+        return "POST", "/courses", urlencode({"creator_id": "creator_load"}), body
+
+    def update(self) -> Request:
+        course = self.course()
+        body = {"description": "Updated {}".format(next(self.sequence))}
+        query = urlencode({"uid": course["creator_id"]})
+        return "PATCH", "/courses/" + course["id"], query, body
+
+    def review(self) -> Request:
+        body = {
+            "id": "user_load_{}".format(next(self.sequence)),
+            "recommended": self.rnd.random() < 0.75,
+            "review": "Reviewed under load",
+        }
+        return "POST", "/courses/{}/reviews".format(self.course()["id"]), "", body
+
+    def delete(self) -> Request:
+        course = self.course()
+        query = urlencode({"uid": course["creator_id"]})
+        return "DELETE", "/courses/" + course["id"], query, None
+
+
+def percentile(quantiles: List[float], p: int) -> float:
+    return quantiles[p - 1] if quantiles else 0.0
+
+
+async def run(app, scenarios: Scenarios, mix: Dict[str, int], total, concurrency):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    plan = scenarios.rnd.choices(names, weights=weights, k=total)
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    queue = iter(plan)
+
+    async def worker():
+        for name in queue:
+            method, path, query, body = getattr(scenarios, name)()
+            started = time.perf_counter()
+            try:
+                status = await call(app, method, path, query, body)
+            except Exception:
+                # ServerErrorMiddleware re-raises after sending the 500.
+                status = 500
+            latencies[name].append(time.perf_counter() - started)
+            if status >= 500:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    print(
+        "{} requests, concurrency {}, {:.1f} s, {:.1f} req/s".format(
+            total, concurrency, elapsed, total / elapsed
+        )
+    )
+    print(
+        "{:<11} {:>6} {:>6} {:>9} {:>9} {:>9} {:>9}".format(
+            "route", "count", "5xx", "req/s", "p50 ms", "p95 ms", "p99 ms"
+        )
+    )
+    for name in names:
+        values = latencies[name]
+        if not values:
+            continue
+        q = statistics.quantiles(values, n=100) if len(values) > 1 else values * 99
+        print(
+            "{:<11} {:>6} {:>6} {:>9.1f} {:>9.2f} {:>9.2f} {:>9.2f}".format(
+                name,
+                len(values),
+                errors[name],
+                len(values) / elapsed,
+                percentile(q, 50) * 1000,
+                percentile(q, 95) * 1000,
+                percentile(q, 99) * 1000,
+            )
+        )
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, int]:
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in value.split(","):
+        name, weight = item.split("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError("unknown route {}".format(name))
+        mix[name] = int(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mix", type=parse_mix, default=None)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--database-url")
+    parser.add_argument("--verbose", action="store_true", help="keep INFO logs")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = args.database_url or (
+            "sqlite:///{}?check_same_thread=false".format(os.path.join(tmp, "load.db"))
+        )
+        os.environ["MICROSERVICES"] = repr(STUB_SERVICES)
+
+        from app.infrastructure import microservice_client
+        from app.infrastructure.database import get_engine
+        from app.infrastructure.migrations import MIGRATIONS, migrate
+
+        engine = get_engine()
+        # Checked before any DDL, so a database that is not ours is left as
+        # it was.
+        if _has_tables(engine):
+            sys.exit("--database-url must point to an empty database")
+        migrate(engine, MIGRATIONS)
+        catalog = Catalog(args.scale, seed=args.seed)
+        with engine.begin() as connection:
+            catalog.load(connection)
+
+        adapter = StubServiceAdapter(args.stub_latency_ms / 1000)
+        for url in STUB_SERVICES.values():
+            microservice_client.session.mount(url, adapter)
+
+        import main as application
+
+        if not args.verbose:
+            logging.disable(logging.INFO)
+
+        async def session():
+            await application.app.router.startup()
+            await run(
+                application.app,
+                Scenarios(catalog, random.Random(args.seed)),
+                args.mix or dict(DEFAULT_MIX),
+                args.requests,
+                args.concurrency,
+            )
+            await application.app.router.shutdown()
+
+        asyncio.run(session())
+        engine.dispose()
+
+
+def _has_tables(engine) -> bool:
+    return bool(inspect(engine).get_table_names())
+
+
+if __name__ == "__main__":
+    main()
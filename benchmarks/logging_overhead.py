@@ -0,0 +1,118 @@
+"""Measure what logging costs the request path: the per-request access line
+written synchronously with the text formatter, as before, versus queued to
+AsyncStreamHandler and formatted as JSON on its listener thread.
+
+    python -m benchmarks.logging_overhead [--records 20000] [--write-latency-us 100]
+
+A write latency simulates stdout backed by a slow pipe or log driver.
+"""
+
+import argparse
+import io
+import logging
+import time
+
+from app.infrastructure.monitoring import (
+    AsyncStreamHandler,
+    JsonFormatter,
+    log_records_dropped,
+)
+
+TEXT_FORMAT = (
+    "%(asctime)s loglevel=%(levelname)-6s logger=%(name)s %(funcName)s() "
+    "L%(lineno)-4d %(message)s"
+)
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def write(self, s):
+        if self.latency:
+            deadline = time.perf_counter() + self.latency
+            while time.perf_counter() < deadline:
+                pass
+        return len(s)
+
+
+def sync_handler(stream):
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def async_handler(stream, rate=0):
+    handler = AsyncStreamHandler(stream, rate=rate)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def measure(handler, records):
+    logger = logging.getLogger("benchmarks.logging_overhead")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    dropped = sum(log_records_dropped.value(r) for r in ("queue_full", "rate_limited"))
+
+    started = time.perf_counter()
+    for i in range(records):
+        path = "/courses/course_{}".format(i % 100)
+        logger.info(
+            "%s %s %s",
+            "GET",
+            path,
+            200,
+            extra={
+                "method": "GET",
+                "path": path,
+                "status": 200,
+                "duration_ms": 3.2,
+                "db_statements": 2,
+                "db_ms": 0.7,
+            },
+        )
+    caller = (time.perf_counter() - started) / records
+    handler.flush()
+    total = (time.perf_counter() - started) / records
+    handler.close()
+    dropped = (
+        sum(log_records_dropped.value(r) for r in ("queue_full", "rate_limited"))
+        - dropped
+    )
+    return caller, total, int(dropped)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--write-latency-us", type=float, default=100)
+    args = parser.parse_args(argv)
+
+    print("{} access log records, one per request".format(args.records))
+    print(
+        "{:<44} {:>14} {:>14} {:>9}".format(
+            "", "request path", "until written", "dropped"
+        )
+    )
+    for latency in (0, args.write_latency_us / 1e6):
+        cases = [
+            ("sync text", sync_handler(SlowStream(latency))),
+            ("async json", async_handler(SlowStream(latency))),
+            ("async json, 50/s per logger", async_handler(SlowStream(latency), 50)),
+        ]
+        for name, handler in cases:
+            caller, total, dropped = measure(handler, args.records)
+            print(
+                "{:<44} {:>11.1f} us {:>11.1f} us {:>9}".format(
+                    "{} (write {:.0f} us)".format(name, latency * 1e6),
+                    caller * 1e6,
+                    total * 1e6,
+                    dropped,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
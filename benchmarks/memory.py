@@ -0,0 +1,98 @@
+"""Measure memory held by bulk-loaded domain entities with tracemalloc,
+comparing the slotted Course/Review against the same classes backed by a
+per-instance __dict__.
+
+    python -m benchmarks.memory [--count 10000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from app.domain.course import Course
+from app.domain.review.review import Review
+
+DictCourse = type("DictCourse", (), {"__init__": Course.__init__})
+DictReview = type("DictReview", (), {"__init__": Review.__init__})
+
+
+def course_fields(count):
+    categories = ["Programming", "C"]
+    recommendations = {"recommended": 0, "total": 0}
+    return [
+        dict(
+            id="course_{:06d}".format(i),
+            creator_id="creator_{}".format(i % 97),
+            name="Course number {}".format(i),
+            price=10.0,
+            active=True,
+            language="English",
+            country="Argentina",
+            description="Learn how to program with C",
+            categories=categories,
+            presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            image="https://example.com/course.jpg",
+            subscription_id=0,
+            recommendations=recommendations,
+            created_at=1614007224642 + i,
+            updated_at=1614007224642 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def review_fields(count):
+    return [
+        dict(
+            id="user_{:06d}".format(i),
+            course_id="course_{:06d}".format(i % 500),
+            recommended=i % 3 != 0,
+            review="Great course",
+            date=1614007224642 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def allocated(build):
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def instance_cost(cls, fields):
+    # Field values are built before tracing starts, so only the entities
+    # themselves (minus the list holding them) are measured.
+    entities = allocated(lambda: [cls(**f) for f in fields])
+    container = allocated(lambda: [None for _ in fields])
+    return (entities - container) / len(fields)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args(argv)
+    courses = course_fields(args.count)
+    reviews = review_fields(args.count)
+
+    print("{} instances each".format(args.count))
+    for name, slotted, plain, fields in (
+        ("Course", Course, DictCourse, courses),
+        ("Review", Review, DictReview, reviews),
+    ):
+        slotted_cost = instance_cost(slotted, fields)
+        plain_cost = instance_cost(plain, fields)
+        print(
+            "{:<7} __dict__ {:7.1f} B/instance  __slots__ {:7.1f} B/instance"
+            "  ({:.0%})".format(
+                name, plain_cost, slotted_cost, slotted_cost / plain_cost
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
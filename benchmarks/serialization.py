@@ -0,0 +1,104 @@
+"""Compare per-page serialization cost of GET /courses: validated read models
+encoded through FastAPI's response_model handling versus trusted read models
+encoded with FastJSONResponse.
+
+    python -m benchmarks.serialization [--page-size 50] [--number 200]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi.routing import APIRoute, serialize_response
+from starlette.responses import JSONResponse
+
+from app.presentation.response.json_response import FastJSONResponse, orjson
+from app.usecase.course import CourseReadModel
+from app.usecase.course.course_query_model import PaginatedCourseReadModel
+from routes.courses import router
+
+
+def course_rows(page_size):
+    return [
+        dict(
+            id="course_{:04d}".format(i),
+            creator_id="creator_{}".format(i % 7),
+            name="Course number {}".format(i),
+            price=float(i % 3) * 10,
+            active=True,
+            subscription_id=i % 3,
+            language="English",
+            country="Argentina",
+            description="Learn how to program with C. " * 40,
+            categories=["Programming", "C", "Beginner"],
+            recommendations={"recommended": i, "total": i * 2},
+            presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            image="https://example.com/images/{}.jpg".format(i),
+            created_at=1614007224642 + i,
+            updated_at=1614007224642 + i,
+        )
+        for i in range(page_size)
+    ]
+
+
+def response_field():
+    for route in router.routes:
+        if isinstance(route, APIRoute) and route.path == "/courses":
+            if "GET" in route.methods:
+                return route.secure_cloned_response_field
+    raise LookupError("GET /courses route not found")
+
+
+async def validated_page(rows, field):
+    courses = [CourseReadModel(**row) for row in rows]
+    page = PaginatedCourseReadModel(courses=courses, count=len(courses))
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def trusted_page(rows, field):
+    courses = [CourseReadModel.construct(**row) for row in rows]
+    page = PaginatedCourseReadModel.construct(courses=courses, count=len(courses))
+    return FastJSONResponse(page).body
+
+
+async def measure(render, rows, field, number, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            await render(rows, field)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+async def run(page_size, number, repeat):
+    rows = course_rows(page_size)
+    field = response_field()
+    validated = await validated_page(rows, field)
+    trusted = await trusted_page(rows, field)
+    assert len(validated) > 0 and len(trusted) > 0
+
+    print(
+        "{} courses per page, {} KiB encoded, encoder: {}".format(
+            page_size, len(trusted) // 1024, "orjson" if orjson else "json"
+        )
+    )
+    baseline = await measure(validated_page, rows, field, number, repeat)
+    fast = await measure(trusted_page, rows, field, number, repeat)
+    print("response_model + JSONResponse  {:8.3f} ms/page".format(baseline * 1000))
+    print("construct + FastJSONResponse   {:8.3f} ms/page".format(fast * 1000))
+    print("speedup                        {:8.1f}x".format(baseline / fast))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.page_size, args.number, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure cold start of ``main:app``: import time and time until startup
+handlers have run, each sample in a fresh interpreter.
+
+    python benchmarks/startup.py [--runs 10] [--database-url URL]
+
+Without ``--database-url`` a migrated throwaway SQLite database is used.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+asyncio.run(main.app.router.startup())
+ready = time.perf_counter()
+main.app.openapi()
+docs = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "ready": ready - started,
+    "openapi": docs - ready,
+}))
+"""
+
+
+def run_python(code, env):
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def sample(env):
+    return json.loads(run_python(CHILD, env).strip().splitlines()[-1])
+
+
+def report(name, values):
+    values = sorted(v * 1000 for v in values)
+    print(
+        "{:<8} min {:8.1f} ms  median {:8.1f} ms  max {:8.1f} ms".format(
+            name, values[0], statistics.median(values), values[-1]
+        )
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--database-url")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = args.database_url or "sqlite:///{}".format(
+            os.path.join(tmp, "startup.db")
+        )
+        run_python("import manage; manage.main(['migrate'])", env)
+        # Warm the bytecode cache so every measured run starts from the same state.
+        sample(env)
+
+        samples = [sample(env) for _ in range(args.runs)]
+
+    print("main:app cold start over {} runs".format(args.runs))
+    for name in ("import", "ready", "openapi"):
+        report(name, [s[name] for s in samples])
+
+
+if __name__ == "__main__":
+    main()
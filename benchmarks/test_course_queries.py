@@ -0,0 +1,140 @@
+import pytest
+
+from app.infrastructure.course import CourseQueryServiceImpl
+from app.usecase.course import CategoryMatch, CourseQueryUseCaseImpl
+
+DAY = 24 * 60 * 60 * 1000
+
+
+def run_query(session_factory, query):
+    # One session per call, like one request, so nothing is served from the
+    # previous round's identity map.
+    with session_factory() as session:
+        return query(CourseQueryUseCaseImpl(CourseQueryServiceImpl(session)))
+
+
+def filters(catalog):
+    course = catalog.courses[len(catalog.courses) // 2]
+    collab = catalog.collabs[len(catalog.collabs) // 2]
+    return {
+        "ids": {"ids": [c["id"] for c in catalog.courses[:20]]},
+        "name": {"name": course["name"]},
+        "creator_id": {"creator_id": course["creator_id"]},
+        "collab_id": {"collab_id": collab["user_id"]},
+        "subscription_id": {"subscription_id": 1},
+        "inactive_courses": {"inactive_courses": True},
+        "category": {"category": ["Python"]},
+        "categories_all": {
+            "category": ["Python", "Data Science"],
+            "category_match": CategoryMatch.ALL,
+        },
+        "language": {"language": ["Spanish", "Portuguese"]},
+        "country": {"country": ["Argentina"]},
+        "ignore_free": {"ignore_free": True},
+        "ignore_paid": {"ignore_paid": True},
+        "price_range": {"min_price": 10, "max_price": 50},
+        "created_range": {
+            "created_from": course["created_at"] - 30 * DAY,
+            "created_to": course["created_at"],
+        },
+        "text": {"text": "masterclass"},
+    }
+
+
+FILTERS = (
+    "ids",
+    "name",
+    "creator_id",
+    "collab_id",
+    "subscription_id",
+    "inactive_courses",
+    "category",
+    "categories_all",
+    "language",
+    "country",
+    "ignore_free",
+    "ignore_paid",
+    "price_range",
+    "created_range",
+    "text",
+)
+
+
+def test_fetch_course_by_id(benchmark, session_factory, catalog):
+    id = catalog.course_with(catalog.course_categories)
+
+    course = benchmark(run_query, session_factory, lambda q: q.fetch_course_by_id(id))
+
+    assert course.id == id
+
+
+@pytest.mark.parametrize("offset", [0, 5])
+def test_fetch_courses(benchmark, session_factory, offset):
+    courses, count = benchmark(
+        run_query,
+        session_factory,
+        lambda q: q.fetch_courses(limit=50, offset=offset),
+    )
+
+    assert count > 0
+
+
+@pytest.mark.parametrize("name", FILTERS)
+def test_fetch_courses_by_filters(benchmark, session_factory, catalog, name):
+    kwargs = filters(catalog)[name]
+
+    courses, count, _ = benchmark(
+        run_query,
+        session_factory,
+        lambda q: q.fetch_courses_by_filters(limit=50, offset=0, **kwargs),
+    )
+
+    assert count >= len(courses)
+
+
+def test_fetch_categories(benchmark, session_factory):
+    categories = benchmark(run_query, session_factory, lambda q: q.fetch_categories())
+
+    assert len(categories) > 0
+
+
+def test_fetch_content_by_id(benchmark, session_factory, catalog):
+    id = catalog.course_with(catalog.content)
+
+    chapters = benchmark(
+        run_query, session_factory, lambda q: q.fetch_content_by_id(id)
+    )
+
+    assert len(chapters) > 0
+
+
+def test_fetch_reviews_by_id(benchmark, session_factory, catalog):
+    id = catalog.course_with(catalog.reviews)
+
+    reviews = benchmark(run_query, session_factory, lambda q: q.fetch_reviews_by_id(id))
+
+    assert len(reviews) > 0
+
+
+def test_get_category_metrics(benchmark, session_factory):
+    metrics, count = benchmark(
+        run_query, session_factory, lambda q: q.get_category_metrics(limit=10)
+    )
+
+    assert count > 0
+
+
+def test_get_course_metrics(benchmark, session_factory):
+    metrics = benchmark(
+        run_query, session_factory, lambda q: q.get_course_metrics(year=2021)
+    )
+
+    assert sum(metrics.months) > 0
+
+
+def test_get_subscription_metrics(benchmark, session_factory, catalog):
+    metrics = benchmark(
+        run_query, session_factory, lambda q: q.get_subscription_metrics()
+    )
+
+    assert sum(metrics.subscriptions) == len(catalog.courses)
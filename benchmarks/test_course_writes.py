@@ -0,0 +1,159 @@
+# Collected after test_course_queries.py so the read benchmarks always see
+# the freshly seeded catalog.
+from itertools import count
+
+from app.infrastructure.course import (
+    CourseCommandUseCaseUnitOfWorkImpl,
+    CourseIdentityMap,
+    CourseRepositoryImpl,
+)
+from app.usecase.content.content_command_model import (
+    ContentCreateModel,
+    ContentUpdateModel,
+)
+from app.usecase.course import (
+    CourseCommandUseCaseImpl,
+    CourseCreateModel,
+    CourseUpdateModel,
+)
+from app.usecase.review.review_command_model import ReviewCreateModel
+
+sequence = count()
+
+
+def run_command(session_factory, command):
+    with session_factory() as session:
+        identity_map = CourseIdentityMap(session)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session, CourseRepositoryImpl(session, identity_map), identity_map
+        )
+        return command(CourseCommandUseCaseImpl(uow))
+
+
+def course_create_model():
+    return CourseCreateModel(
+        name="Benchmark course {}".format(next(sequence)),
+        price=9.99,
+        language="English",
+        country="Argentina",
+        description="Learn how to measure things",
+        categories=["Programming", "Python"],
+    )
+
+
+def test_create_course(benchmark, session_factory):
+    course = benchmark(
+        lambda: run_command(
+            session_factory,
+            lambda c: c.create_course(course_create_model(), "creator_bench"),
+        )
+    )
+
+    assert course.creator_id == "creator_bench"
+
+
+def test_update_course(benchmark, session_factory, catalog):
+    id = catalog.courses[0]["id"]
+    categories = (["Programming", "Go"], ["Programming", "Python"])
+
+    def update():
+        n = next(sequence)
+        data = CourseUpdateModel(
+            description="Updated {}".format(n), categories=categories[n % 2]
+        )
+        return run_command(session_factory, lambda c: c.update_course(id, data))
+
+    course = benchmark(update)
+
+    assert course.id == id
+
+
+def test_delete_course(benchmark, session_factory):
+    def setup():
+        course = run_command(
+            session_factory,
+            lambda c: c.create_course(course_create_model(), "creator_bench"),
+        )
+        return (course.id,), {}
+
+    benchmark.pedantic(
+        lambda id: run_command(session_factory, lambda c: c.delete_course_by_id(id)),
+        setup=setup,
+        rounds=50,
+    )
+
+
+def test_add_collab(benchmark, session_factory, catalog):
+    id = catalog.courses[1]["id"]
+
+    collab = benchmark(
+        lambda: run_command(
+            session_factory,
+            lambda c: c.add_collab(id, "user_bench_{}".format(next(sequence))),
+        )
+    )
+
+    assert collab.course_id == id
+
+
+def test_deactivate_collab(benchmark, session_factory, catalog):
+    collab = catalog.collabs[0]
+
+    benchmark(
+        lambda: run_command(
+            session_factory,
+            lambda c: c.deactivate_collab_from_course(
+                collab["user_id"], collab["course_id"]
+            ),
+        )
+    )
+
+
+def test_add_content(benchmark, session_factory, catalog):
+    id = catalog.courses[2]["id"]
+
+    def add():
+        data = ContentCreateModel(
+            title="Benchmark content",
+            chapter=1000,
+            order=next(sequence),
+            description="Measured",
+            video="https://example.com/bench.mp4",
+            image="",
+        )
+        return run_command(session_factory, lambda c: c.add_content(data, id))
+
+    content = benchmark(add)
+
+    assert content.chapter == 1000
+
+
+def test_update_content(benchmark, session_factory, catalog):
+    content = catalog.content[0]
+
+    def update():
+        data = ContentUpdateModel(title="Updated {}".format(next(sequence)))
+        return run_command(
+            session_factory,
+            lambda c: c.update_content(content["course_id"], data, content["id"]),
+        )
+
+    updated = benchmark(update)
+
+    assert updated.id == content["id"]
+
+
+def test_add_review(benchmark, session_factory, catalog):
+    id = catalog.courses[3]["id"]
+
+    def add():
+        data = ReviewCreateModel(
+            id="user_bench_{}".format(next(sequence)),
+            recommended=True,
+            review="Measured",
+        )
+        return run_command(session_factory, lambda c: c.add_review(id, data))
+
+    review = benchmark(add)
+
+    assert review.course_id == id
@@ -3,8 +3,15 @@ from logging import config
 
 from fastapi import FastAPI
 
-from app.infrastructure.database import create_tables
-from routes import collabs, content, courses, metrics, reviews
+from app.infrastructure.database import get_engine
+from app.infrastructure.migrations import SCHEMA_VERSION, verify_schema_version
+from app.infrastructure.monitoring import sampling_trigger
+from app.presentation.middleware.metrics_middleware import MetricsMiddleware
+from app.presentation.middleware.profiling_middleware import ProfilingMiddleware
+from app.presentation.middleware.query_stats_middleware import QueryStatsMiddleware
+from app.presentation.middleware.tracing_middleware import TracingMiddleware
+from routes import collabs, content, courses, metrics, monitoring, reviews
+from routes.dependencies import valid_admin_token
 
 try:
     config.fileConfig("logging.conf", disable_existing_loggers=False)
@@ -14,11 +21,26 @@ except KeyError as e:
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="courses")
+app.add_middleware(ProfilingMiddleware, authorize=valid_admin_token)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
+
+@app.on_event("startup")
+def check_schema_version():
+    version = verify_schema_version(get_engine(), SCHEMA_VERSION)
+    logger.info("Database schema version %s", version)
+
+
+@app.on_event("startup")
+def watch_sampling_trigger():
+    sampling_trigger.start()
 
-create_tables()
 
 app.include_router(courses.router)
 app.include_router(collabs.router)
 app.include_router(reviews.router)
 app.include_router(content.router)
 app.include_router(metrics.router)
+app.include_router(monitoring.router)
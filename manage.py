@@ -0,0 +1,47 @@
+import argparse
+import logging
+from logging import config
+
+from app.infrastructure.course import rebuild_course_metrics
+from app.infrastructure.database import get_engine
+from app.infrastructure.migrations import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    current_version,
+    migrate,
+)
+
+try:
+    config.fileConfig("logging.conf", disable_existing_loggers=False)
+except KeyError as e:
+    pass
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Courses service management")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="apply pending database migrations")
+    commands.add_parser("schema-version", help="show the database schema version")
+    commands.add_parser(
+        "rebuild-metrics", help="recompute the course metrics rollups from scratch"
+    )
+    args = parser.parse_args(argv)
+    engine = get_engine()
+
+    if args.command == "migrate":
+        version = migrate(engine, MIGRATIONS)
+        logger.info("Database schema at version %s", version)
+    elif args.command == "schema-version":
+        print(
+            "database: {}, expected: {}".format(current_version(engine), SCHEMA_VERSION)
+        )
+    elif args.command == "rebuild-metrics":
+        with engine.begin() as connection:
+            rebuild_course_metrics(connection)
+        logger.info("Course metrics rollups rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,12 +20,12 @@ from app.presentation.schema.course.course_error_message import (
 )
 from app.usecase.collab.collab_query_model import CollabReadModel, UserReadModel
 from app.usecase.collab.collab_query_usecase import CollabQueryUseCase
-from app.usecase.course import CourseCommandUseCase, CourseQueryUseCase
+from app.usecase.course import CourseCommandUseCase, CoursePermissionUseCase
 
 from .dependencies import (
     check_user_creator_permission,
     course_command_usecase,
-    course_query_usecase,
+    course_permission_usecase,
     get_users,
     user_query_usecase,
 )
@@ -54,10 +54,10 @@ async def add_collab(
     uid: str,
     user_id: str,
     command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
-    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
 ):
     try:
-        check_user_creator_permission(cid=id, uid=uid, query=query_usecase)  # type: ignore
+        check_user_creator_permission(cid=id, uid=uid, permission=permission_usecase)
         collab = command_usecase.add_collab(course_id=id, user_id=user_id)
     except UserAlreadyInCourseError as e:
         raise HTTPException(
@@ -98,11 +98,13 @@ async def deactivate_collab(
     user_id: str,
     uid: str,
     course_command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
-    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
 ):
     try:
         if user_id != uid:
-            check_user_creator_permission(cid=id, uid=uid, query=query_usecase)  # type: ignore
+            check_user_creator_permission(
+                cid=id, uid=uid, permission=permission_usecase
+            )
         course_command_usecase.deactivate_collab_from_course(user_id, id)
     except CourseNotFoundError as e:
         raise HTTPException(
@@ -145,7 +147,7 @@ async def get_course_collabs(
         server_response = get_users(collabs, request, limit, offset)
 
     except NoCollabsInCourseError as e:
-        logger.info(e)
+        logger.debug(e)
         return []
     except CourseNotFoundError as e:
         raise HTTPException(
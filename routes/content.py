@@ -10,6 +10,7 @@ from app.domain.content.content_exception import (
     ContentNotFoundError,
 )
 from app.domain.course import CourseNotFoundError
+from app.presentation.response.json_response import trusted_json_response
 from app.presentation.schema.content.content_error_message import (
     ErrorMessageChapterAlreadyInCourse,
 )
@@ -21,12 +22,17 @@ from app.usecase.content.content_command_model import (
     ContentUpdateModel,
 )
 from app.usecase.content.content_query_model import ChapterReadModel, ContentReadModel
-from app.usecase.course import CourseCommandUseCase, CourseQueryUseCase
+from app.usecase.course import (
+    CourseCommandUseCase,
+    CoursePermissionUseCase,
+    CourseQueryUseCase,
+)
 
 from .dependencies import (
     check_user_creator_permission,
     check_user_involved_in_course,
     course_command_usecase,
+    course_permission_usecase,
     course_query_usecase,
 )
 
@@ -54,10 +60,10 @@ async def add_content(
     id: str,
     uid: str,
     course_command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
-    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
 ):
     try:
-        check_user_creator_permission(cid=id, uid=uid, query=query_usecase)  # type: ignore
+        check_user_creator_permission(cid=id, uid=uid, permission=permission_usecase)
         content = course_command_usecase.add_content(data=data, course_id=id)
     except CourseNotFoundError as e:
         raise HTTPException(
@@ -97,11 +103,11 @@ async def add_content(
 async def get_content(
     id: str,
     uid: str,
-    command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
     query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
 ):
     try:
-        check_user_involved_in_course(cid=id, uid=uid, command=command_usecase)  # type: ignore
+        check_user_involved_in_course(cid=id, uid=uid, permission=permission_usecase)
         content = query_usecase.fetch_content_by_id(id)
 
     except CourseNotFoundError as e:
@@ -120,7 +126,7 @@ async def get_content(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    return content
+    return trusted_json_response(content)
 
 
 @router.patch(
@@ -143,10 +149,10 @@ async def update_content(
     data: ContentUpdateModel,
     uid: str,
     course_command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
-    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
 ):
     try:
-        check_user_creator_permission(cid=id, uid=uid, query=query_usecase)  # type: ignore
+        check_user_creator_permission(cid=id, uid=uid, permission=permission_usecase)
         updated_content = course_command_usecase.update_content(
             course_id=id, data=data, content_id=content_id
         )
@@ -3,7 +3,7 @@ import logging
 from typing import List, Optional
 
 import requests
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from starlette import status
 from starlette.responses import Response
 
@@ -17,22 +17,33 @@ from app.domain.course.course_exception import (
     CategoriesNotFoundError,
     NotEnoughFundsError,
 )
+from app.infrastructure import microservice_client
+from app.infrastructure.course.course_category_cache import CATEGORY_LIST_TTL_SECONDS
+from app.presentation.response.etag import etag, etag_matches
+from app.presentation.response.json_response import trusted_json_response
 from app.presentation.schema.course.course_error_message import (
     ErrorMessageCourseNameAlreadyExists,
     ErrorMessageCourseNotFound,
 )
 from app.usecase.course import (
+    CategoryMatch,
     CourseCommandUseCase,
     CourseCreateModel,
+    CoursePermissionUseCase,
     CourseQueryUseCase,
     CourseReadModel,
     CourseUpdateModel,
+    Facet,
+)
+from app.usecase.course.course_query_model import (
+    FacetedCourseReadModel,
+    PaginatedCourseReadModel,
 )
-from app.usecase.course.course_query_model import PaginatedCourseReadModel
 
 from .dependencies import (
     check_user_creator_permission,
     course_command_usecase,
+    course_permission_usecase,
     course_query_usecase,
     microservices,
 )
@@ -95,14 +106,18 @@ async def get_courses(
         )
 
     if len(courses) == 0:
-        logger.info(CoursesNotFoundError.message)
+        logger.debug(CoursesNotFoundError.message)
 
-    return PaginatedCourseReadModel(courses=courses, count=count)
+    return trusted_json_response(
+        PaginatedCourseReadModel.construct(courses=courses, count=count)
+    )
 
 
 @router.get(
     "/courses/",
-    response_model=PaginatedCourseReadModel,
+    response_model=FacetedCourseReadModel,
+    # Pages without facets leave them unset, so they have no facets key.
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
     tags=["courses"],
 )
@@ -114,12 +129,20 @@ async def get_courses_filtering(
     subscription_id: Optional[int] = None,
     inactive_courses: Optional[bool] = False,
     inactive_collab: Optional[bool] = False,
-    category: Optional[str] = None,
-    language: Optional[str] = None,
-    country: Optional[str] = None,
+    category: Optional[List[str]] = Query(None),
+    category_match: CategoryMatch = CategoryMatch.ANY,
+    language: Optional[List[str]] = Query(None),
+    country: Optional[List[str]] = Query(None),
     free: Optional[bool] = False,
     paid: Optional[bool] = False,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    created_from: Optional[int] = None,
+    created_to: Optional[int] = None,
+    updated_from: Optional[int] = None,
+    updated_to: Optional[int] = None,
     text: Optional[str] = None,
+    facets: Optional[List[Facet]] = Query(None),
     limit: int = 50,
     offset: int = 0,
     query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
@@ -128,7 +151,7 @@ async def get_courses_filtering(
         if not free and not paid:
             free = not free
             paid = not paid
-        courses, count = query_usecase.fetch_courses_by_filters(
+        courses, count, facet_counts = query_usecase.fetch_courses_by_filters(
             ids=ids,
             name=name,
             creator_id=creator_id,
@@ -142,6 +165,14 @@ async def get_courses_filtering(
             ignore_free=not free,
             ignore_paid=not paid,
             text=text,
+            facets=facets,
+            category_match=category_match,
+            min_price=min_price,
+            max_price=max_price,
+            created_from=created_from,
+            created_to=created_to,
+            updated_from=updated_from,
+            updated_to=updated_to,
             limit=limit,
             offset=offset,
         )
@@ -153,9 +184,17 @@ async def get_courses_filtering(
         )
 
     if courses is None or len(courses) == 0:
-        logger.info(CoursesNotFoundError.message)
+        logger.debug(CoursesNotFoundError.message)
 
-    return PaginatedCourseReadModel(courses=courses, count=count)
+    if facet_counts is None:
+        return trusted_json_response(
+            PaginatedCourseReadModel.construct(courses=courses, count=count)
+        )
+    return trusted_json_response(
+        FacetedCourseReadModel.construct(
+            courses=courses, count=count, facets=facet_counts
+        )
+    )
 
 
 @router.get(
@@ -187,7 +226,7 @@ async def get_course(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    return course
+    return trusted_json_response(course)
 
 
 @router.patch(
@@ -198,6 +237,9 @@ async def get_course(
         status.HTTP_404_NOT_FOUND: {
             "model": ErrorMessageCourseNotFound,
         },
+        status.HTTP_409_CONFLICT: {
+            "model": ErrorMessageCourseNameAlreadyExists,
+        },
     },
     tags=["courses"],
 )
@@ -206,16 +248,21 @@ async def update_course(
     uid: str,
     data: CourseUpdateModel,
     command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
-    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
 ):
     try:
-        check_user_creator_permission(cid=id, uid=uid, query=query_usecase)  # type: ignore
+        check_user_creator_permission(cid=id, uid=uid, permission=permission_usecase)
         updated_course = command_usecase.update_course(id, data)
     except CourseNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
+    except CourseNameAlreadyExistsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message,
+        )
     except UserIsNotCreatorError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -233,13 +280,12 @@ async def update_course(
 def check_cancel_fee(c, id):
     url_subs: str = microservices.get("subscriptions")  # type: ignore
     url_payments: str = microservices.get("payments")  # type: ignore
-    wallet = requests.get(url_payments + "payments/wallet/" + c.creator_id)
-    cancel_fee = requests.get(
+    wallet = microservice_client.get(url_payments + "payments/wallet/" + c.creator_id)
+    cancel_fee = microservice_client.get(
         url_subs + "subscriptions/" + id + "/enrollments/cancel-fee",
         params={"creator_id": c.creator_id, "price": c.price, "sub_id": c.subscription_id},  # type: ignore
     )
-    logger.info(wallet.text)
-    logger.info(cancel_fee.text)
+    logger.debug("wallet=%s cancel_fee=%s", wallet.text, cancel_fee.text)
     if float(json.loads(wallet.text)["balance"]) <= float(json.loads(cancel_fee.text)):
         raise NotEnoughFundsError
 
@@ -260,9 +306,10 @@ async def delete_course(
     response: Response,
     command_usecase: CourseCommandUseCase = Depends(course_command_usecase),
     query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+    permission_usecase: CoursePermissionUseCase = Depends(course_permission_usecase),
 ):
     try:
-        check_user_creator_permission(cid=id, uid=uid, query=query_usecase)  # type: ignore
+        check_user_creator_permission(cid=id, uid=uid, permission=permission_usecase)
         c = query_usecase.fetch_course_by_id(id)
         if c is None:
             raise CourseNotFoundError
@@ -272,7 +319,7 @@ async def delete_course(
         url_subs: str = microservices.get("subscriptions")  # type: ignore
 
         try:
-            requests.patch(
+            microservice_client.patch(
                 url_subs + "subscriptions/" + id + "/enrollments",
                 params={
                     "course_name": c.name,
@@ -315,6 +362,8 @@ async def delete_course(
     tags=["courses"],
 )
 async def get_categories(
+    request: Request,
+    response: Response,
     course_query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
 ):
     try:
@@ -327,6 +376,13 @@ async def get_categories(
         )
 
     if len(categories) == 0:
-        logger.info(CategoriesNotFoundError.message)
-
+        logger.debug(CategoriesNotFoundError.message)
+
+    headers = {
+        "Cache-Control": f"public, max-age={int(CATEGORY_LIST_TTL_SECONDS)}",
+        "ETag": etag(categories),
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return categories
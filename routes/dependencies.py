@@ -1,20 +1,25 @@
-import ast
+import hmac
 import logging
 import os
-from typing import Iterator
+from typing import Iterator, Optional
 
-import requests
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException
 from requests import Session
+from starlette import status
 
 from app.domain.collab.collab_exception import UserIsNotCreatorError
 from app.domain.course import CourseRepository
+from app.infrastructure import microservice_client
 from app.infrastructure.course import (
     CourseCommandUseCaseUnitOfWorkImpl,
+    CourseIdentityMap,
+    CoursePermissionServiceImpl,
     CourseQueryServiceImpl,
     CourseRepositoryImpl,
 )
 from app.infrastructure.database import SessionLocal
+from app.infrastructure.microservice_client import microservices
+from app.infrastructure.monitoring import traced
 from app.usecase.collab.collab_query_usecase import (
     CollabQueryUseCase,
     CollabQueryUseCaseImpl,
@@ -23,6 +28,9 @@ from app.usecase.course import (
     CourseCommandUseCase,
     CourseCommandUseCaseImpl,
     CourseCommandUseCaseUnitOfWork,
+    CoursePermissionService,
+    CoursePermissionUseCase,
+    CoursePermissionUseCaseImpl,
     CourseQueryService,
     CourseQueryUseCase,
     CourseQueryUseCaseImpl,
@@ -30,6 +38,8 @@ from app.usecase.course import (
 
 logger = logging.getLogger(__name__)
 
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
 
 def get_session() -> Iterator[Session]:
     session: Session = SessionLocal()
@@ -39,31 +49,49 @@ def get_session() -> Iterator[Session]:
         session.close()
 
 
-def course_query_usecase(session: Session = Depends(get_session)) -> CourseQueryUseCase:
-    course_query_service: CourseQueryService = CourseQueryServiceImpl(session)
-    return CourseQueryUseCaseImpl(course_query_service)
+def course_identity_map(session: Session = Depends(get_session)) -> CourseIdentityMap:
+    return CourseIdentityMap(session)
+
+
+def course_query_usecase(
+    session: Session = Depends(get_session),
+    identity_map: CourseIdentityMap = Depends(course_identity_map),
+) -> CourseQueryUseCase:
+    course_query_service: CourseQueryService = CourseQueryServiceImpl(
+        session, identity_map
+    )
+    return traced(CourseQueryUseCaseImpl(course_query_service))
+
+
+def user_query_usecase(
+    session: Session = Depends(get_session),
+    identity_map: CourseIdentityMap = Depends(course_identity_map),
+) -> CollabQueryUseCase:
+    course_query_service: CourseQueryService = CourseQueryServiceImpl(
+        session, identity_map
+    )
+    return traced(CollabQueryUseCaseImpl(course_query_service))
 
 
-def user_query_usecase(session: Session = Depends(get_session)) -> CollabQueryUseCase:
-    course_query_service: CourseQueryService = CourseQueryServiceImpl(session)
-    return CollabQueryUseCaseImpl(course_query_service)
+def course_permission_usecase(
+    session: Session = Depends(get_session),
+) -> CoursePermissionUseCase:
+    course_permission_service: CoursePermissionService = CoursePermissionServiceImpl(
+        session
+    )
+    return traced(CoursePermissionUseCaseImpl(course_permission_service))
 
 
 def course_command_usecase(
     session: Session = Depends(get_session),
+    identity_map: CourseIdentityMap = Depends(course_identity_map),
 ) -> CourseCommandUseCase:
-    course_repository: CourseRepository = CourseRepositoryImpl(session)
+    course_repository: CourseRepository = CourseRepositoryImpl(session, identity_map)
     uow: CourseCommandUseCaseUnitOfWork = CourseCommandUseCaseUnitOfWorkImpl(
-        session, course_repository=course_repository
+        session, course_repository=course_repository, identity_map=identity_map
     )
-    return CourseCommandUseCaseImpl(uow)
-
-
-try:
-    m: str = os.environ["MICROSERVICES"]
-    microservices: dict = ast.literal_eval(m)
-except KeyError as e:
-    microservices = {}  # type: ignore
+    # The unit of work is traced too so a slow commit shows up on its own.
+    return traced(CourseCommandUseCaseImpl(traced(uow)))
 
 
 def get_users(uids, request, limit, offset):
@@ -71,19 +99,38 @@ def get_users(uids, request, limit, offset):
     ids = ""
     for i in uids:
         ids = ids + i + ","
-    logger.info(uids)
-    return requests.get(
+    logger.debug("Fetching %d users", len(uids))
+    return microservice_client.get(
         microservices.get("users") + "users/filter-by-ids",
         headers=h,
         params={"ids": ids[:-1], "limit": limit, "offset": offset},
     )
 
 
-def check_user_involved_in_course(cid: str, uid: str, command: CourseCommandUseCase):
-    if not command.user_involved(course_id=cid, user_id=uid):
+def check_user_involved_in_course(
+    cid: str, uid: str, permission: CoursePermissionUseCase
+):
+    if not permission.user_involved(course_id=cid, user_id=uid):
         logger.info("User not creator")
 
 
-def check_user_creator_permission(cid: str, uid: str, query: CourseQueryUseCase):
-    if not query.user_is_creator(course_id=cid, user_id=uid):
+def check_user_creator_permission(
+    cid: str, uid: str, permission: CoursePermissionUseCase
+):
+    if not permission.user_is_creator(course_id=cid, user_id=uid):
         raise UserIsNotCreatorError
+
+
+def valid_admin_token(token: Optional[str]) -> bool:
+    # Admin endpoints stay closed unless ADMIN_TOKEN is configured.
+    return bool(
+        ADMIN_TOKEN and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+    )
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    if not valid_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Admin-Token header is required.",
+        )
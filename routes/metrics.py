@@ -1,18 +1,35 @@
 import logging
+from datetime import date
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 
+from app.domain.course.course_exception import (
+    InvalidTimeRangeError,
+    UnknownTimeZoneError,
+)
+from app.presentation.schema.course.course_error_message import (
+    ErrorMessageInvalidTimeRange,
+)
 from app.usecase.course import CourseQueryUseCase
+from app.usecase.metrics.catalog_metrics_query_model import CatalogMetricsReadModel
 from app.usecase.metrics.category_metrics_query_model import (
     PaginatedCategoryMetricsReadModel,
 )
 from app.usecase.metrics.new_courses_metrics_query_model import (
     NewCoursesMetricsReadModel,
 )
+from app.usecase.metrics.recommendation_metrics_query_model import (
+    RecommendationTimeSeriesReadModel,
+)
 from app.usecase.metrics.subscriptions_metrics_query_model import (
     SubscriptionMetricsReadModel,
 )
+from app.usecase.metrics.time_buckets import Granularity
+from app.usecase.metrics.time_series_metrics_query_model import (
+    TimeSeriesMetricsReadModel,
+)
 
 from .dependencies import course_query_usecase
 
@@ -84,3 +101,107 @@ async def get_subscriptions_metrics(
         )
 
     return metrics
+
+
+@router.get(
+    "/courses/metrics/timeseries",
+    response_model=TimeSeriesMetricsReadModel,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorMessageInvalidTimeRange,
+        },
+    },
+    tags=["metrics"],
+)
+async def get_time_series_metrics(
+    start: date,
+    end: date,
+    granularity: Granularity = Granularity.MONTH,
+    timezone: str = "UTC",
+    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+):
+    try:
+        metrics = query_usecase.get_time_series_metrics(
+            start=start, end=end, granularity=granularity, timezone=timezone
+        )
+
+    except (InvalidTimeRangeError, UnknownTimeZoneError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    return metrics
+
+
+@router.get(
+    "/courses/metrics/catalog",
+    response_model=CatalogMetricsReadModel,
+    status_code=status.HTTP_200_OK,
+    tags=["metrics"],
+)
+async def get_catalog_metrics(
+    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+):
+    try:
+        metrics = query_usecase.get_catalog_metrics()
+
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    return metrics
+
+
+@router.get(
+    "/courses/metrics/recommendations",
+    response_model=RecommendationTimeSeriesReadModel,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorMessageInvalidTimeRange,
+        },
+    },
+    tags=["metrics"],
+)
+async def get_recommendation_metrics(
+    start: date,
+    end: date,
+    granularity: Granularity = Granularity.MONTH,
+    timezone: str = "UTC",
+    course_id: Optional[str] = None,
+    creator_id: Optional[str] = None,
+    category: Optional[str] = None,
+    query_usecase: CourseQueryUseCase = Depends(course_query_usecase),
+):
+    try:
+        metrics = query_usecase.get_recommendation_metrics(
+            start=start,
+            end=end,
+            granularity=granularity,
+            timezone=timezone,
+            course_id=course_id,
+            creator_id=creator_id,
+            category=category,
+        )
+
+    except (InvalidTimeRangeError, UnknownTimeZoneError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    return metrics
@@ -0,0 +1,71 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette import status
+from starlette.responses import PlainTextResponse, Response
+
+from app.infrastructure.monitoring import (
+    registry,
+    render_collapsed,
+    request_profiles,
+    sampling_trigger,
+    slow_query_log,
+)
+
+from .dependencies import require_admin_token
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False,
+)
+def get_operational_metrics():
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get(
+    "/admin/slow-queries",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False,
+)
+def get_slow_queries():
+    return [query.to_dict() for query in slow_query_log.worst()]
+
+
+@router.get(
+    "/admin/profiles/{id}",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False,
+)
+def get_request_profile(id: str):
+    profile = request_profiles.get(id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found."
+        )
+    return PlainTextResponse(profile)
+
+
+@router.post(
+    "/admin/profiles/samples",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False,
+)
+async def sample_stacks(seconds: int = Query(10, ge=1, le=60)):
+    id = sampling_trigger.request(seconds)
+    # Give every worker time to notice the trigger and write its samples.
+    await asyncio.sleep(seconds + 2 * sampling_trigger.poll_interval)
+    counts = sampling_trigger.collect(id)
+    return PlainTextResponse(
+        render_collapsed(counts),
+        headers={"Content-Disposition": f'attachment; filename="{id}.collapsed"'},
+    )
@@ -0,0 +1,26 @@
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.migrations import MIGRATIONS, migrate
+
+
+@pytest.fixture
+def db_session() -> Iterator[Session]:
+    # A fresh in-memory database with every migration applied. It keeps one
+    # connection so routes served by TestClient's thread see the same data.
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    migrate(engine, MIGRATIONS)
+    session = Session(bind=engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -80,6 +80,28 @@ class TestCourse:
 
         assert course_1 == course_2
         assert course_1 != course_3
+        assert len({course_1, course_2, course_3}) == 2
+
+    def test_course_entity_should_not_accept_undeclared_attributes(self):
+        course = Course(
+            id="course_1",
+            creator_id="creator_1",
+            name="C Programming For Beginners - Master the C Language",
+            price=10,
+            language="English",
+            country="Argentina",
+            description="This is a course",
+            categories=["Programming"],
+            presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            image="https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg",
+            subscription_id=0,
+            recommendations={},
+            active=True,
+        )
+
+        assert not hasattr(course, "__dict__")
+        with pytest.raises(AttributeError):
+            course.title = "C Programming"  # type: ignore
 
     @pytest.mark.parametrize(
         "price",
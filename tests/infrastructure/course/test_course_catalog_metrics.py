@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl, CourseRepositoryImpl
+from app.infrastructure.course.course_catalog_metrics import (
+    CatalogMetricsCache,
+    catalog_breakdown_statement,
+    catalog_metrics_cache,
+    price_band_labels,
+)
+from tests.parameters import new_course
+
+
+@pytest.fixture
+def session(db_session: Session) -> Session:
+    repository = CourseRepositoryImpl(db_session)
+    catalog = [
+        ("English", "Argentina", 0),
+        ("English", "Uruguay", 9.99),
+        ("Spanish", "Argentina", 10),
+        ("English", "Argentina", 150),
+    ]
+    for i, (language, country, price) in enumerate(catalog):
+        repository.create(
+            new_course(
+                "course_{}".format(i), price=price, language=language, country=country
+            )
+        )
+    repository.delete_by_id("course_3")
+    db_session.commit()
+    return db_session
+
+
+class TestCourseCatalogMetrics:
+    def setup_method(self):
+        catalog_metrics_cache.clear()
+
+    def test_should_break_the_catalog_down_in_one_statement(self, session):
+        statements = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        metrics = CourseQueryServiceImpl(session).get_catalog_metrics()
+
+        assert len(statements) == 1
+        assert list(metrics.languages.items()) == [("English", 3), ("Spanish", 1)]
+        assert list(metrics.countries.items()) == [("Argentina", 3), ("Uruguay", 1)]
+        assert metrics.price_bands == {
+            "free": 1,
+            "0-10": 1,
+            "10-25": 1,
+            "25-50": 0,
+            "50-100": 0,
+            "100+": 1,
+        }
+        assert (metrics.active, metrics.inactive) == (3, 1)
+        assert (metrics.free, metrics.paid) == (1, 3)
+
+    def test_should_serve_the_cached_breakdown_until_it_expires(self, session):
+        service = CourseQueryServiceImpl(session)
+        first = service.get_catalog_metrics()
+        CourseRepositoryImpl(session).delete_by_id("course_0")
+        session.commit()
+        assert service.get_catalog_metrics() is first
+
+        catalog_metrics_cache.clear()
+        assert service.get_catalog_metrics().inactive == 2
+
+    def test_cache_should_expire_after_its_ttl(self):
+        cache = CatalogMetricsCache(ttl=0)
+        cache.put(object())
+
+        assert cache.get() is None
+
+    def test_postgresql_should_group_by_grouping_sets(self):
+        statement = str(
+            catalog_breakdown_statement("postgresql").compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "GROUPING SETS" in statement
+        assert "UNION" not in statement
+        assert price_band_labels()[0] == "free"
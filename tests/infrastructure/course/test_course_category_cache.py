@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import (
+    CourseCommandUseCaseUnitOfWorkImpl,
+    CourseQueryServiceImpl,
+    CourseRepositoryImpl,
+)
+from app.infrastructure.course.course_category_cache import (
+    CategoryListCache,
+    category_list_cache,
+)
+from tests.parameters import new_course
+
+
+@pytest.fixture
+def session(db_session: Session) -> Session:
+    repository = CourseRepositoryImpl(db_session)
+    repository.create(new_course("course_1", categories=["Go", "C"], created_at=0))
+    CourseCommandUseCaseUnitOfWorkImpl(db_session, repository).commit()
+    return db_session
+
+
+def count_statements(session: Session):
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestCategoryListCache:
+    def setup_method(self):
+        category_list_cache.invalidate()
+
+    def test_should_query_the_categories_once(self, session):
+        statements = count_statements(session)
+        service = CourseQueryServiceImpl(session)
+        first = service.find_all_categories()
+        second = service.find_all_categories()
+
+        assert first == second == ["Go", "C"]
+        assert len(statements) == 1
+
+    def test_committed_category_changes_should_invalidate_the_list(self, session):
+        service = CourseQueryServiceImpl(session)
+        repository = CourseRepositoryImpl(session)
+        unit_of_work = CourseCommandUseCaseUnitOfWorkImpl(session, repository)
+        assert service.find_all_categories() == ["Go", "C"]
+
+        repository.create(new_course("course_2", categories=["Rust"], created_at=0))
+        unit_of_work.commit()
+
+        assert service.find_all_categories() == ["Go", "C", "Rust"]
+
+    def test_commits_without_category_changes_should_keep_the_list(self, session):
+        service = CourseQueryServiceImpl(session)
+        repository = CourseRepositoryImpl(session)
+        unit_of_work = CourseCommandUseCaseUnitOfWorkImpl(session, repository)
+        service.find_all_categories()
+        version = category_list_cache.version
+
+        repository.create(new_course("course_2", categories=[], created_at=0))
+        unit_of_work.commit()
+
+        assert category_list_cache.version == version
+
+    def test_rolled_back_changes_should_keep_the_list(self, session):
+        repository = CourseRepositoryImpl(session)
+        unit_of_work = CourseCommandUseCaseUnitOfWorkImpl(session, repository)
+        version = category_list_cache.version
+
+        repository.create(new_course("course_2", categories=["Rust"], created_at=0))
+        unit_of_work.rollback()
+        unit_of_work.commit()
+
+        assert category_list_cache.version == version
+
+    def test_list_read_before_an_invalidation_should_not_be_stored(self):
+        cache = CategoryListCache()
+        version = cache.version
+        cache.invalidate()
+        cache.put(version, ["Go"])
+
+        assert cache.get() is None
+
+    def test_list_should_expire_after_its_ttl(self):
+        cache = CategoryListCache(ttl=0)
+        cache.put(cache.version, ["Go"])
+
+        assert cache.get() is None
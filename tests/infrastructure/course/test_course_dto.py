@@ -1,6 +1,6 @@
 from app.domain.course import Course
 from app.infrastructure.course import CourseDTO
-from app.infrastructure.course.course_dto import Category
+from app.infrastructure.course.course_dto import Category, Content
 
 
 class TestCourseDTO:
@@ -14,7 +14,7 @@ class TestCourseDTO:
             language="English",
             country="Argentina",
             description="This is a course",
-            categories=[Category(category="Programing")],
+            categories=[Category(name="Programing")],
             presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             image="https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg",
             created_at=1614007224642,
@@ -46,7 +46,7 @@ class TestCourseDTO:
             language="English",
             country="Argentina",
             description="This is a course",
-            categories=[Category(category="Programing"), Category(category="Beginner")],
+            categories=[Category(name="Programing"), Category(name="Beginner")],
             presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             image="https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg",
             created_at=1614007224642,
@@ -69,7 +69,7 @@ class TestCourseDTO:
         assert course.created_at == 1614007224642
         assert course.updated_at == 9999994444444
 
-    def test_from_entity_should_create_dto_instance_inits_created_at_updated_at(self):
+    def test_from_entity_should_not_change_the_entity(self):
         course = Course(
             id="course_1",
             creator_id="creator_1",
@@ -94,8 +94,12 @@ class TestCourseDTO:
         assert course_dto.price == 10
         assert course_dto.language == "English"
         assert course_dto.description == "This is a course"
-        assert course_dto.created_at == course_dto.updated_at
-        assert course_dto.get_categories() == ["Programing", "Beginner"]
+        # The repository stamps new courses; the mapper only copies fields.
+        assert course.created_at is None
+        assert course.updated_at is None
+        assert course_dto.created_at is None
+        # The repository links the categories once the course row exists.
+        assert course_dto.get_categories() == []
         assert (
             course_dto.presentation_video
             == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
@@ -129,7 +133,8 @@ class TestCourseDTO:
         assert course_dto.language == "English"
         assert course_dto.description == "This is a course"
         assert course_dto.created_at == 1614007224642
-        assert course_dto.get_categories() == ["Programing"]
+        # The repository links the categories once the course row exists.
+        assert course_dto.get_categories() == []
         assert (
             course_dto.presentation_video
             == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
@@ -138,3 +143,21 @@ class TestCourseDTO:
             course_dto.image
             == "https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg"
         )
+
+    def test_content_to_read_model_should_convert_stored_chapter_and_order(self):
+        content = Content(
+            id="content_1",
+            title="FFT",
+            course_id="course_1",
+            chapter="2",
+            order="10",
+            description="",
+            video="",
+            image="",
+            active=True,
+        )
+
+        read_model = content.to_read_model()
+
+        assert read_model.chapter == 2
+        assert read_model.order == 10
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl, CourseRepositoryImpl
+from app.infrastructure.course.course_facets import facet_statement
+from app.usecase.course import Facet
+from tests.parameters import NO_FILTERS, new_course
+
+
+@pytest.fixture
+def session(db_session: Session) -> Session:
+    repository = CourseRepositoryImpl(db_session)
+    catalog = [
+        ("English", "Argentina", 0, ["Programming", "C"]),
+        ("English", "Uruguay", 9.99, ["Programming"]),
+        ("Spanish", "Argentina", 30, ["Cooking"]),
+        ("English", "Argentina", 150, ["Programming"]),
+    ]
+    for i, (language, country, price, categories) in enumerate(catalog):
+        repository.create(
+            new_course(
+                "course_{}".format(i),
+                price=price,
+                language=language,
+                country=country,
+                categories=categories,
+            )
+        )
+    repository.delete_by_id("course_3")
+    db_session.commit()
+    return db_session
+
+
+class TestCourseFacets:
+    def test_should_count_facets_and_total_in_one_statement(self, session):
+        statements = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        courses, count, facets = CourseQueryServiceImpl(session).find_by_filters(
+            **NO_FILTERS, facets=list(Facet)
+        )
+
+        # The page, its categories and the facets with the total.
+        assert len(statements) == 3
+        assert len(courses) == count == 3
+        assert facets == {
+            Facet.CATEGORY: {"Programming": 2, "C": 1, "Cooking": 1},
+            Facet.LANGUAGE: {"English": 2, "Spanish": 1},
+            Facet.COUNTRY: {"Argentina": 2, "Uruguay": 1},
+            Facet.PRICE_BAND: {
+                "free": 1,
+                "0-10": 1,
+                "10-25": 0,
+                "25-50": 1,
+                "50-100": 0,
+                "100+": 0,
+            },
+        }
+
+    def test_facets_should_follow_the_filters(self, session):
+        _, count, facets = CourseQueryServiceImpl(session).find_by_filters(
+            **dict(NO_FILTERS, category=["Programming"], inactive_courses=True),
+            facets=[Facet.CATEGORY, Facet.COUNTRY],
+        )
+
+        assert count == 3
+        assert facets == {
+            Facet.CATEGORY: {"Programming": 3, "C": 1},
+            Facet.COUNTRY: {"Argentina": 2, "Uruguay": 1},
+        }
+
+    def test_facets_should_be_empty_when_nothing_matches(self, session):
+        courses, count, facets = CourseQueryServiceImpl(session).find_by_filters(
+            **dict(NO_FILTERS, language=["French"]), facets=[Facet.LANGUAGE]
+        )
+
+        assert (courses, count) == ([], 0)
+        assert facets == {Facet.LANGUAGE: {}}
+
+    def test_without_facets_should_return_none(self, session):
+        _, count, facets = CourseQueryServiceImpl(session).find_by_filters(**NO_FILTERS)
+
+        assert count == 3
+        assert facets is None
+
+    def test_postgresql_should_group_by_grouping_sets(self):
+        statement, _ = facet_statement(
+            "postgresql", [Facet.LANGUAGE, Facet.CATEGORY], []
+        )
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+
+        assert "GROUPING SETS" in sql
+        assert sql.count("filtered_courses AS") == 1
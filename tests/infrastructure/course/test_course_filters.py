@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl, CourseRepositoryImpl
+from app.infrastructure.course.course_dto import CourseDTO
+from app.usecase.course import CategoryMatch
+from tests.parameters import DAY_MS, NO_FILTERS, new_course
+
+
+@pytest.fixture
+def session(db_session: Session) -> Session:
+    repository = CourseRepositoryImpl(db_session)
+    catalog = [
+        ("English", "Argentina", 0, ["Programming", "C"]),
+        ("English", "Uruguay", 9.99, ["Programming"]),
+        ("Spanish", "Argentina", 30, ["Cooking", "C"]),
+        ("French", "France", 150, ["Programming", "C", "Cooking"]),
+    ]
+    for i, (language, country, price, categories) in enumerate(catalog):
+        repository.create(
+            new_course(
+                "course_{}".format(i),
+                price=price,
+                language=language,
+                country=country,
+                categories=categories,
+                created_at=i * DAY_MS,
+            )
+        )
+        db_session.execute(
+            update(CourseDTO)
+            .where(CourseDTO.id == "course_{}".format(i))
+            .values(updated_at=(10 - i) * DAY_MS)
+        )
+    db_session.commit()
+    return db_session
+
+
+def find_ids(session: Session, **filters):
+    courses, count, _ = CourseQueryServiceImpl(session).find_by_filters(
+        **dict(NO_FILTERS, **filters)
+    )
+    assert count == len(courses)
+    return sorted(course.id for course in courses)
+
+
+class TestCourseFilters:
+    def test_should_match_any_of_several_values(self, session):
+        assert find_ids(session, language=["Spanish", "French"]) == [
+            "course_2",
+            "course_3",
+        ]
+        assert find_ids(session, country=["Uruguay", "France"]) == [
+            "course_1",
+            "course_3",
+        ]
+
+    def test_should_match_any_of_the_categories(self, session):
+        ids = find_ids(session, category=["Cooking", "Missing"])
+
+        assert ids == ["course_2", "course_3"]
+
+    def test_should_match_all_of_the_categories(self, session):
+        both = find_ids(
+            session,
+            category=["Programming", "C", "C"],
+            category_match=CategoryMatch.ALL,
+        )
+        missing = find_ids(
+            session,
+            category=["Programming", "Missing"],
+            category_match=CategoryMatch.ALL,
+        )
+
+        assert both == ["course_0", "course_3"]
+        assert missing == []
+
+    def test_should_filter_by_price_range(self, session):
+        assert find_ids(session, min_price=9.99, max_price=30) == [
+            "course_1",
+            "course_2",
+        ]
+        assert find_ids(session, min_price=100) == ["course_3"]
+
+    def test_should_filter_by_created_and_updated_ranges(self, session):
+        created = find_ids(session, created_from=DAY_MS, created_to=2 * DAY_MS)
+        updated = find_ids(session, updated_from=9 * DAY_MS)
+        both = find_ids(session, created_to=2 * DAY_MS, updated_to=9 * DAY_MS)
+
+        assert created == ["course_1", "course_2"]
+        assert updated == ["course_0", "course_1"]
+        assert both == ["course_1", "course_2"]
+
+    def test_should_combine_filters(self, session):
+        ids = find_ids(
+            session,
+            category=["C"],
+            language=["English", "Spanish"],
+            max_price=50,
+            ignore_free=True,
+        )
+
+        assert ids == ["course_2"]
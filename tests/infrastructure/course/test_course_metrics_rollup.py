@@ -0,0 +1,151 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import (
+    CourseDTO,
+    CourseQueryServiceImpl,
+    CourseRepositoryImpl,
+    rebuild_course_metrics,
+)
+from app.infrastructure.course.course_metrics_rollup import ROLLUP_TABLES
+from app.infrastructure.migrations import MIGRATIONS, migrate
+from tests.parameters import new_course
+
+
+def rollups(session: Session):
+    # Buckets that dropped back to zero are kept; a rebuild leaves them out.
+    return [
+        sorted(tuple(row) for row in session.execute(select(table)) if row.courses)
+        for table in ROLLUP_TABLES
+    ]
+
+
+@pytest.fixture
+def session(db_session: Session) -> Session:
+    repository = CourseRepositoryImpl(db_session)
+    repository.create(
+        new_course(
+            "course_1",
+            subscription_id=0,
+            categories=["Programming", "C"],
+            created_at=1614007224642,
+        )
+    )
+    repository.create(
+        new_course(
+            "course_2",
+            subscription_id=1,
+            categories=["Programming"],
+            created_at=1614007224642,
+        )
+    )
+    repository.create(
+        new_course(
+            "course_3",
+            subscription_id=1,
+            categories=["Go"],
+            created_at=1640995200000 + 86400000 * 40,
+        )
+    )
+    db_session.commit()
+    return db_session
+
+
+class TestCourseMetricsRollup:
+    def test_writes_should_keep_rollups_equal_to_a_rebuild(self, session):
+        repository = CourseRepositoryImpl(session)
+        repository.update(
+            "course_1",
+            changes={"subscription_id": 2},
+            categories=["C", "Beginner"],
+        )
+        repository.delete_by_id("course_2")
+        session.commit()
+        maintained = rollups(session)
+
+        rebuild_course_metrics(session.connection())
+        session.commit()
+
+        assert maintained == rollups(session)
+
+    def test_metrics_should_be_read_from_rollups(self, session):
+        query_service = CourseQueryServiceImpl(session)
+
+        categories, count = query_service.get_category_metrics(limit=2)
+        months_2021 = query_service.get_courses_metrics(year=2021).months
+        months = query_service.get_courses_metrics(year=None).months
+        subscriptions = query_service.get_subscription_metrics().subscriptions
+
+        assert [(c.category, c.count) for c in categories] == [
+            ("Programming", 2),
+            ("C", 1),
+        ]
+        assert count == 3
+        assert months_2021 == [0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        assert months == [0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        assert subscriptions == [1, 2, 0]
+
+    def test_rolled_back_writes_should_not_be_counted(self, session):
+        before = rollups(session)
+        repository = CourseRepositoryImpl(session)
+
+        repository.create(
+            new_course(
+                "course_4",
+                subscription_id=2,
+                categories=["Rust"],
+                created_at=1614007224642,
+            )
+        )
+        session.rollback()
+
+        assert rollups(session) == before
+
+    def test_migration_should_backfill_existing_courses(self):
+        engine = create_engine("sqlite://")
+        try:
+            migrate(engine, [m for m in MIGRATIONS if m.version < 4])
+            with Session(bind=engine) as session:
+                session.add_all(
+                    [
+                        CourseDTO.from_entity(
+                            new_course(
+                                "course_1",
+                                subscription_id=0,
+                                categories=["C"],
+                                created_at=0,
+                                updated_at=0,
+                            )
+                        ),
+                        CourseDTO.from_entity(
+                            new_course(
+                                "course_2",
+                                subscription_id=1,
+                                categories=["C"],
+                                created_at=0,
+                                updated_at=0,
+                            )
+                        ),
+                        CourseDTO.from_entity(
+                            new_course(
+                                "course_3",
+                                subscription_id=1,
+                                categories=["Go"],
+                                created_at=0,
+                                updated_at=0,
+                            )
+                        ),
+                    ]
+                )
+                session.commit()
+            migrate(engine, MIGRATIONS)
+
+            with Session(bind=engine) as session:
+                subscriptions = CourseQueryServiceImpl(
+                    session
+                ).get_subscription_metrics()
+        finally:
+            engine.dispose()
+
+        assert subscriptions.subscriptions == [1, 2, 0]
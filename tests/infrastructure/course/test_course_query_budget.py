@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl
+from app.infrastructure.course.course_dto import (
+    Category,
+    CourseCategory,
+    CourseDTO,
+    ReviewDTO,
+)
+from app.infrastructure.monitoring import instrument_engine, query_budget
+
+
+def seed(session: Session, courses: int) -> Session:
+    instrument_engine(session.get_bind())
+    session.add_all([Category(id=1, name="Programming"), Category(id=2, name="C")])
+    for i in range(courses):
+        id = "course_{}".format(i)
+        session.add(
+            CourseDTO(
+                id=id,
+                creator_id="creator_1",
+                name="Course {}".format(i),
+                price=i,
+                active=True,
+                subscription_id=0,
+                language="English",
+                country="Argentina",
+                description="This is a course",
+                presentation_video="",
+                image="",
+                created_at=i,
+                updated_at=i,
+                reviews=[
+                    ReviewDTO(id="user_1", recommended=True, review="", date=i),
+                    ReviewDTO(id="user_2", recommended=False, review="", date=i),
+                ],
+            )
+        )
+        session.add_all(
+            [
+                CourseCategory(course_id=id, category_id=1),
+                CourseCategory(course_id=id, category_id=2),
+            ]
+        )
+    session.commit()
+    return session
+
+
+class TestCourseQueryBudget:
+    def test_find_by_id_should_not_depend_on_related_rows(self, db_session):
+        session = seed(db_session, 1)
+        query_service = CourseQueryServiceImpl(session)
+
+        with query_budget(2):
+            course = query_service.find_by_id("course_0")
+
+        assert course.recommendations == {"recommended": 1, "total": 2}
+
+    def test_find_all_should_not_issue_a_query_per_course(self, db_session):
+        session = seed(db_session, 10)
+        query_service = CourseQueryServiceImpl(session)
+
+        with query_budget(3):
+            courses, count = query_service.find_all(limit=50)
+
+        assert count == 10
+        assert all(c.categories == ["Programming", "C"] for c in courses)
+
+    def test_find_by_filters_should_not_issue_a_query_per_course(self, db_session):
+        session = seed(db_session, 10)
+        query_service = CourseQueryServiceImpl(session)
+
+        with query_budget(3):
+            courses, count, _ = query_service.find_by_filters(
+                ids=None,
+                name=None,
+                creator_id="creator_1",
+                collab_id=None,
+                subscription_id=None,
+                inactive_courses=False,
+                inactive_collab=False,
+                category=["C"],
+                language=None,
+                country=None,
+                ignore_free=False,
+                ignore_paid=False,
+                text="course",
+                limit=50,
+            )
+
+        assert count == 10
+        assert len(courses) == 10
@@ -1,15 +1,21 @@
 from unittest.mock import MagicMock, Mock
 
 import pytest
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.exc import IntegrityError, NoResultFound
 
 from app.domain.course import CourseNameAlreadyExistsError, CourseNotFoundError
-from app.infrastructure.course import CourseDTO, CourseRepositoryImpl
+from app.infrastructure.course import (
+    CourseDTO,
+    CourseQueryServiceImpl,
+    CourseRepositoryImpl,
+)
 from tests.parameters import (
+    CategoryRow,
     course_1,
+    course_row_1,
     mock_filter_course_1,
     mock_filter_course_1_name,
-    mock_filter_course_1_update,
+    new_course,
 )
 
 
@@ -35,9 +41,9 @@ class TestCourseRepository:
             id="cPqw4yPVUM3fA9sqzpZmkL"
         )
 
-    def test_find_by_id_should_throw_no_result_found(self):
+    def test_find_by_id_should_return_none_when_course_does_not_exist(self):
         session = MagicMock()
-        session.query(CourseDTO).filter_by = Mock(side_effect=NoResultFound)
+        session.query(CourseDTO).filter_by().first = Mock(return_value=None)
         course_repository = CourseRepositoryImpl(session)
 
         courses = course_repository.find_by_id("cPqw4yPVUM3fA9sqzpZmkL")
@@ -89,6 +95,21 @@ class TestCourseRepository:
 
         session.add.assert_called_once()
 
+    def test_create_should_stamp_new_courses(self):
+        session = MagicMock()
+        course = new_course("course_1")
+        course_repository = CourseRepositoryImpl(session)
+
+        course_repository.create(course)
+
+        stored = session.add.call_args[0][0]
+        assert course.created_at is not None
+        assert course.updated_at == course.created_at
+        assert (stored.created_at, stored.updated_at) == (
+            course.created_at,
+            course.updated_at,
+        )
+
     def test_create_should_throw_course_already_exists_error(self):
         session = MagicMock()
         session.add = Mock(side_effect=CourseNameAlreadyExistsError)
@@ -98,25 +119,79 @@ class TestCourseRepository:
             course_repository.create(course_1)
         session.add.assert_called_once()
 
-    def test_update_should_update_correct_course(self):
+    def test_create_should_throw_course_already_exists_error_on_name_conflict(self):
         session = MagicMock()
-        session.query(CourseDTO).filter_by = Mock(
-            side_effect=mock_filter_course_1_update
+        session.flush = Mock(
+            side_effect=IntegrityError(
+                "INSERT INTO courses",
+                {},
+                Exception("UNIQUE constraint failed: index 'ix_courses_name_lower'"),
+            )
         )
         course_repository = CourseRepositoryImpl(session)
 
-        course_repository.update(course_1)
+        with pytest.raises(CourseNameAlreadyExistsError):
+            course_repository.create(course_1)
+
+    def test_create_should_propagate_other_integrity_errors(self):
+        session = MagicMock()
+        session.flush = Mock(
+            side_effect=IntegrityError(
+                "INSERT INTO courses", {}, Exception("NOT NULL constraint failed")
+            )
+        )
+        course_repository = CourseRepositoryImpl(session)
 
-        session.query(CourseDTO).filter_by.assert_called_with(course_id="course_1")
+        with pytest.raises(IntegrityError):
+            course_repository.create(course_1)
 
-    def test_update_should_throw_course_not_found_error(self):
+    def test_update_should_return_updated_course(self):
         session = MagicMock()
-        session.query(CourseDTO).filter_by = Mock(side_effect=CourseNotFoundError)
+        session.execute().first = Mock(return_value=course_row_1)
+        session.query().filter().order_by().all = Mock(
+            return_value=[CategoryRow(name="Programing")]
+        )
         course_repository = CourseRepositoryImpl(session)
 
-        with pytest.raises(CourseNotFoundError):
-            course_repository.update(course_1)
-        session.query(CourseDTO).filter_by.assert_called_with(id="course_1")
+        course = course_repository.update(
+            "course_1", changes={"name": course_row_1.name}
+        )
+
+        assert course.name == course_row_1.name
+        assert course.categories == ["Programing"]
+        assert course.recommendations == {"recommended": 3, "total": 4}
+
+    def test_update_should_only_write_changed_categories(self):
+        session = MagicMock()
+        session.execute = Mock()
+        session.execute().first = Mock(return_value=course_row_1)
+        session.get_bind().dialect.name = "sqlite"
+        session.query().filter().order_by().all = Mock(
+            return_value=[CategoryRow(name="Programing"), CategoryRow(name="C")]
+        )
+        course_repository = CourseRepositoryImpl(session)
+        session.execute.reset_mock()
+
+        course = course_repository.update(
+            "course_1", changes={}, categories=["Programing", "Beginner"]
+        )
+
+        assert course.categories == ["Programing", "Beginner"]
+        # UPDATE ... RETURNING, DELETE of "C", INSERT of "Beginner" into the
+        # categories and then the course's categories, and the two category
+        # metrics rollup updates
+        assert session.execute.call_count == 6
+        inserted = session.execute.call_args_list[2][0][1]
+        assert [c["name"] for c in inserted] == ["Beginner"]
+
+    def test_update_should_return_none_when_course_does_not_exist(self):
+        session = MagicMock()
+        session.execute().first = Mock(return_value=None)
+        course_repository = CourseRepositoryImpl(session)
+
+        course = course_repository.update("course_0", changes={"name": "name"})
+
+        assert course is None
 
     def test_delete_by_id_should_delete_correct_course(self):
         session = MagicMock()
@@ -135,3 +210,31 @@ class TestCourseRepository:
         with pytest.raises(CourseNotFoundError):
             course_repository.delete_by_id(id="course_1")
         session.query(CourseDTO).filter_by.assert_called_with(id="course_1")
+
+    def test_update_should_throw_course_already_exists_error_on_case_only_rename(
+        self, db_session
+    ):
+        course_repository = CourseRepositoryImpl(db_session)
+        course_repository.create(new_course("course_1", name="Python"))
+        course_repository.create(new_course("course_2", name="Other"))
+        db_session.commit()
+
+        with pytest.raises(CourseNameAlreadyExistsError):
+            course_repository.update("course_2", changes={"name": "python"})
+
+    def test_categories_should_keep_the_order_they_were_given_in(self, db_session):
+        course_repository = CourseRepositoryImpl(db_session)
+        course_repository.create(new_course("course_1", categories=["Python"]))
+        course_repository.create(new_course("course_2", categories=["Web", "Python"]))
+        db_session.commit()
+
+        course = course_repository.update(
+            "course_2", changes={}, categories=["Web", "Beginner", "Python"]
+        )
+
+        assert course.categories == ["Web", "Python", "Beginner"]
+        assert CourseQueryServiceImpl(db_session).find_by_id("course_2").categories == [
+            "Web",
+            "Python",
+            "Beginner",
+        ]
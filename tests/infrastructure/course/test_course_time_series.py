@@ -0,0 +1,178 @@
+from bisect import bisect_right
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, literal, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl, CourseRepositoryImpl
+from app.infrastructure.course.course_dto import ReviewDTO
+from app.infrastructure.course.course_time_series import (
+    bucket_index,
+    closed_buckets,
+)
+from app.usecase.metrics.time_buckets import Granularity, TimeBuckets
+from tests.parameters import DAY_MS, new_course
+
+MARCH_2021 = 1614556800000  # 2021-03-01T00:00:00Z
+
+
+@pytest.fixture
+def session(db_session: Session) -> Session:
+    repository = CourseRepositoryImpl(db_session)
+    for i, created_at in enumerate(
+        [
+            MARCH_2021,
+            MARCH_2021 + DAY_MS - 1,
+            MARCH_2021 + DAY_MS,
+            MARCH_2021 + 9 * DAY_MS,
+        ]
+    ):
+        repository.create(
+            new_course(
+                "course_{}".format(i),
+                categories=["Go"] if i else [],
+                created_at=created_at,
+            )
+        )
+    db_session.add_all(
+        ReviewDTO(
+            id="review_{}".format(i),
+            course_id=course_id,
+            recommended=recommended,
+            review="Good",
+            date=date,
+        )
+        for i, (course_id, recommended, date) in enumerate(
+            [
+                ("course_0", True, MARCH_2021 - 1),
+                ("course_0", True, MARCH_2021 + 8 * DAY_MS),
+                ("course_1", False, MARCH_2021 + 9 * DAY_MS),
+                ("course_1", True, MARCH_2021 + 10 * DAY_MS),
+            ]
+        )
+    )
+    db_session.commit()
+    return db_session
+
+
+def count_statements(session: Session):
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestCourseTimeSeries:
+    def setup_method(self):
+        closed_buckets.clear()
+
+    def test_should_count_courses_and_reviews_per_bucket(self, session):
+        metrics = CourseQueryServiceImpl(session).get_time_series_metrics(
+            TimeBuckets(date(2021, 2, 28), date(2021, 3, 14), Granularity.WEEK)
+        )
+
+        assert [b.courses for b in metrics.buckets] == [0, 3, 1]
+        assert [b.reviews for b in metrics.buckets] == [1, 0, 3]
+        assert metrics.granularity == Granularity.WEEK
+        assert metrics.buckets[1].start.isoformat() == "2021-03-01T00:00:00+00:00"
+
+    def test_should_bucket_in_the_requested_time_zone(self, session):
+        metrics = CourseQueryServiceImpl(session).get_time_series_metrics(
+            TimeBuckets(
+                date(2021, 2, 28),
+                date(2021, 3, 2),
+                Granularity.DAY,
+                "America/Argentina/Buenos_Aires",
+            )
+        )
+
+        assert [b.courses for b in metrics.buckets] == [1, 2, 0]
+        assert [b.reviews for b in metrics.buckets] == [1, 0, 0]
+
+    def test_closed_buckets_should_be_queried_once(self, session):
+        buckets = TimeBuckets(date(2021, 3, 1), date(2021, 3, 31), Granularity.DAY)
+        service = CourseQueryServiceImpl(session)
+        first = service.get_time_series_metrics(buckets)
+        statements = count_statements(session)
+        second = service.get_time_series_metrics(buckets)
+
+        assert statements == []
+        assert second == first
+        assert sum(b.courses for b in second.buckets) == 4
+
+    def test_open_buckets_should_not_be_cached(self, session):
+        buckets = TimeBuckets(date(2021, 3, 1), date(2021, 3, 31), Granularity.DAY)
+        now = MARCH_2021 + 2 * DAY_MS
+        with patch(
+            "app.infrastructure.course.course_time_series.unixtimestamp",
+            return_value=now,
+        ):
+            service = CourseQueryServiceImpl(session)
+            service.get_time_series_metrics(buckets)
+            statements = count_statements(session)
+            metrics = service.get_time_series_metrics(buckets)
+
+        assert len(statements) == 2
+        assert sum(b.courses for b in metrics.buckets) == 4
+
+    def test_bucket_index_should_place_rows_with_a_balanced_case(self):
+        edges = list(range(0, 3000, 3))
+        index = bucket_index(literal_column("value"), edges)
+        engine = create_engine("sqlite://")
+        try:
+            with engine.connect() as connection:
+                for value in (0, 1, 2, 3, 1500, 2993, 2994, 2996):
+                    bucket = connection.execute(
+                        select(index).select_from(
+                            select(literal(value).label("value")).subquery()
+                        )
+                    ).scalar()
+                    assert bucket == bisect_right(edges, value) - 1
+        finally:
+            engine.dispose()
+
+        # One CASE per inner node of the tree, ten deep for 999 buckets.
+        assert str(index.compile()).count("CASE") == len(edges) - 2
+
+
+class TestRecommendationTimeSeries:
+    def setup_method(self):
+        closed_buckets.clear()
+
+    def test_should_aggregate_recommendation_rate_per_bucket(self, session):
+        buckets = TimeBuckets(date(2021, 2, 22), date(2021, 3, 14), Granularity.WEEK)
+        metrics = CourseQueryServiceImpl(session).get_recommendation_metrics(buckets)
+
+        assert [(b.reviews, b.recommended) for b in metrics.buckets] == [
+            (1, 1),
+            (0, 0),
+            (3, 2),
+        ]
+        assert [b.rate for b in metrics.buckets] == [1.0, None, 2 / 3]
+
+    def test_should_filter_by_course_creator_and_category(self, session):
+        buckets = TimeBuckets(date(2021, 3, 8), date(2021, 3, 14), Granularity.WEEK)
+        service = CourseQueryServiceImpl(session)
+        by_course = service.get_recommendation_metrics(buckets, course_id="course_0")
+        by_creator = service.get_recommendation_metrics(buckets, creator_id="nobody")
+        by_category = service.get_recommendation_metrics(buckets, category="Go")
+
+        assert by_course.buckets[0].reviews == 1
+        assert by_creator.buckets[0].reviews == 0
+        assert by_category.buckets[0].rate == 0.5
+
+    def test_category_series_should_not_be_cached(self, session):
+        buckets = TimeBuckets(date(2021, 3, 1), date(2021, 3, 31), Granularity.DAY)
+        service = CourseQueryServiceImpl(session)
+        service.get_recommendation_metrics(buckets, creator_id="creator_1")
+        service.get_recommendation_metrics(buckets, category="Go")
+        statements = count_statements(session)
+        service.get_recommendation_metrics(buckets, creator_id="creator_1")
+        service.get_recommendation_metrics(buckets, category="Go")
+
+        assert len(statements) == 1
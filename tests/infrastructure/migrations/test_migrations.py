@@ -0,0 +1,235 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, insert, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl
+from app.infrastructure.course.course_category_cache import category_list_cache
+from app.infrastructure.course.course_dto import COURSE_NAME_INDEX, CourseDTO
+from app.infrastructure.database import Base
+from app.infrastructure.migrations import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    Migration,
+    SchemaVersionMismatchError,
+    current_version,
+    migrate,
+    verify_schema_version,
+)
+from app.infrastructure.migrations.versions import (
+    DuplicateCourseNamesError,
+    InvalidIndexError,
+    create_index,
+    legacy_categories,
+)
+from app.usecase.course import CourseQueryUseCaseImpl
+
+COURSE_ROW = {
+    "creator_id": "creator_1",
+    "price": 10,
+    "active": True,
+    "subscription_id": 0,
+    "language": "English",
+    "country": "Argentina",
+    "description": "This is a course",
+    "presentation_video": "",
+    "image": "",
+    "created_at": 0,
+    "updated_at": 0,
+}
+
+
+def index_names(engine, table):
+    # The SQLite inspector skips expression indexes such as lower(name).
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+            (table,),
+        )
+        return [row[0] for row in rows]
+
+
+class TestMigrations:
+    def test_migrate_should_create_schema_on_empty_database(self):
+        engine = create_engine("sqlite://")
+
+        version = migrate(engine, MIGRATIONS)
+
+        assert version == SCHEMA_VERSION
+        assert current_version(engine) == SCHEMA_VERSION
+        tables = inspect(engine).get_table_names()
+        for table in (
+            "courses",
+            "categories",
+            "course_categories",
+            "collabs",
+            "content",
+            "reviews",
+        ):
+            assert table in tables
+        assert COURSE_NAME_INDEX in index_names(engine, "courses")
+
+    def test_migrate_should_be_idempotent(self):
+        engine = create_engine("sqlite://")
+        migrate(engine, MIGRATIONS)
+
+        version = migrate(engine, MIGRATIONS)
+
+        assert version == SCHEMA_VERSION
+        with engine.connect() as connection:
+            applied = connection.exec_driver_sql(
+                "SELECT count(*) FROM schema_version"
+            ).scalar()
+        assert applied == len(MIGRATIONS)
+
+    def test_migrate_should_add_indexes_to_existing_tables(self):
+        engine = create_engine("sqlite://")
+        # Tables as the service used to create them, before schema_version.
+        with engine.begin() as connection:
+            MIGRATIONS[0].upgrade(connection)
+        assert COURSE_NAME_INDEX not in index_names(engine, "courses")
+
+        migrate(engine, MIGRATIONS)
+
+        assert COURSE_NAME_INDEX in index_names(engine, "courses")
+        assert "ix_courses_price" in index_names(engine, "courses")
+        assert "ix_collabs_course_id" in index_names(engine, "collabs")
+
+    def test_migrated_schema_should_match_the_models(self):
+        engine = create_engine("sqlite://")
+        migrate(engine, MIGRATIONS)
+        inspector = inspect(engine)
+
+        for table in Base.metadata.sorted_tables:
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            indexes = {index.name for index in table.indexes}
+            assert columns == set(table.columns.keys()), table.name
+            assert indexes <= set(index_names(engine, table.name)), table.name
+
+    def test_migrate_should_only_apply_pending_migrations(self):
+        engine = create_engine("sqlite://")
+        applied = []
+        migrations = [
+            Migration(1, "first", lambda c: applied.append(1)),
+            Migration(2, "second", lambda c: applied.append(2), transactional=False),
+        ]
+        migrate(engine, migrations[:1])
+
+        migrate(engine, migrations)
+
+        assert applied == [1, 2]
+        assert current_version(engine) == 2
+
+    def test_verify_schema_version_should_throw_when_database_is_behind(self):
+        engine = create_engine("sqlite://")
+
+        with pytest.raises(SchemaVersionMismatchError):
+            verify_schema_version(engine, SCHEMA_VERSION)
+
+    def test_verify_schema_version_should_return_version(self):
+        engine = create_engine("sqlite://")
+        migrate(engine, MIGRATIONS)
+
+        assert verify_schema_version(engine, SCHEMA_VERSION) == SCHEMA_VERSION
+
+    def test_normalized_categories_should_move_category_rows_to_the_dimension(self):
+        engine = create_engine("sqlite://")
+        try:
+            migrate(engine, [m for m in MIGRATIONS if m.version < 5])
+            with engine.begin() as connection:
+                connection.execute(
+                    insert(CourseDTO.__table__),
+                    [
+                        dict(COURSE_ROW, id=id, name=id)
+                        for id in ("course_1", "course_2")
+                    ],
+                )
+                connection.execute(
+                    insert(legacy_categories),
+                    [
+                        {"id": "a", "course_id": "course_1", "category": "Go"},
+                        {"id": "b", "course_id": "course_1", "category": "C"},
+                        {"id": "c", "course_id": "course_1", "category": "C"},
+                        {"id": "d", "course_id": "course_2", "category": "Go"},
+                    ],
+                )
+
+            migrate(engine, MIGRATIONS)
+
+            category_list_cache.invalidate()
+            with Session(bind=engine) as session:
+                query_service = CourseQueryServiceImpl(session)
+                course = query_service.find_by_id("course_1")
+                categories = query_service.find_all_categories()
+                metrics, _ = query_service.get_category_metrics(limit=10)
+                by_category, _, _ = CourseQueryUseCaseImpl(
+                    query_service
+                ).fetch_courses_by_filters(category=["C"])
+        finally:
+            engine.dispose()
+
+        assert sorted(course.categories) == ["C", "Go"]
+        assert categories == ["C", "Go"]
+        assert [(m.category, m.count) for m in metrics] == [("Go", 2), ("C", 1)]
+        assert [c.id for c in by_category] == ["course_1"]
+
+    def test_unique_course_name_should_refuse_names_differing_in_case(self):
+        engine = create_engine("sqlite://")
+        try:
+            migrate(engine, MIGRATIONS[:1])
+            with engine.begin() as connection:
+                connection.execute(
+                    insert(CourseDTO.__table__),
+                    [
+                        dict(COURSE_ROW, id=id, name=name)
+                        for id, name in [("a", "Python"), ("b", "python"), ("c", "Go")]
+                    ],
+                )
+
+            with pytest.raises(DuplicateCourseNamesError) as e:
+                migrate(engine, MIGRATIONS)
+
+            assert e.value.names == ["python"]
+            assert current_version(engine) == 1
+        finally:
+            engine.dispose()
+
+    def test_create_index_should_drop_an_index_left_invalid(self):
+        connection = MagicMock()
+        connection.engine.dialect.name = "postgresql"
+        connection.execute().scalar.side_effect = [None, False]
+
+        with pytest.raises(InvalidIndexError):
+            create_index(connection, "ix_courses_name_lower", "courses", "lower(name)")
+
+        statements = [c.args[0] for c in connection.exec_driver_sql.call_args_list]
+        assert (
+            statements[-1] == "DROP INDEX CONCURRENTLY IF EXISTS ix_courses_name_lower"
+        )
+
+    def test_create_index_should_drop_the_invalid_index_of_a_failed_build(self):
+        connection = MagicMock()
+        connection.engine.dialect.name = "postgresql"
+        connection.execute().scalar.side_effect = [None, False]
+        connection.exec_driver_sql.side_effect = [IntegrityError("", {}, None), None]
+
+        with pytest.raises(IntegrityError):
+            create_index(connection, "ix_courses_name_lower", "courses", "lower(name)")
+
+        statements = [c.args[0] for c in connection.exec_driver_sql.call_args_list]
+        assert statements[-1] == "DROP INDEX CONCURRENTLY ix_courses_name_lower"
+
+    def test_create_index_should_rebuild_an_invalid_index_from_an_earlier_run(self):
+        connection = MagicMock()
+        connection.engine.dialect.name = "postgresql"
+        connection.execute().scalar.side_effect = [False, True]
+
+        create_index(connection, "ix_courses_price", "courses", "price")
+
+        statements = [c.args[0] for c in connection.exec_driver_sql.call_args_list]
+        assert statements == [
+            "DROP INDEX CONCURRENTLY ix_courses_price",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_courses_price ON courses (price)",
+        ]
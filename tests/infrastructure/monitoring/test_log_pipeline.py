@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+import sys
+import threading
+
+from app.infrastructure.monitoring import (
+    AsyncStreamHandler,
+    JsonFormatter,
+    RateLimitFilter,
+    log_records_dropped,
+    tracer,
+)
+
+
+def record(level=logging.INFO, name="routes.courses", msg="listed %d", args=(3,)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class BlockingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def write(self, s):
+        self.released.wait()
+        return super().write(s)
+
+
+class TestLogPipeline:
+    def test_json_formatter_should_include_extra_fields_and_exceptions(self):
+        entry = record()
+        entry.route = "/courses"
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            entry.exc_info = sys.exc_info()
+
+        output = json.loads(JsonFormatter().format(entry))
+
+        assert output["level"] == "INFO"
+        assert output["logger"] == "routes.courses"
+        assert output["message"] == "listed 3"
+        assert output["route"] == "/courses"
+        assert "ValueError: boom" in output["exception"]
+
+    def test_rate_limit_should_cap_each_logger_and_report_suppressed(self):
+        filter = RateLimitFilter(rate=1e-9, burst=2)
+
+        passed = [filter.filter(record()) for _ in range(5)]
+        other_logger = filter.filter(record(name="routes.collabs"))
+        error = filter.filter(record(level=logging.ERROR))
+
+        assert passed == [True, True, False, False, False]
+        assert other_logger and error
+
+        filter._buckets[("routes.courses", logging.INFO)].tokens = 1
+        resumed = record()
+        assert filter.filter(resumed)
+        assert resumed.suppressed == 3
+
+    def test_rate_limit_should_not_let_info_records_starve_warnings(self):
+        filter = RateLimitFilter(rate=1e-9, burst=1)
+
+        assert filter.filter(record())
+        assert not filter.filter(record())
+        assert filter.filter(record(level=logging.WARNING))
+
+    def test_exempt_loggers_should_not_be_rate_limited(self):
+        filter = RateLimitFilter(rate=1e-9, burst=1, exempt=["routes.courses"])
+
+        assert all(filter.filter(record()) for _ in range(5))
+        assert filter.filter(record(name="routes.collabs"))
+        assert not filter.filter(record(name="routes.collabs"))
+
+    def test_sample_should_only_drop_records_below_warning(self):
+        filter = RateLimitFilter(rate=0, sample={"routes.courses": 0})
+        before = log_records_dropped.value("sampled")
+
+        assert not filter.filter(record())
+        assert filter.filter(record(level=logging.WARNING))
+        assert filter.filter(record(name="routes.collabs"))
+        assert log_records_dropped.value("sampled") == before + 1
+
+    def test_async_handler_should_write_on_its_listener_thread(self):
+        stream = io.StringIO()
+        handler = AsyncStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        try:
+            with tracer.span("GET /courses") as span:
+                handler.handle(record())
+            handler.flush()
+        finally:
+            handler.close()
+
+        output = json.loads(stream.getvalue())
+        assert output["message"] == "listed 3"
+        assert output["trace_id"] == span.trace_id
+
+    def test_async_handler_should_drop_records_when_the_queue_is_full(self):
+        stream = BlockingStream()
+        handler = AsyncStreamHandler(stream, capacity=1)
+        before = log_records_dropped.value("queue_full")
+        try:
+            for _ in range(5):
+                handler.handle(record())
+            dropped = log_records_dropped.value("queue_full") - before
+        finally:
+            stream.released.set()
+            handler.close()
+
+        assert 3 <= dropped <= 4
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy.pool import QueuePool
+
+from app.infrastructure.monitoring import Counter, Gauge, Histogram, Registry
+from app.infrastructure.monitoring.metrics import _pool_connections, _pools, watch_pool
+
+
+class TestMetrics:
+    def test_histogram_should_render_cumulative_buckets(self):
+        registry = Registry()
+        histogram = registry.register(
+            Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+        )
+
+        histogram.observe(0.05, "/courses")
+        histogram.observe(0.5, "/courses")
+        histogram.observe(5, "/courses")
+
+        lines = registry.render().splitlines()
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{route="/courses",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/courses",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/courses",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{route="/courses"} 3' in lines
+        assert 'latency_seconds_sum{route="/courses"} 5.55' in lines
+
+    def test_counter_and_gauge_should_render_labelled_samples(self):
+        registry = Registry()
+        counter = registry.register(Counter("hits_total", "Hits.", ("cache",)))
+        gauge = registry.register(Gauge("in_flight", "In flight."))
+
+        counter.inc("identity_map")
+        counter.inc("identity_map")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        lines = registry.render().splitlines()
+        assert 'hits_total{cache="identity_map"} 2' in lines
+        assert "in_flight 1" in lines
+
+    def test_metric_should_reject_wrong_labels(self):
+        counter = Counter("hits_total", "Hits.", ("cache", "result"))
+
+        with pytest.raises(ValueError):
+            counter.inc("identity_map")
+
+    def test_registry_should_reject_duplicate_names(self):
+        registry = Registry()
+        registry.register(Counter("hits_total", "Hits."))
+
+        with pytest.raises(ValueError):
+            registry.register(Counter("hits_total", "Hits."))
+
+    def test_pool_connections_should_report_queue_pool_usage(self):
+        pool = QueuePool(lambda: None, pool_size=3)
+        watch_pool(pool)
+        try:
+            assert _pool_connections()[("size",)] >= 3
+        finally:
+            _pools.remove(pool)
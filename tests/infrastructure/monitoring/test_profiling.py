@@ -0,0 +1,77 @@
+import cProfile
+import os
+import threading
+import time
+
+from app.infrastructure.monitoring import (
+    RequestProfiles,
+    SamplingTrigger,
+    StackSampler,
+    render_collapsed,
+)
+from app.infrastructure.monitoring.profiling import parse_collapsed
+
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestProfiling:
+    def test_request_profiles_should_keep_the_most_recent(self):
+        profiles = RequestProfiles(capacity=2)
+        for id in ["a", "b", "c"]:
+            profile = cProfile.Profile()
+            profile.enable()
+            sum(range(10))
+            profile.disable()
+            profiles.add(id, "GET /courses", profile)
+
+        assert profiles.get("a") is None
+        assert profiles.get("c").startswith("GET /courses\n")
+        assert "function calls" in profiles.get("c")
+
+    def test_sampler_should_collect_stacks_of_other_threads(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=busy_loop, args=(stop,))
+        thread.start()
+        try:
+            counts = StackSampler(interval_ms=1).run(0.05)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert any("test_profiling:busy_loop" in stack for stack in counts)
+        assert not any(
+            "app.infrastructure.monitoring.profiling:run" in stack for stack in counts
+        )
+
+    def test_collapsed_output_should_round_trip(self):
+        counts = {"main;a;b": 3, "main;a": 1}
+
+        text = render_collapsed(counts)
+
+        assert text == "main;a;b 3\nmain;a 1\n"
+        assert parse_collapsed(text) == counts
+
+    def test_trigger_should_merge_samples_from_every_worker(self, tmp_path):
+        trigger = SamplingTrigger(str(tmp_path), StackSampler(interval_ms=1))
+        id = trigger.request(0.01)
+
+        assert trigger.poll()
+        assert not trigger.poll()
+        other_worker = trigger.result_path(id, os.getpid() + 1)
+        with open(other_worker, "w") as f:
+            f.write("main;worker 5\n")
+
+        counts = trigger.collect(id)
+
+        assert counts["main;worker"] == 5
+        assert sorted(os.listdir(str(tmp_path))) == [id + ".collapsed", "trigger.json"]
+
+    def test_expired_triggers_should_be_ignored(self, tmp_path):
+        trigger = SamplingTrigger(str(tmp_path), StackSampler(interval_ms=1))
+        trigger.request(0.01)
+        time.sleep(0.02)
+
+        assert not trigger.poll()
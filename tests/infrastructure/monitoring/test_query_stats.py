@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.infrastructure.monitoring import (
+    QueryBudgetExceededError,
+    current_query_stats,
+    instrument_engine,
+    query_budget,
+    track_queries,
+)
+
+
+def instrumented_engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    return engine
+
+
+class TestQueryStats:
+    def test_track_queries_should_count_statements_once_per_execute(self):
+        engine = instrumented_engine()
+
+        with track_queries() as stats:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("SELECT 1")
+                connection.exec_driver_sql("SELECT 2")
+
+        assert stats.statements == 2
+        assert stats.duration > 0
+        assert current_query_stats() is None
+
+    def test_track_queries_should_count_failed_statements(self):
+        engine = instrumented_engine()
+
+        with track_queries() as stats:
+            with engine.connect() as connection:
+                with pytest.raises(OperationalError):
+                    connection.exec_driver_sql("SELECT * FROM missing")
+
+        assert stats.statements == 1
+
+    def test_query_budget_should_throw_when_exceeded(self):
+        engine = instrumented_engine()
+
+        with pytest.raises(QueryBudgetExceededError):
+            with query_budget(1):
+                with engine.connect() as connection:
+                    connection.exec_driver_sql("SELECT 1")
+                    connection.exec_driver_sql("SELECT 2")
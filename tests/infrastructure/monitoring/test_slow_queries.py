@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from app.infrastructure.course import CourseQueryServiceImpl
+from app.infrastructure.monitoring import SlowQueryLog, instrument_engine
+from app.infrastructure.monitoring.slow_queries import parameter_shape
+from app.usecase.course import CourseQueryUseCaseImpl
+
+
+class TestSlowQueries:
+    def test_parameter_shape_should_only_keep_types(self):
+        assert parameter_shape(("course_1", 10, None)) == "(str, int, NoneType)"
+        assert parameter_shape({"id": "course_1"}) == "{id: str}"
+        assert parameter_shape([("a", 1), ("b", 2)], executemany=True) == (
+            "2 x (str, int)"
+        )
+
+    def test_observe_should_ignore_statements_under_threshold(self):
+        log = SlowQueryLog(threshold_ms=1000)
+
+        log.observe(None, "SELECT 1", (), False, 0.5)
+
+        assert log.worst() == []
+
+    def test_observe_should_keep_worst_sample_per_statement(self):
+        log = SlowQueryLog(threshold_ms=1, capacity=2)
+
+        log.observe(None, "SELECT 1", (), False, 0.010)
+        log.observe(None, "SELECT 1", (), False, 0.030)
+        log.observe(None, "SELECT 2", (), False, 0.020)
+        log.observe(None, "SELECT 3", (), False, 0.005)
+        log.observe(None, "SELECT 4", (), False, 0.040)
+
+        assert [(q.statement, q.duration) for q in log.worst()] == [
+            ("SELECT 4", 0.040),
+            ("SELECT 1", 0.030),
+        ]
+
+    def test_slow_queries_should_record_use_case_and_plan(self, db_session):
+        instrument_engine(db_session.get_bind())
+        log = SlowQueryLog(threshold_ms=1e-6, explain_sample_rate=1)
+        query_usecase = CourseQueryUseCaseImpl(CourseQueryServiceImpl(db_session))
+
+        with patch("app.infrastructure.monitoring.query_stats.slow_query_log", log):
+            query_usecase.fetch_courses_by_filters(category=["Programming"])
+        log.flush()
+
+        queries = log.worst()
+        assert len(queries) > 0
+        assert all(
+            q.caller == "CourseQueryUseCaseImpl.fetch_courses_by_filters"
+            for q in queries
+        )
+        assert any(q.plan for q in queries)
+
+    def test_failed_explain_should_be_logged_and_leave_the_session_usable(
+        self, db_session, caplog
+    ):
+        log = SlowQueryLog(threshold_ms=1e-6, explain_sample_rate=1)
+        db_session.execute(text("SELECT 1"))
+
+        log.observe(db_session.get_bind(), "SELECT * FROM missing", (), False, 1)
+        log.flush()
+
+        [query] = log.worst()
+        assert query.plan is None
+        assert "Could not explain slow query" in caplog.text
+        assert db_session.execute(text("SELECT 1")).scalar() == 1
@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.infrastructure.course import CourseQueryServiceImpl
+from app.infrastructure.migrations import MIGRATIONS, migrate
+from app.infrastructure.monitoring import (
+    InMemorySpanExporter,
+    Tracer,
+    current_span,
+    format_traceparent,
+    parse_traceparent,
+    trace_engine,
+    traced,
+    tracer,
+)
+from app.usecase.course import CourseQueryUseCaseImpl
+
+
+class TestTracing:
+    def test_parse_traceparent_should_accept_w3c_headers(self):
+        context = parse_traceparent(
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+        )
+
+        assert context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert context.span_id == "00f067aa0ba902b7"
+        assert context.sampled
+        assert format_traceparent(context) == (
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+        )
+
+    @pytest.mark.parametrize(
+        "header",
+        [
+            None,
+            "",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7",
+            "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01",
+            "ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01-extra",
+        ],
+    )
+    def test_parse_traceparent_should_reject_invalid_headers(self, header):
+        assert parse_traceparent(header) is None
+
+    def test_spans_should_nest_and_record_errors(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter, sample_rate=1)
+
+        with pytest.raises(ValueError):
+            with tracer.span("parent") as parent:
+                with tracer.span("child"):
+                    raise ValueError
+
+        child, finished_parent = exporter.finished_spans()
+        assert finished_parent is parent
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert child.error == "ValueError"
+        assert parent.error == "ValueError"
+        assert current_span() is None
+
+    def test_unsampled_traces_should_not_be_exported(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter, sample_rate=0)
+
+        with tracer.span("parent") as parent:
+            with tracer.span("child") as child:
+                pass
+
+        assert not parent.sampled and not child.sampled
+        assert exporter.finished_spans() == []
+
+    def test_traced_should_wrap_public_methods_in_spans(self):
+        exporter = InMemorySpanExporter()
+        usecase = CourseQueryUseCaseImpl(MagicMock())
+
+        with patch.object(tracer, "exporter", exporter):
+            traced(usecase).fetch_course_by_id("course_1")
+
+        (span,) = exporter.finished_spans()
+        assert span.name == "CourseQueryUseCaseImpl.fetch_course_by_id"
+
+    def test_statements_should_be_traced_under_the_current_span(self):
+        engine = create_engine("sqlite://")
+        migrate(engine, MIGRATIONS)
+        trace_engine(engine)
+        session = Session(bind=engine)
+        exporter = InMemorySpanExporter()
+
+        try:
+            with patch.object(tracer, "exporter", exporter):
+                CourseQueryServiceImpl(session).find_by_id("course_1")
+                assert exporter.finished_spans() == []
+
+                with tracer.span("GET /courses/{id}") as parent:
+                    CourseQueryServiceImpl(session).find_by_id("course_1")
+        finally:
+            session.close()
+            engine.dispose()
+
+        statements = [s for s in exporter.finished_spans() if s is not parent]
+        assert [s.name for s in statements] == ["SELECT"]
+        assert statements[0].parent_id == parent.span_id
+        assert statements[0].attributes["db.system"] == "sqlite"
@@ -0,0 +1,59 @@
+from unittest.mock import ANY, MagicMock, patch
+
+from app.infrastructure import microservice_client
+from app.infrastructure.monitoring import (
+    InMemorySpanExporter,
+    outbound_request_duration,
+    parse_traceparent,
+    tracer,
+)
+
+
+class TestMicroserviceClient:
+    def test_get_should_go_through_the_shared_session(self):
+        response = MagicMock()
+        with patch.object(
+            microservice_client.session, "request", return_value=response
+        ) as request:
+            result = microservice_client.get(
+                "http://users/users/filter-by-ids", params={"ids": "a,b"}
+            )
+
+        request.assert_called_once_with(
+            "GET",
+            "http://users/users/filter-by-ids",
+            params={"ids": "a,b"},
+            headers={"traceparent": ANY},
+        )
+        assert result is response
+
+    def test_request_should_record_latency_by_service(self):
+        response = MagicMock(status_code=200)
+        with patch.dict(
+            microservice_client.microservices, {"payments": "http://payments/"}
+        ), patch.object(microservice_client.session, "request", return_value=response):
+            before = outbound_request_duration.count("payments", "GET", "200")
+            microservice_client.get("http://payments/payments/wallet/creator_1")
+
+        assert outbound_request_duration.count("payments", "GET", "200") == before + 1
+
+    def test_request_should_propagate_the_current_trace(self):
+        response = MagicMock(status_code=200)
+        exporter = InMemorySpanExporter()
+        with patch.object(tracer, "exporter", exporter), patch.object(
+            microservice_client.session, "request", return_value=response
+        ) as request:
+            with tracer.span("DELETE /courses/{id}") as parent:
+                microservice_client.get(
+                    "http://payments/payments/wallet/creator_1",
+                    headers={"authorization": "token"},
+                )
+
+        headers = request.call_args.kwargs["headers"]
+        outbound, _ = exporter.finished_spans()
+        context = parse_traceparent(headers["traceparent"])
+        assert headers["authorization"] == "token"
+        assert context.trace_id == parent.trace_id
+        assert context.span_id == outbound.span_id
+        assert outbound.parent_id == parent.span_id
+        assert outbound.attributes["http.status_code"] == 200
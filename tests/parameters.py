@@ -1,3 +1,4 @@
+from collections import namedtuple
 from unittest.mock import MagicMock, Mock
 
 from app.domain.course import Course, CourseNotFoundError
@@ -48,7 +49,7 @@ course_dto_1 = CourseDTO(
     language="English",
     description="This is a course",
     country="Argentina",
-    categories=[Category(category="Programing")],
+    categories=[Category(name="Programing")],
     presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
     image="https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg",
     content=[content_dto_1],
@@ -67,7 +68,7 @@ course_dto_1_reviewed = CourseDTO(
     language="English",
     description="This is a course",
     country="Argentina",
-    categories=[Category(category="Programing")],
+    categories=[Category(name="Programing")],
     presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
     image="https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg",
     content=[content_dto_1],
@@ -127,6 +128,58 @@ course_dto_2 = CourseDTO(
     active=True,
 )
 
+CourseRow = namedtuple(
+    "CourseRow",
+    [
+        "id",
+        "creator_id",
+        "name",
+        "price",
+        "active",
+        "subscription_id",
+        "language",
+        "country",
+        "description",
+        "presentation_video",
+        "image",
+        "created_at",
+        "updated_at",
+        "recommended",
+        "total",
+    ],
+)
+
+course_row_1 = CourseRow(
+    id="course_1",
+    creator_id="creator_1",
+    name="C Programming For Beginners - Master the C Language",
+    price=10,
+    active=True,
+    subscription_id=0,
+    language="English",
+    country="Argentina",
+    description="This is a course",
+    presentation_video="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    image="https://static01.nyt.com/images/2017/09/26/science/26TB-PANDA/26TB-PANDA-superJumbo.jpg",
+    created_at=1614007224642,
+    updated_at=1614007224642,
+    recommended=3,
+    total=4,
+)
+
+course_row_2 = course_row_1._replace(
+    id="course_2",
+    creator_id="creator_2",
+    name="Learn Python Programming Masterclass",
+    price=20,
+    recommended=0,
+    total=0,
+)
+
+CategoryRow = namedtuple("CategoryRow", ["name"])
+
+CourseCategoryRow = namedtuple("CourseCategoryRow", ["course_id", "category"])
+
 course_2 = CourseDTO(
     id="course_2",
     creator_id="creator_2",
@@ -237,17 +290,50 @@ def mock_filter_course_1_name(name):
     raise CourseNotFoundError
 
 
-def mock_filter_course_1_name_course(name):
-    if name == course_1.name:
-        return course_1
-    return None
-
-
-def mock_filter_course_1_update(id=0, course_id=0):
-    if id == course_dto_1.id or course_id == course_dto_1.id:
-        return query_course_1
-    raise CourseNotFoundError
-
-
 def mock_fetch_all():
-    return [course_dto_1, course_dto_2]
+    return [course_row_1, course_row_2]
+
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def new_course(id: str, **fields) -> Course:
+    # A valid course to store through the repository; tests override only the
+    # fields they look at.
+    return Course(
+        **{
+            "id": id,
+            "creator_id": "creator_1",
+            "name": "Course {}".format(id),
+            "price": 10,
+            "active": True,
+            "language": "English",
+            "description": "This is a course",
+            "country": "Argentina",
+            "categories": [],
+            "recommendations": {},
+            "presentation_video": "",
+            "image": "",
+            "subscription_id": 0,
+            **fields,
+        }
+    )
+
+
+# find_by_filters arguments that leave every course in; tests override the
+# filter they look at.
+NO_FILTERS = dict(
+    ids=None,
+    name=None,
+    creator_id=None,
+    collab_id=None,
+    subscription_id=None,
+    inactive_courses=False,
+    inactive_collab=False,
+    category=None,
+    language=None,
+    country=None,
+    ignore_free=False,
+    ignore_paid=False,
+    text=None,
+)
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from starlette.testclient import TestClient
+
+from routes import dependencies, monitoring
+from routes.dependencies import require_admin_token
+
+
+class TestAdminToken:
+    def test_require_admin_token_should_accept_configured_token(self):
+        with patch.object(dependencies, "ADMIN_TOKEN", "secret"):
+            require_admin_token("secret")
+
+    @pytest.mark.parametrize("token", [None, "", "wrong"])
+    def test_require_admin_token_should_reject_other_tokens(self, token):
+        with patch.object(dependencies, "ADMIN_TOKEN", "secret"):
+            with pytest.raises(HTTPException) as e:
+                require_admin_token(token)
+
+        assert e.value.status_code == 403
+
+    def test_require_admin_token_should_reject_when_not_configured(self):
+        with patch.object(dependencies, "ADMIN_TOKEN", None):
+            with pytest.raises(HTTPException):
+                require_admin_token("secret")
+
+    @pytest.mark.parametrize(
+        "headers, status_code", [({}, 403), ({"X-Admin-Token": "secret"}, 200)]
+    )
+    def test_metrics_should_require_admin_token(self, headers, status_code):
+        app = FastAPI()
+        app.include_router(monitoring.router)
+
+        with patch.object(dependencies, "ADMIN_TOKEN", "secret"):
+            response = TestClient(app).get("/metrics", headers=headers)
+
+        assert response.status_code == status_code
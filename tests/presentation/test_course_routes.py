@@ -0,0 +1,79 @@
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+from starlette.testclient import TestClient
+
+from app.infrastructure.course import CourseRepositoryImpl
+from app.infrastructure.course.course_dto import CourseDTO
+from routes import courses
+from routes.dependencies import get_session, microservices
+from tests.parameters import new_course
+
+
+@pytest.fixture
+def client(db_session, monkeypatch):
+    CourseRepositoryImpl(db_session).create(new_course("course_1"))
+    db_session.commit()
+    monkeypatch.setattr(courses, "check_cancel_fee", Mock())
+    monkeypatch.setattr(courses.microservice_client, "patch", Mock())
+    monkeypatch.setitem(microservices, "subscriptions", "http://subscriptions/")
+
+    app = FastAPI()
+    app.include_router(courses.router)
+    app.dependency_overrides[get_session] = lambda: db_session
+    return TestClient(app)
+
+
+def statements_of(session):
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestCourseRoutes:
+    def test_delete_should_not_load_the_course_relations(self, client, db_session):
+        statements = statements_of(db_session)
+
+        response = client.delete("/courses/course_1", params={"uid": "creator_1"})
+
+        assert response.status_code == 202
+        # The creator check, the read model and its categories, the row the
+        # repository deactivates, and the update. Nothing maps the course to an
+        # entity, so its categories, reviews and collabs are never loaded.
+        assert [s.split()[0] for s in statements] == [
+            "SELECT",
+            "SELECT",
+            "SELECT",
+            "SELECT",
+            "UPDATE",
+        ]
+        assert not any(
+            s.startswith(("SELECT reviews", "SELECT collabs")) for s in statements
+        )
+        db_session.expire_all()
+        assert not db_session.query(CourseDTO).filter_by(id="course_1").one().active
+
+    def test_delete_should_return_404_for_missing_course(self, client):
+        response = client.delete("/courses/course_0", params={"uid": "creator_1"})
+
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize("url", ["/courses", "/courses/"])
+    def test_pages_without_facets_should_not_have_a_facets_key(self, client, url):
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 1
+        assert "facets" not in response.json()
+
+    def test_search_with_facets_should_return_them(self, client):
+        response = client.get("/courses/", params={"facets": ["language"]})
+
+        assert response.status_code == 200
+        assert response.json()["facets"] == {"language": {"English": 1}}
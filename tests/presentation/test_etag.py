@@ -0,0 +1,22 @@
+import pytest
+
+from app.presentation.response.etag import etag, etag_matches
+
+
+class TestETag:
+    def test_etag_should_depend_on_the_content(self):
+        assert etag(["Go", "C"]) == etag(["Go", "C"])
+        assert etag(["Go", "C"]) != etag(["C", "Go"])
+
+    @pytest.mark.parametrize(
+        "if_none_match",
+        ["{tag}", "W/{tag}", '"other", {tag}', "*"],
+    )
+    def test_etag_should_match_if_none_match(self, if_none_match):
+        tag = etag(["Go"])
+
+        assert etag_matches(if_none_match.format(tag=tag), tag)
+
+    @pytest.mark.parametrize("if_none_match", [None, "", '"other"'])
+    def test_etag_should_not_match_other_tags(self, if_none_match):
+        assert not etag_matches(if_none_match, etag(["Go"]))
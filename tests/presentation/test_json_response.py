@@ -0,0 +1,48 @@
+import json
+from unittest.mock import patch
+
+from app.presentation.response import json_response
+from app.presentation.response.json_response import (
+    FastJSONResponse,
+    trusted_json_response,
+)
+from app.usecase.content.content_query_model import ChapterReadModel, ContentReadModel
+from app.usecase.course.course_query_model import PaginatedCourseReadModel
+from tests.parameters import course_dto_2
+
+
+class TestFastJSONResponse:
+    def test_render_should_match_validated_model_encoding(self):
+        course = course_dto_2.to_read_model()
+        page = PaginatedCourseReadModel.construct(courses=[course], count=1)
+
+        response = FastJSONResponse(page)
+
+        assert json.loads(response.body) == json.loads(
+            PaginatedCourseReadModel(courses=[course], count=1).json()
+        )
+
+    def test_render_should_fall_back_to_json_without_orjson(self):
+        content = ContentReadModel.construct(
+            id="content_1",
+            title="Título",
+            chapter=1,
+            order=0,
+            description="",
+            video="",
+            image="",
+        )
+        chapter = ChapterReadModel(chapter=1, content=[content])
+
+        with patch.object(json_response, "orjson", None):
+            response = FastJSONResponse([chapter])
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body.decode("utf-8")) == [chapter.dict()]
+
+    def test_trusted_json_response_should_return_content_unless_enabled(self):
+        page = PaginatedCourseReadModel.construct(courses=[], count=0)
+
+        assert trusted_json_response(page) is page
+        with patch.object(json_response, "FAST_JSON_RESPONSES", True):
+            assert isinstance(trusted_json_response(page), FastJSONResponse)
@@ -0,0 +1,42 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.infrastructure.monitoring import http_request_duration, http_requests_in_flight
+from app.presentation.middleware.metrics_middleware import MetricsMiddleware
+
+
+async def in_flight(request):
+    return PlainTextResponse(str(http_requests_in_flight.value()))
+
+
+def metrics_app():
+    app = Starlette(routes=[Route("/metrics-test/{id}", in_flight)])
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+class TestMetricsMiddleware:
+    def test_requests_should_be_labelled_by_route_template(self):
+        client = TestClient(metrics_app())
+        before = http_request_duration.count("GET", "/metrics-test/{id}", "200")
+
+        response = client.get("/metrics-test/course_1")
+        client.get("/metrics-test/course_2")
+
+        assert response.text == "1"
+        assert http_requests_in_flight.value() == 0
+        assert (
+            http_request_duration.count("GET", "/metrics-test/{id}", "200")
+            == before + 2
+        )
+
+    def test_unknown_paths_should_share_one_label(self):
+        client = TestClient(metrics_app())
+        before = http_request_duration.count("GET", "unmatched", "404")
+
+        client.get("/unknown/1")
+        client.get("/unknown/2")
+
+        assert http_request_duration.count("GET", "unmatched", "404") == before + 2
@@ -0,0 +1,49 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.infrastructure.monitoring import request_profiles
+from app.presentation.middleware.profiling_middleware import (
+    PROFILE_NOTE,
+    ProfilingMiddleware,
+)
+
+
+async def endpoint(request):
+    return PlainTextResponse(str(sum(range(100))))
+
+
+def profiled_app():
+    app = Starlette(routes=[Route("/profiling-test", endpoint)])
+    app.add_middleware(ProfilingMiddleware, authorize=lambda token: token == "secret")
+    return app
+
+
+class TestProfilingMiddleware:
+    def test_request_should_be_profiled_with_admin_token(self):
+        client = TestClient(profiled_app())
+
+        response = client.get(
+            "/profiling-test", headers={"X-Profile": "1", "X-Admin-Token": "secret"}
+        )
+
+        assert response.text == "4950"
+        profile = request_profiles.get(response.headers["x-profile-id"])
+        assert profile.startswith(f"GET /profiling-test\n{PROFILE_NOTE}\n")
+        assert "endpoint" in profile
+
+    def test_request_should_not_be_profiled_without_admin_token(self):
+        client = TestClient(profiled_app())
+
+        responses = [
+            client.get("/profiling-test", headers={"X-Profile": "1"}),
+            client.get(
+                "/profiling-test",
+                headers={"X-Profile": "1", "X-Admin-Token": "wrong"},
+            ),
+            client.get("/profiling-test", headers={"X-Admin-Token": "secret"}),
+        ]
+
+        assert all(r.status_code == 200 for r in responses)
+        assert all("x-profile-id" not in r.headers for r in responses)
@@ -0,0 +1,60 @@
+import json
+import logging
+
+from sqlalchemy import create_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.infrastructure.monitoring import JsonFormatter, instrument_engine
+from app.presentation.middleware.query_stats_middleware import QueryStatsMiddleware
+
+
+def app_running_queries(statements: int):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    async def endpoint(request):
+        with engine.connect() as connection:
+            for _ in range(statements):
+                connection.exec_driver_sql("SELECT 1")
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/", endpoint)])
+    app.add_middleware(QueryStatsMiddleware)
+    return app
+
+
+class TestQueryStatsMiddleware:
+    def test_response_should_report_statements_in_server_timing(self):
+        client = TestClient(app_running_queries(3))
+
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert 'desc="3 queries"' in response.headers["server-timing"]
+        assert "app;dur=" in response.headers["server-timing"]
+
+    def test_requests_should_not_share_stats(self):
+        client = TestClient(app_running_queries(1))
+
+        client.get("/")
+        response = client.get("/")
+
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+
+    def test_access_log_should_carry_its_fields_as_extra(self, caplog):
+        client = TestClient(app_running_queries(2))
+
+        with caplog.at_level(
+            logging.INFO, logger="app.presentation.middleware.query_stats_middleware"
+        ):
+            client.get("/")
+
+        [entry] = caplog.records
+        assert entry.getMessage() == "GET / 200"
+        assert (entry.method, entry.path, entry.status) == ("GET", "/", 200)
+        assert entry.db_statements == 2
+        assert entry.duration_ms >= entry.db_ms >= 0
+        assert json.loads(JsonFormatter().format(entry))["db_statements"] == 2
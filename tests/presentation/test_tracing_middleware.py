@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.infrastructure.monitoring import InMemorySpanExporter, current_span, tracer
+from app.presentation.middleware.tracing_middleware import TracingMiddleware
+
+
+async def trace_id(request):
+    return PlainTextResponse(current_span().trace_id)
+
+
+def tracing_app():
+    app = Starlette(routes=[Route("/tracing-test/{id}", trace_id)])
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+class TestTracingMiddleware:
+    def test_request_span_should_be_named_by_route_template(self):
+        client = TestClient(tracing_app())
+        exporter = InMemorySpanExporter()
+
+        with patch.object(tracer, "exporter", exporter):
+            response = client.get("/tracing-test/course_1")
+
+        (span,) = exporter.finished_spans()
+        assert span.name == "GET /tracing-test/{id}"
+        assert span.parent_id is None
+        assert span.trace_id == response.text
+        assert span.attributes["http.status_code"] == 200
+
+    def test_request_should_continue_the_callers_trace(self):
+        client = TestClient(tracing_app())
+        exporter = InMemorySpanExporter()
+
+        with patch.object(tracer, "exporter", exporter):
+            response = client.get(
+                "/tracing-test/course_1",
+                headers={
+                    "traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736"
+                    "-00f067aa0ba902b7-01"
+                },
+            )
+
+        (span,) = exporter.finished_spans()
+        assert response.text == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert span.parent_id == "00f067aa0ba902b7"
@@ -1,14 +1,20 @@
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, call
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
-from app.domain.course import CourseNameAlreadyExistsError
+from app.domain.course import CourseNameAlreadyExistsError, CourseNotFoundError
 from app.infrastructure.course import (
     CourseCommandUseCaseUnitOfWorkImpl,
     CourseDTO,
+    CourseIdentityMap,
+    CourseQueryServiceImpl,
     CourseRepositoryImpl,
 )
-from app.usecase.course import CourseCommandUseCaseImpl
+from app.usecase.course import (
+    CourseCommandUseCaseImpl,
+    CourseQueryUseCaseImpl,
+)
 from tests.parameters import (
     content_1,
     content_1_update,
@@ -16,9 +22,9 @@ from tests.parameters import (
     course_1_update,
     mock_filter_course_1,
     mock_filter_course_1_content,
-    mock_filter_course_1_name_course,
     mock_filter_course_1_reviewed,
     mock_filter_course_1_with_user,
+    new_course,
     review_create_1,
     user_1,
 )
@@ -27,9 +33,7 @@ from tests.parameters import (
 class TestCourseCommandUseCase:
     def test_create_course_should_return_course(self):
         session = MagicMock()
-        course_repository = MagicMock()
-        course_repository.find_by_name = Mock(return_value=None)
-        course_repository.find_by_id = Mock(return_value=course_1)
+        course_repository = CourseRepositoryImpl(session)
         uow = CourseCommandUseCaseUnitOfWorkImpl(
             session=session, course_repository=course_repository
         )
@@ -38,17 +42,39 @@ class TestCourseCommandUseCase:
         course = course_command_usecase.create_course(course_1, course_1.creator_id)
 
         assert course.name == course_1.name
-        course_repository.find_by_name.assert_called_with(course_1.name)
+        assert course.created_at == course.updated_at
+        assert course.recommendations == {"recommended": 0, "total": 0}
+        session.add.assert_called_once()
+        session.query.assert_not_called()
+        session.commit.assert_called_once()
+
+    def test_create_course_should_return_each_category_once(self):
+        session = MagicMock()
+        course_repository = CourseRepositoryImpl(session)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session=session, course_repository=course_repository
+        )
+        course_command_usecase = CourseCommandUseCaseImpl(uow=uow)
+        data = new_course("course_1", categories=["Go", "Go", "C"])
+
+        course = course_command_usecase.create_course(data, data.creator_id)
+
+        assert course.categories == ["Go", "C"]
 
     def test_create_course_when_course_exists_should_throw_course_name_already_exists_error(
         self,
     ):
         session = MagicMock()
-        course_repository = MagicMock()
-        course_repository.find_by_name = Mock(
-            side_effect=mock_filter_course_1_name_course
+        session.flush = Mock(
+            side_effect=IntegrityError(
+                "INSERT INTO courses",
+                {},
+                Exception(
+                    'duplicate key value violates unique constraint "ix_courses_name_lower"'
+                ),
+            )
         )
-        course_repository.find_by_id = Mock(return_value=course_1)
+        course_repository = CourseRepositoryImpl(session)
         uow = CourseCommandUseCaseUnitOfWorkImpl(
             session=session, course_repository=course_repository
         )
@@ -56,12 +82,13 @@ class TestCourseCommandUseCase:
 
         with pytest.raises(CourseNameAlreadyExistsError):
             course_command_usecase.create_course(course_1, course_1.creator_id)
-        course_repository.find_by_name.assert_called_with(course_1.name)
+        session.rollback.assert_called_once()
+        session.commit.assert_not_called()
 
     def test_update_course_should_return_course(self):
         session = MagicMock()
         course_repository = MagicMock()
-        course_repository.find_by_id = Mock(return_value=course_1)
+        course_repository.update = Mock(return_value=course_1)
         uow = CourseCommandUseCaseUnitOfWorkImpl(
             session=session, course_repository=course_repository
         )
@@ -72,6 +99,23 @@ class TestCourseCommandUseCase:
         )
 
         assert course.name == course_1.name
+        course_repository.update.assert_called_once()
+        course_repository.find_by_id.assert_not_called()
+
+    def test_update_course_when_course_does_not_exist_should_throw_course_not_found_error(
+        self,
+    ):
+        session = MagicMock()
+        course_repository = MagicMock()
+        course_repository.update = Mock(return_value=None)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session=session, course_repository=course_repository
+        )
+        course_command_usecase = CourseCommandUseCaseImpl(uow=uow)
+
+        with pytest.raises(CourseNotFoundError):
+            course_command_usecase.update_course(id="course_0", data=course_1_update)
+        session.rollback.assert_called_once()
 
     def test_delete_course_by_id(self):
         session = MagicMock()
@@ -148,7 +192,10 @@ class TestCourseCommandUseCase:
             course_id="course_1", data=content_1_update, content_id="content_1"
         )
 
-        session.query(CourseDTO).filter_by.assert_called_with(id="course_1")
+        assert (
+            session.query(CourseDTO).filter_by.call_args_list.count(call(id="course_1"))
+            == 1
+        )
         assert content.title is "a"
 
     def test_add_review_should_return_review(self):
@@ -166,3 +213,65 @@ class TestCourseCommandUseCase:
 
         session.query(CourseDTO).filter_by.assert_called_with(id="course_1")
         assert review.id is review_create_1.id
+
+    def test_command_should_load_course_once(self):
+        session = MagicMock()
+        session.query(CourseDTO).filter_by = Mock(side_effect=mock_filter_course_1)
+        course_repository = CourseRepositoryImpl(session)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session=session, course_repository=course_repository
+        )
+        course_command_usecase = CourseCommandUseCaseImpl(uow=uow)
+
+        course_command_usecase.add_collab("course_1", "user_2")
+
+        session.query(CourseDTO).filter_by.assert_called_once_with(id="course_1")
+
+    def test_identity_map_should_be_shared_with_query_service(self):
+        session = MagicMock()
+        session.query(CourseDTO).filter_by = Mock(side_effect=mock_filter_course_1)
+        identity_map = CourseIdentityMap(session)
+        course_query_usecase = CourseQueryUseCaseImpl(
+            CourseQueryServiceImpl(session, identity_map)
+        )
+        course_repository = CourseRepositoryImpl(session, identity_map)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session=session,
+            course_repository=course_repository,
+            identity_map=identity_map,
+        )
+        course_command_usecase = CourseCommandUseCaseImpl(uow=uow)
+
+        course_query_usecase.fetch_course_by_id("course_1")
+        course_command_usecase.delete_course_by_id(id="course_1")
+
+        session.query(CourseDTO).filter_by.assert_called_once_with(id="course_1")
+
+    def test_delete_course_when_course_does_not_exist_should_throw_course_not_found_error(
+        self,
+    ):
+        session = MagicMock()
+        session.query(CourseDTO).filter_by().first = Mock(return_value=None)
+        course_repository = CourseRepositoryImpl(session)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session=session, course_repository=course_repository
+        )
+        course_command_usecase = CourseCommandUseCaseImpl(uow=uow)
+
+        with pytest.raises(CourseNotFoundError):
+            course_command_usecase.delete_course_by_id(id="course_0")
+        session.rollback.assert_called_once()
+
+    def test_rollback_should_clear_identity_map(self):
+        session = MagicMock()
+        session.query(CourseDTO).filter_by = Mock(side_effect=mock_filter_course_1)
+        course_repository = CourseRepositoryImpl(session)
+        uow = CourseCommandUseCaseUnitOfWorkImpl(
+            session=session, course_repository=course_repository
+        )
+
+        course_repository.find_by_id("course_1")
+        uow.rollback()
+        course_repository.find_by_id("course_1")
+
+        assert session.query(CourseDTO).filter_by.call_count == 2
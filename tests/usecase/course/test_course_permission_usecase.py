@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from app.domain.course import CourseNotFoundError
+from app.infrastructure.course import CoursePermissionServiceImpl
+from app.usecase.course import CoursePermissionUseCaseImpl
+
+
+class TestCoursePermissionUseCase:
+    def test_user_is_creator_should_return_true_for_creator(self):
+        session = MagicMock()
+        session.query().filter().first = Mock(return_value=("creator_1",))
+        permission_service = CoursePermissionServiceImpl(session)
+        permission_usecase = CoursePermissionUseCaseImpl(permission_service)
+
+        assert permission_usecase.user_is_creator("course_1", "creator_1")
+        assert not permission_usecase.user_is_creator("course_1", "user_1")
+
+    def test_user_is_creator_should_query_creator_once(self):
+        session = MagicMock()
+        session.query().filter().first = Mock(return_value=("creator_1",))
+        permission_service = CoursePermissionServiceImpl(session)
+        permission_usecase = CoursePermissionUseCaseImpl(permission_service)
+
+        permission_usecase.user_is_creator("course_1", "creator_1")
+        permission_usecase.user_is_creator("course_1", "user_1")
+        permission_usecase.user_involved("course_1", "creator_1")
+
+        session.query().filter().first.assert_called_once()
+
+    def test_user_is_creator_should_throw_course_not_found_error(self):
+        session = MagicMock()
+        session.query().filter().first = Mock(return_value=None)
+        permission_service = CoursePermissionServiceImpl(session)
+        permission_usecase = CoursePermissionUseCaseImpl(permission_service)
+
+        with pytest.raises(CourseNotFoundError):
+            permission_usecase.user_is_creator("course_0", "creator_1")
+
+    def test_user_involved_should_return_true_for_active_collab(self):
+        session = MagicMock()
+        session.query().filter().first = Mock(return_value=("creator_1",))
+        session.query().filter_by().first = Mock(return_value=("collab_1",))
+        permission_service = CoursePermissionServiceImpl(session)
+        permission_usecase = CoursePermissionUseCaseImpl(permission_service)
+
+        assert permission_usecase.user_involved("course_1", "user_1")
+        session.query().filter_by.assert_called_with(
+            course_id="course_1", user_id="user_1", active=True
+        )
+
+    def test_user_involved_should_return_false_for_other_users(self):
+        session = MagicMock()
+        session.query().filter().first = Mock(return_value=("creator_1",))
+        session.query().filter_by().first = Mock(return_value=None)
+        permission_service = CoursePermissionServiceImpl(session)
+        permission_usecase = CoursePermissionUseCaseImpl(permission_service)
+
+        assert not permission_usecase.user_involved("course_1", "user_1")
@@ -1,15 +1,16 @@
+from datetime import date
 from unittest.mock import MagicMock, Mock
 
 import pytest
-from sqlalchemy.exc import NoResultFound
 
 from app.domain.course import CourseNotFoundError, CoursesNotFoundError
+from app.domain.course.course_exception import UnknownTimeZoneError
 from app.infrastructure.course import CourseDTO, CourseQueryServiceImpl
-from app.infrastructure.course.course_dto import Category
 from app.usecase.course import CourseQueryUseCaseImpl
+from app.usecase.metrics.time_buckets import Granularity
 from tests.parameters import (
-    course_dto_1,
-    course_dto_2,
+    CourseCategoryRow,
+    course_row_1,
     mock_fetch_all,
     mock_filter_course_1,
 )
@@ -18,58 +19,55 @@ from tests.parameters import (
 class TestCourseQueryUseCase:
     def test_fetch_course_by_id_should_return_course(self):
         session = MagicMock()
-        session.query(CourseDTO).filter_by = Mock(side_effect=mock_filter_course_1)
+        session.query().filter().first = Mock(return_value=course_row_1)
+        session.query().filter().order_by().all = Mock(
+            return_value=[CourseCategoryRow(course_id="course_1", category="C")]
+        )
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
         course = course_query_usecase.fetch_course_by_id("course_1")
 
-        session.query(CourseDTO).filter_by.assert_called_with(id="course_1")
         assert course.name == "C Programming For Beginners - Master the C Language"
+        assert course.categories == ["C"]
+        assert course.recommendations == {"recommended": 3, "total": 4}
 
     def test_fetch_course_by_id_should_throw_course_not_found_error(self):
         session = MagicMock()
-        session.query(CourseDTO).filter_by = Mock(side_effect=CourseNotFoundError)
+        session.query().filter().first = Mock(return_value=None)
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
         with pytest.raises(CourseNotFoundError):
             course_query_usecase.fetch_course_by_id("cPqw4yPVUM3fA9sqzpZmkL")
-        session.query(CourseDTO).filter_by.assert_called_with(
-            id="cPqw4yPVUM3fA9sqzpZmkL"
-        )
-
-    def test_fetch_course_by_id_should_throw_no_result_found(self):
-        session = MagicMock()
-        session.query(CourseDTO).filter_by = Mock(side_effect=NoResultFound)
-        course_query_service = CourseQueryServiceImpl(session)
-        course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
-
-        with pytest.raises(CourseNotFoundError):
-            course_query_usecase.fetch_course_by_id("cPqw4yPVUM3fA9sqzpZmkL")
-        session.query(CourseDTO).filter_by.assert_called_with(
-            id="cPqw4yPVUM3fA9sqzpZmkL"
-        )
+        session.query().filter().order_by().all.assert_not_called()
 
     def test_fetch_courses_should_return_courses(self):
         session = MagicMock()
-        session.query(CourseDTO).order_by().slice().all = Mock(
-            side_effect=mock_fetch_all
+        session.query().order_by().slice().all = Mock(side_effect=mock_fetch_all)
+        session.query().filter().order_by().all = Mock(
+            return_value=[
+                CourseCategoryRow(course_id="course_1", category="Programing"),
+                CourseCategoryRow(course_id="course_1", category="C"),
+            ]
         )
+        session.query().scalar = Mock(return_value=2)
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
         courses, count = course_query_usecase.fetch_courses()
 
         assert len(courses) == 2
+        assert count == 2
         assert courses[0].price == 10
         assert courses[1].price == 20
+        assert courses[0].categories == ["Programing", "C"]
+        assert courses[1].categories == []
+        session.query().filter().order_by().all.assert_called_once()
 
     def test_fetch_courses_should_throw_courses_not_found_error(self):
         session = MagicMock()
-        session.query(CourseDTO).order_by().slice().all = Mock(
-            side_effect=CoursesNotFoundError
-        )
+        session.query().order_by().slice().all = Mock(side_effect=CoursesNotFoundError)
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
@@ -78,14 +76,17 @@ class TestCourseQueryUseCase:
 
     def test_fetch_courses_by_filters_with_no_filters_should_return_all(self):
         session = MagicMock()
-        session.query(CourseDTO).slice().all = Mock(side_effect=mock_fetch_all)
-        session.query(CourseDTO).filter_by = Mock(return_value=session.query(CourseDTO))
+        session.query().filter().slice().all = Mock(side_effect=mock_fetch_all)
+        session.query().filter().order_by().all = Mock(return_value=[])
+        session.query().filter().scalar = Mock(return_value=2)
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
-        courses, count = course_query_usecase.fetch_courses_by_filters()
+        courses, count, facets = course_query_usecase.fetch_courses_by_filters()
 
         assert len(courses) == 2
+        assert count == 2
+        assert facets is None
         assert courses[0].price == 10
         assert courses[1].price == 20
 
@@ -102,8 +103,10 @@ class TestCourseQueryUseCase:
 
     def test_get_category_metrics(self):
         session = MagicMock()
-        session.query().group_by().all = Mock(return_value=[("Programming", 1)])
-        session.query().all = Mock(return_value=[Category(category="Programing")])
+        session.query().filter().order_by().limit().all = Mock(
+            return_value=[("Programming", 1)]
+        )
+        session.query().filter().scalar = Mock(return_value=1)
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
@@ -115,7 +118,7 @@ class TestCourseQueryUseCase:
 
     def test_get_courses_metrics(self):
         session = MagicMock()
-        session.query().all = Mock(return_value=[course_dto_1, course_dto_2])
+        session.query().filter().group_by().all = Mock(return_value=[(2, 2)])
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
@@ -125,10 +128,21 @@ class TestCourseQueryUseCase:
 
     def test_get_subscription_metrics(self):
         session = MagicMock()
-        session.query().all = Mock(return_value=[course_dto_1, course_dto_2])
+        session.query().all = Mock(return_value=[(0, 2)])
         course_query_service = CourseQueryServiceImpl(session)
         course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
 
         metrics = course_query_usecase.get_subscription_metrics()
 
         assert metrics.subscriptions == [2, 0, 0]
+
+    def test_get_time_series_metrics_should_reject_unknown_time_zones(self):
+        session = MagicMock()
+        course_query_service = CourseQueryServiceImpl(session)
+        course_query_usecase = CourseQueryUseCaseImpl(course_query_service)
+
+        with pytest.raises(UnknownTimeZoneError):
+            course_query_usecase.get_time_series_metrics(
+                date(2021, 1, 1), date(2021, 2, 1), Granularity.DAY, "Nowhere/City"
+            )
+        session.execute.assert_not_called()
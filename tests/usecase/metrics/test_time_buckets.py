@@ -0,0 +1,60 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.domain.course.course_exception import (
+    InvalidTimeRangeError,
+    UnknownTimeZoneError,
+)
+from app.usecase.metrics.time_buckets import MAX_TIME_BUCKETS, Granularity, TimeBuckets
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestTimeBuckets:
+    def test_months_should_cover_the_whole_of_both_ends(self):
+        buckets = TimeBuckets(date(2021, 11, 15), date(2022, 1, 3), Granularity.MONTH)
+
+        assert len(buckets) == 3
+        assert buckets.edges == [
+            utc(2021, 11, 1),
+            utc(2021, 12, 1),
+            utc(2022, 1, 1),
+            utc(2022, 2, 1),
+        ]
+        assert buckets.edges_ms[0] == 1635724800000
+
+    def test_weeks_should_start_on_monday(self):
+        buckets = TimeBuckets(date(2021, 3, 3), date(2021, 3, 8), Granularity.WEEK)
+
+        assert [edge.date() for edge in buckets.edges] == [
+            date(2021, 3, 1),
+            date(2021, 3, 8),
+            date(2021, 3, 15),
+        ]
+
+    def test_days_should_follow_local_midnight_across_dst(self):
+        buckets = TimeBuckets(
+            date(2021, 3, 27), date(2021, 3, 28), Granularity.DAY, "Europe/Madrid"
+        )
+
+        assert [e - s for s, e in zip(buckets.edges_ms, buckets.edges_ms[1:])] == [
+            24 * 3600 * 1000,
+            23 * 3600 * 1000,
+        ]
+        assert buckets.edges[0].utcoffset().total_seconds() == 3600
+
+    def test_should_reject_reversed_ranges(self):
+        with pytest.raises(InvalidTimeRangeError):
+            TimeBuckets(date(2021, 3, 2), date(2021, 3, 1), Granularity.DAY)
+
+    def test_should_reject_too_many_buckets(self):
+        with pytest.raises(InvalidTimeRangeError):
+            TimeBuckets(date(2000, 1, 1), date(2010, 1, 1), Granularity.DAY)
+        assert len(TimeBuckets(date(2000, 1, 1), date(2010, 1, 1))) < MAX_TIME_BUCKETS
+
+    def test_should_reject_unknown_time_zones(self):
+        with pytest.raises(UnknownTimeZoneError):
+            TimeBuckets(date(2021, 1, 1), date(2021, 2, 1), timezone="Mars/Olympus")
@@ -0,0 +1,21 @@
+from typing import List
+from unittest.mock import Mock
+
+from pydantic import BaseModel
+
+from app.usecase.schema_example import lazy_examples
+
+
+class TestSchemaExample:
+    def test_lazy_examples_should_not_build_example_until_schema_is_requested(self):
+        example = Mock(return_value=["example"])
+
+        class Model(BaseModel):
+            items: List[str]
+
+            class Config:
+                schema_extra = lazy_examples(items=example)
+
+        example.assert_not_called()
+        assert Model.schema()["properties"]["items"]["example"] == ["example"]
+        example.assert_called_once()